@@ -0,0 +1,87 @@
+"""Compare two benchmark reports and flag regressions.
+
+    python -m bench.compare baseline.json candidate.json --threshold 0.10
+
+Works for both load-test and microbenchmark reports. Exits non-zero when any
+tracked metric moves in the wrong direction by more than the threshold.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+HIGHER_IS_BETTER = {"throughput_rps", "ops_per_sec"}
+LOWER_IS_BETTER = {
+    "mean", "p50", "p95", "p99", "max",
+    "cpu_seconds", "cpu_percent", "rss_mb_peak", "rss_mb_mean",
+    "mean_us", "peak_alloc_bytes", "retained_bytes_per_op",
+}
+
+
+def flatten(node: Any, prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    if isinstance(node, dict):
+        for key, value in node.items():
+            flat.update(flatten(value, f"{prefix}.{key}" if prefix else key))
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        flat[prefix] = float(node)
+    return flat
+
+
+def tracked(report: Dict[str, Any]) -> Dict[str, float]:
+    metrics = flatten({"results": report.get("results", {}), "resources": report.get("resources", {})})
+    return {
+        path: value
+        for path, value in metrics.items()
+        if path.rsplit(".", 1)[-1] in HIGHER_IS_BETTER | LOWER_IS_BETTER
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float
+) -> List[Tuple[str, float, float, float, bool]]:
+    base, cand = tracked(baseline), tracked(candidate)
+    rows = []
+    for path in sorted(base.keys() & cand.keys()):
+        old, new = base[path], cand[path]
+        change = (new - old) / old if old else 0.0
+        metric = path.rsplit(".", 1)[-1]
+        if metric in HIGHER_IS_BETTER:
+            regressed = change < -threshold
+        else:
+            regressed = change > threshold
+        rows.append((path, old, new, change, regressed))
+    return rows
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--only-regressions", action="store_true")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    if baseline.get("kind") != candidate.get("kind"):
+        print("Reports are of different kinds; refusing to compare", file=sys.stderr)
+        return 2
+
+    rows = compare(baseline, candidate, args.threshold)
+    regressions = 0
+    for path, old, new, change, regressed in rows:
+        regressions += regressed
+        if args.only_regressions and not regressed:
+            continue
+        marker = "REGRESSION" if regressed else ""
+        print(f"{path:<60} {old:>14.3f} {new:>14.3f} {change:>+8.1%} {marker}")
+    print(f"{regressions} regression(s) over {len(rows)} metric(s) at threshold {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
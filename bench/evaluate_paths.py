@@ -0,0 +1,110 @@
+"""Compare the ORM and Core implementations of governance /evaluate in-process.
+
+    python -m bench.evaluate_paths --iterations 2000 --output evaluate_paths.json
+
+Runs against DATABASE_URL when set, otherwise a throwaway SQLite file, and
+calls the route handlers directly so HTTP and JSON costs are excluded.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from .loadtest import DEFAULT_CORPUS, _governance_call, load_corpus, percentile
+
+SCHEMA_VERSION = 1
+
+
+def _measure(call: Callable[[Any], Any], payloads: List[Any], iterations: int) -> Dict[str, Any]:
+    for payload in payloads[:8]:
+        call(payload)
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        call(payloads[i % len(payloads)])
+        latencies.append(time.perf_counter() - t0)
+    duration = time.perf_counter() - started
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    call(payloads[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / duration, 2),
+        "latency_ms": {
+            "mean": round(1000.0 * sum(ordered) / len(ordered), 4),
+            "p50": round(1000.0 * percentile(ordered, 50), 4),
+            "p95": round(1000.0 * percentile(ordered, 95), 4),
+            "p99": round(1000.0 * percentile(ordered, 99), 4),
+        },
+        "peak_alloc_bytes": max(0, peak - before),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    if not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='govai-bench-')}/governance.db"
+
+    from .micro import load_service_module
+
+    main_module = load_service_module("governance", "main")
+    schemas = load_service_module("governance", "schemas")
+    fastpath = load_service_module("governance", "fastpath")
+    main_module.Base.metadata.create_all(bind=main_module.engine)
+
+    payloads = [
+        schemas.EvaluateRequest(**_governance_call(record)[1]) for record in load_corpus(DEFAULT_CORPUS)
+    ]
+
+    def orm(payload: Any) -> Any:
+        db = main_module.SessionLocal()
+        try:
+            return main_module.evaluate(payload, db)
+        finally:
+            db.close()
+
+    results = {
+        "evaluate.orm": _measure(orm, payloads, args.iterations),
+        "evaluate.core": _measure(fastpath.evaluate_core, payloads, args.iterations),
+    }
+    report = {
+        "schema": SCHEMA_VERSION,
+        "kind": "evaluate_paths",
+        "meta": {
+            "database": main_module.engine.dialect.name,
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
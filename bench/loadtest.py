@@ -0,0 +1,365 @@
+"""Replay a recorded request corpus against the gateway or a single service.
+
+    python -m bench.loadtest --launch --target all --requests 200 --concurrency 8 \
+        --output bench_output.json
+
+Each corpus line holds the original gateway request plus the recorded RAG, bias
+and governance responses, which is what lets every downstream service be
+replayed in isolation with realistic payloads.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from . import stack
+
+SCHEMA_VERSION = 1
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "corpus" / "generate.jsonl"
+SERVICE_TARGETS = ["rag", "bias", "governance", "explainability"]
+
+
+def load_corpus(path: Path) -> List[Dict[str, Any]]:
+    records = []
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                records.append(json.loads(line))
+    if not records:
+        raise ValueError(f"Corpus {path} is empty")
+    return records
+
+
+def _gateway_call(record: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    req = record["request"]
+    headers = {"X-API-Key": stack.API_KEY, "X-Tenant-Id": req["tenant_id"]}
+    return "/generate", req, headers
+
+
+def _rag_call(record: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    req = record["request"]
+    payload = {
+        "tenant_id": req["tenant_id"],
+        "user_id": req["user_id"],
+        "prompt": req["prompt"],
+        "top_k": req.get("top_k", 4),
+    }
+    return "/generate", payload, {}
+
+
+def _bias_call(record: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    req, rag = record["request"], record["rag"]
+    payload = {
+        "tenant_id": req["tenant_id"],
+        "user_id": req["user_id"],
+        "prompt": req["prompt"],
+        "answer": rag["answer"],
+    }
+    return "/analyze", payload, {}
+
+
+def _governance_call(record: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    req, rag = record["request"], record["rag"]
+    payload = {
+        "tenant_id": req["tenant_id"],
+        "user_id": req["user_id"],
+        "prompt": req["prompt"],
+        "answer": rag["answer"],
+        "sources": rag["sources"],
+        "confidence": rag["confidence"],
+        "bias_score": record["bias"]["bias_score"],
+        "policy_mode": req.get("policy_mode", "enforce"),
+        "model_id": rag.get("model_id", "unknown"),
+        "consistency_score": rag.get("evidence", {}).get("consistency_score", 0.0),
+        "evidence_flags": rag.get("evidence", {}).get("flags", []),
+    }
+    return "/evaluate", payload, {}
+
+
+def _explain_call(record: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    req, rag = record["request"], record["rag"]
+    payload = {
+        "tenant_id": req["tenant_id"],
+        "user_id": req["user_id"],
+        "prompt": req["prompt"],
+        "answer": rag["answer"],
+        "sources": rag["sources"],
+        "confidence": rag["confidence"],
+        "bias": record["bias"],
+        "governance": record["governance"],
+        "model_id": rag.get("model_id", "unknown"),
+        "evidence": rag.get("evidence", {}),
+    }
+    return "/explain", payload, {}
+
+
+CALLS: Dict[str, Callable[[Dict[str, Any]], Tuple[str, Dict[str, Any], Dict[str, str]]]] = {
+    "gateway": _gateway_call,
+    "rag": _rag_call,
+    "bias": _bias_call,
+    "governance": _governance_call,
+    "explainability": _explain_call,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], errors: int, duration: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    ms = lambda value: round(value * 1000.0, 3)
+    completed = len(ordered)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(completed / duration, 3) if duration > 0 else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(ordered) / completed) if completed else 0.0,
+            "p50": ms(percentile(ordered, 50)),
+            "p95": ms(percentile(ordered, 95)),
+            "p99": ms(percentile(ordered, 99)),
+            "max": ms(ordered[-1]) if ordered else 0.0,
+        },
+    }
+
+
+class ResourceSampler:
+    """Samples CPU time and RSS of service processes from /proc (psutil elsewhere)."""
+
+    def __init__(self, pids: Dict[str, int], interval: float = 0.25) -> None:
+        self.pids = pids
+        self.interval = interval
+        self.samples: Dict[str, List[float]] = {name: [] for name in pids}
+        self.cpu_start: Dict[str, float] = {}
+        self.cpu_end: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def _read(self, pid: int) -> Tuple[float, float]:
+        proc = Path(f"/proc/{pid}")
+        if proc.exists():
+            fields = (proc / "stat").read_text().rsplit(")", 1)[1].split()
+            cpu = (int(fields[11]) + int(fields[12])) / self._clock_ticks
+            rss = 0.0
+            for line in (proc / "status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) / 1024.0
+                    break
+            return cpu, rss
+        import psutil
+
+        handle = psutil.Process(pid)
+        times = handle.cpu_times()
+        return times.user + times.system, handle.memory_info().rss / (1024.0 * 1024.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            for name, pid in self.pids.items():
+                try:
+                    self.samples[name].append(self._read(pid)[1])
+                except Exception:
+                    continue
+
+    def start(self) -> None:
+        for name, pid in self.pids.items():
+            self.cpu_start[name] = self._read(pid)[0]
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._elapsed = time.perf_counter() - self._started
+        self._stop.set()
+        self._thread.join()
+        for name, pid in self.pids.items():
+            cpu, rss = self._read(pid)
+            self.cpu_end[name] = cpu
+            self.samples[name].append(rss)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for name in self.pids:
+            cpu_seconds = self.cpu_end[name] - self.cpu_start[name]
+            rss = self.samples[name] or [0.0]
+            report[name] = {
+                "cpu_seconds": round(cpu_seconds, 3),
+                "cpu_percent": round(100.0 * cpu_seconds / self._elapsed, 2) if self._elapsed else 0.0,
+                "rss_mb_peak": round(max(rss), 2),
+                "rss_mb_mean": round(sum(rss) / len(rss), 2),
+            }
+        return report
+
+
+async def replay(
+    target: str,
+    base_url: str,
+    corpus: List[Dict[str, Any]],
+    total: int,
+    concurrency: int,
+    warmup: int,
+    timeout: float,
+    record_to: List[Dict[str, Any]] | None = None,
+) -> Dict[str, Any]:
+    build = CALLS[target]
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        for i in range(warmup):
+            path, payload, headers = build(corpus[i % len(corpus)])
+            await client.post(path, json=payload, headers=headers)
+
+        async def worker() -> None:
+            nonlocal errors
+            for i in counter:
+                record = corpus[i % len(corpus)]
+                path, payload, headers = build(record)
+                started = time.perf_counter()
+                try:
+                    resp = await client.post(path, json=payload, headers=headers)
+                    resp.raise_for_status()
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                if record_to is not None and i < len(corpus):
+                    record_to.append({"index": i, "request": record["request"], "response": resp.json()})
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - started
+
+    return summarize(latencies, errors, duration)
+
+
+def _recorded_corpus(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    records = []
+    for row in sorted(rows, key=lambda item: item["index"]):
+        resp = row["response"]
+        records.append(
+            {
+                "request": row["request"],
+                "rag": {
+                    "answer": resp["answer"],
+                    "sources": resp["sources"],
+                    "confidence": resp["confidence"],
+                    "model_id": resp["model_id"],
+                    "evidence": resp["evidence"],
+                },
+                "bias": resp["bias"],
+                "governance": resp["governance"],
+            }
+        )
+    return records
+
+
+def _parse_pids(values: List[str]) -> Dict[str, int]:
+    pids = {}
+    for value in values:
+        name, _, pid = value.partition("=")
+        pids[name] = int(pid)
+    return pids
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="gateway", choices=["all", "gateway", *SERVICE_TARGETS])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--launch", action="store_true", help="start a local stand-in stack")
+    parser.add_argument("--url", action="append", default=[], help="service=URL, overrides the stand-in URL")
+    parser.add_argument("--pid", action="append", default=[], help="service=PID to sample when not launching")
+    parser.add_argument("--record", type=Path, help="write gateway responses as a new corpus")
+    parser.add_argument("--output", type=Path, help="write machine-readable results here")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    targets = ["bias", "explainability", "governance", "rag", "gateway"] if args.target == "all" else [args.target]
+    urls = {name: stack.url_for(name) for name in stack.PORTS}
+    urls.update({name: url for name, _, url in (value.partition("=") for value in args.url)})
+
+    running = stack.launch() if args.launch else None
+    pids = running.pids if running else _parse_pids(args.pid)
+    recorded: List[Dict[str, Any]] | None = [] if args.record else None
+
+    results: Dict[str, Any] = {}
+    resources: Dict[str, Any] = {}
+    try:
+        for target in targets:
+            sampler = ResourceSampler(pids) if pids else None
+            if sampler:
+                sampler.start()
+            results[target] = asyncio.run(
+                replay(
+                    target,
+                    urls[target],
+                    corpus,
+                    args.requests,
+                    args.concurrency,
+                    args.warmup,
+                    args.timeout,
+                    record_to=recorded if target == "gateway" else None,
+                )
+            )
+            if sampler:
+                sampler.stop()
+                resources[target] = sampler.report()
+    finally:
+        if running:
+            running.stop()
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "kind": "loadtest",
+        "meta": {
+            "corpus": str(args.corpus),
+            "corpus_sha256": hashlib.sha256(args.corpus.read_bytes()).hexdigest(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+        "resources": resources,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+    if args.record and recorded:
+        with open(args.record, "w", encoding="utf-8") as handle:
+            for record in _recorded_corpus(recorded):
+                handle.write(json.dumps(record) + "\n")
+    return 0 if all(r["errors"] == 0 for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
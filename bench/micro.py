@@ -0,0 +1,287 @@
+"""Microbenchmarks for the pure-Python functions on the request path.
+
+    python -m bench.micro --output micro.json
+    python -m bench.compare micro_baseline.json micro.json
+
+Each case reports ops/sec (best of several timed repeats) plus the peak
+transient and retained allocation of a single call measured with tracemalloc.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import importlib.util
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List
+
+from .loadtest import DEFAULT_CORPUS, load_corpus
+
+SCHEMA_VERSION = 1
+SERVICES_DIR = Path(__file__).resolve().parent.parent / "services"
+
+
+def load_service_module(service: str, module: str) -> ModuleType:
+    """Import services/<service>/app/<module>.py without clashing `app` packages."""
+    package = f"govai_{service}"
+    if package not in sys.modules:
+        init = SERVICES_DIR / service / "app" / "__init__.py"
+        spec = importlib.util.spec_from_file_location(
+            package, init, submodule_search_locations=[str(init.parent)]
+        )
+        pkg = importlib.util.module_from_spec(spec)
+        sys.modules[package] = pkg
+        spec.loader.exec_module(pkg)
+    return importlib.import_module(f"{package}.{module}")
+
+
+@dataclass
+class Case:
+    name: str
+    func: Callable[[], Any]
+    setup: Callable[[], None] | None = None
+    teardown: Callable[[], None] | None = None
+
+
+def _long_text(words: List[str], size: int) -> str:
+    chunks = []
+    total = 0
+    i = 0
+    while total < size:
+        word = words[i % len(words)]
+        chunks.append(word)
+        total += len(word) + 1
+        i += 1
+    return " ".join(chunks)
+
+
+def build_cases() -> List[Case]:
+    bias = load_service_module("bias", "bias")
+    policies = load_service_module("governance", "policies")
+    explain = load_service_module("explainability", "explain")
+    explain_schemas = load_service_module("explainability", "schemas")
+
+    corpus = load_corpus(DEFAULT_CORPUS)
+    record = corpus[0]
+    prompt = record["request"]["prompt"]
+    answer = record["rag"]["answer"]
+    combined = f"{prompt}\n{answer}"
+    filler = combined.replace("\n", " ").split()
+    long_answer = _long_text(filler, 64_000)
+    long_combined = f"{prompt}\n{long_answer}"
+
+    original_terms = list(bias.SENSITIVE_TERMS)
+    large_lexicon = original_terms + [f"lexicon-term-{i:05d}" for i in range(5_000)]
+
+    def use_large_lexicon() -> None:
+        bias.SENSITIVE_TERMS[:] = large_lexicon
+
+    def restore_lexicon() -> None:
+        bias.SENSITIVE_TERMS[:] = original_terms
+
+    flagged_many = [f"term-{i}" for i in range(1_000)]
+
+    defaults = policies.default_policies("gov-dept-a")
+    rule_cycle = [
+        ("REQUIRE_CONFIDENCE", {"min_confidence": 0.9}),
+        ("REQUIRE_CITATIONS", {"min_sources": 6}),
+        ("REQUIRE_GROUNDING", {"min_consistency": 0.5}),
+        ("BLOCKLIST_TERM", {"terms": ["classified", "secret", "internal only"]}),
+        ("MAX_BIAS", {"max_bias": 0.1}),
+        ("REQUIRE_HUMAN_REVIEW", {"if_bias_over": 0.1, "if_confidence_below": 0.6}),
+    ]
+    many_policies = [
+        {
+            "id": f"rule-{i}",
+            "tenant_id": "gov-dept-a",
+            "name": f"Rule {i}",
+            "rule_type": rule_cycle[i % len(rule_cycle)][0],
+            "params": rule_cycle[i % len(rule_cycle)][1],
+            "enabled": i % 10 != 0,
+        }
+        for i in range(5_000)
+    ]
+    big_blocklist = [
+        {
+            "id": "blocklist",
+            "tenant_id": "gov-dept-a",
+            "name": "Large Blocklist",
+            "rule_type": "BLOCKLIST_TERM",
+            "params": {"terms": [f"blocked-term-{i}" for i in range(5_000)]},
+            "enabled": True,
+        }
+    ]
+    evidence = record["rag"]["evidence"]
+    sources = record["rag"]["sources"]
+    many_sources = [
+        {**sources[i % len(sources)], "id": f"doc-{i:05d}", "score": round((i % 97) / 97, 4)}
+        for i in range(2_000)
+    ]
+
+    def run_policies(policy_set: List[Dict[str, Any]], text: str) -> Any:
+        return policies.evaluate_policies(
+            policy_set,
+            prompt,
+            text,
+            record["rag"]["confidence"],
+            record["bias"]["bias_score"],
+            len(sources),
+            evidence["consistency_score"],
+            evidence["flags"],
+        )
+
+    source_models = [explain_schemas.Source(**item) for item in sources]
+    many_source_models = [explain_schemas.Source(**item) for item in many_sources]
+
+    def run_explain(source_items: List[Any], text: str, verbosity: str = "full") -> Any:
+        return explain.build_explanation(
+            prompt=prompt,
+            answer=text,
+            sources=source_items,
+            confidence=record["rag"]["confidence"],
+            bias=record["bias"],
+            governance=record["governance"],
+            model_id=record["rag"]["model_id"],
+            evidence=evidence,
+            verbosity=verbosity,
+        )
+
+    return [
+        Case("bias.score_bias.realistic", lambda: bias.score_bias(combined)),
+        Case("bias.score_bias.long_answer", lambda: bias.score_bias(long_combined)),
+        Case(
+            "bias.score_bias.large_lexicon",
+            lambda: bias.score_bias(combined),
+            setup=use_large_lexicon,
+            teardown=restore_lexicon,
+        ),
+        Case(
+            "bias.score_bias.large_lexicon_long_answer",
+            lambda: bias.score_bias(long_combined),
+            setup=use_large_lexicon,
+            teardown=restore_lexicon,
+        ),
+        Case("bias.risk_label", lambda: [bias.risk_label(s / 10) for s in range(11)]),
+        Case("bias.bias_metrics.realistic", lambda: bias.bias_metrics(record["bias"]["flagged_terms"])),
+        Case("bias.bias_metrics.many_flagged", lambda: bias.bias_metrics(flagged_many)),
+        Case("governance.default_policies", lambda: policies.default_policies("gov-dept-a")),
+        Case("governance.evaluate_policies.defaults", lambda: run_policies(defaults, answer)),
+        Case("governance.evaluate_policies.5k_rules", lambda: run_policies(many_policies, answer)),
+        Case("governance.evaluate_policies.5k_rules_long_answer", lambda: run_policies(many_policies, long_answer)),
+        Case("governance.evaluate_policies.large_blocklist", lambda: run_policies(big_blocklist, long_answer)),
+        Case("explainability.build_explanation.realistic", lambda: run_explain(source_models, answer)),
+        Case("explainability.build_explanation.2k_sources", lambda: run_explain(many_source_models, long_answer)),
+        Case(
+            "explainability.build_explanation.2k_sources_summary",
+            lambda: run_explain(many_source_models, long_answer, "summary"),
+        ),
+    ]
+
+
+def _time_case(case: Case, min_time: float, repeat: int) -> Dict[str, float]:
+    func = case.func
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 24:
+            break
+        number *= 2 if elapsed < min_time / 10 else max(2, int(min_time / max(elapsed, 1e-9)) + 1)
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+
+    best = min(timings)
+    mean = statistics.fmean(timings)
+    stdev = statistics.pstdev(timings) if len(timings) > 1 else 0.0
+    return {
+        "iterations": number,
+        "ops_per_sec": round(1.0 / best, 2) if best else 0.0,
+        "mean_us": round(mean * 1e6, 3),
+        "stdev_pct": round(100.0 * stdev / mean, 2) if mean else 0.0,
+    }
+
+
+def _allocations(case: Case, calls: int = 20) -> Dict[str, float]:
+    func = case.func
+    func()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        results = [func() for _ in range(calls)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+    return {
+        "peak_alloc_bytes": max(0, peak - before),
+        "retained_bytes_per_op": round(max(0, after - before) / (calls + 1), 1),
+    }
+
+
+def run(cases: List[Case], min_time: float, repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for case in cases:
+        if case.setup:
+            case.setup()
+        try:
+            metrics = _time_case(case, min_time, repeat)
+            metrics.update(_allocations(case))
+        finally:
+            if case.teardown:
+                case.teardown()
+        results[case.name] = metrics
+        print(f"{case.name:<55} {metrics['ops_per_sec']:>14,.1f} ops/s", file=sys.stderr)
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    cases = [case for case in build_cases() if args.filter in case.name]
+    report = {
+        "schema": SCHEMA_VERSION,
+        "kind": "micro",
+        "meta": {
+            "min_time": args.min_time,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": run(cases, args.min_time, args.repeat),
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Launch the GovAI services locally with benchmark stand-ins.
+
+Postgres is replaced by a SQLite file and the generator by a tiny GPT-2 so the
+whole pipeline can be exercised on a laptop or CI runner. Every default can be
+overridden through the environment of the calling process.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVICES_DIR = ROOT / "services"
+
+PORTS = {
+    "rag": 18001,
+    "bias": 18002,
+    "governance": 18003,
+    "explainability": 18004,
+    "gateway": 18000,
+}
+
+API_KEY = "bench-key"
+
+
+def url_for(service: str) -> str:
+    return f"http://127.0.0.1:{PORTS[service]}"
+
+
+def standin_env(workdir: str) -> Dict[str, str]:
+    env = {
+        "DATABASE_URL": f"sqlite:///{workdir}/governance.db",
+        "HF_GEN_MODEL": "sshleifer/tiny-gpt2",
+        "HF_EMBED_MODEL": "sentence-transformers/all-MiniLM-L6-v2",
+        "GOVAI_API_KEY": API_KEY,
+        "GOVAI_ENFORCE_API_KEY": "true",
+        "RAG_URL": url_for("rag"),
+        "BIAS_URL": url_for("bias"),
+        "GOV_URL": url_for("governance"),
+        "EXPLAIN_URL": url_for("explainability"),
+    }
+    for key in list(env):
+        if key in os.environ:
+            env[key] = os.environ[key]
+    return env
+
+
+@dataclass
+class Stack:
+    workdir: str
+    processes: Dict[str, subprocess.Popen] = field(default_factory=dict)
+
+    @property
+    def pids(self) -> Dict[str, int]:
+        return {name: proc.pid for name, proc in self.processes.items()}
+
+    def stop(self) -> None:
+        for proc in self.processes.values():
+            proc.terminate()
+        for proc in self.processes.values():
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self.processes.clear()
+
+
+def _wait_healthy(service: str, proc: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{service} exited with code {proc.returncode}")
+        try:
+            urllib.request.urlopen(f"{url_for(service)}/health", timeout=2)
+            return
+        except Exception:
+            time.sleep(0.5)
+    raise RuntimeError(f"{service} did not become healthy within {timeout}s")
+
+
+def launch(services: List[str] | None = None, workdir: str | None = None, timeout: float = 300.0) -> Stack:
+    services = services or list(PORTS)
+    workdir = workdir or tempfile.mkdtemp(prefix="govai-bench-")
+    env = {**os.environ, **standin_env(workdir)}
+    stack = Stack(workdir=workdir)
+    log_dir = Path(workdir) / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    # RAG first: it is by far the slowest to start and the gateway needs it.
+    ordered = sorted(services, key=lambda name: (name != "rag", name == "gateway"))
+    try:
+        for service in ordered:
+            log = open(log_dir / f"{service}.log", "wb")
+            proc = subprocess.Popen(
+                [
+                    sys.executable, "-m", "uvicorn", "app.main:app",
+                    "--host", "127.0.0.1", "--port", str(PORTS[service]),
+                    "--log-level", "warning",
+                ],
+                cwd=SERVICES_DIR / service,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+            stack.processes[service] = proc
+            _wait_healthy(service, proc, timeout)
+    except Exception:
+        stack.stop()
+        raise
+    return stack
+
+
+if __name__ == "__main__":
+    running = launch(sys.argv[1:] or None)
+    print(f"workdir: {running.workdir}")
+    for name, pid in running.pids.items():
+        print(f"{name}: {url_for(name)} pid={pid}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        running.stop()
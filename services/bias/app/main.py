@@ -1,8 +1,13 @@
 from fastapi import FastAPI
-from .schemas import BiasRequest, BiasResponse
+from govai_common.profiling import SamplingMiddleware, router as profiling_router
+from govai_common.wire import WireResponse, WireRoute
+from .schemas import BiasRequest, BiasResponse, BiasBatchRequest, BiasBatchResponse
 from .bias import score_bias, risk_label, bias_metrics
 
-app = FastAPI(title="GovAI Bias", version="0.1.0")
+app = FastAPI(title="GovAI Bias", version="0.1.0", default_response_class=WireResponse)
+app.router.route_class = WireRoute
+app.add_middleware(SamplingMiddleware)
+app.include_router(profiling_router)
 
 @app.get("/health")
 def health():
@@ -18,3 +23,7 @@ def analyze(req: BiasRequest):
         "flagged_terms": flagged,
         "metrics": bias_metrics(flagged),
     }
+
+@app.post("/analyze/batch", response_model=BiasBatchResponse)
+def analyze_batch(req: BiasBatchRequest):
+    return {"results": [analyze(item) for item in req.items]}
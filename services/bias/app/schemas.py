@@ -12,3 +12,9 @@ class BiasResponse(BaseModel):
     risk_level: str
     flagged_terms: List[str]
     metrics: dict
+
+class BiasBatchRequest(BaseModel):
+    items: List[BiasRequest]
+
+class BiasBatchResponse(BaseModel):
+    results: List[BiasResponse]
@@ -0,0 +1,14 @@
+import hmac
+import os
+
+from fastapi import Header, HTTPException
+
+ADMIN_TOKEN = os.getenv("GOVAI_ADMIN_TOKEN", "")
+
+
+def require_admin(x_admin_token: str | None = Header(default=None, alias="X-Admin-Token")) -> None:
+    """Dependency for /admin routes: the caller must send GOVAI_ADMIN_TOKEN as X-Admin-Token."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled: GOVAI_ADMIN_TOKEN is not set")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
@@ -0,0 +1,239 @@
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from .admin import require_admin
+
+INTERVAL_S = float(os.getenv("PROFILE_INTERVAL_MS", "10")) / 1000.0
+# A timed profile keeps its HTTP request open for the whole run, so keep it short.
+MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+MAX_DEPTH = 128
+TOP_FUNCTIONS = 50
+
+# Leaf frames of threads that are parked rather than working: the event loop
+# waiting in select, idle pool threads and lock/condition waits.
+IDLE_LEAVES = {
+    ("selectors", "select"),
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("queue", "get"),
+    ("concurrent.futures.thread", "_worker"),
+    ("socket", "accept"),
+}
+
+class Session:
+    """Samples collected by one profiling run."""
+
+    def __init__(self, seconds: float, every: int = 0, include_idle: bool = False) -> None:
+        self.seconds = seconds
+        self.every = every
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.requests = 0
+        self.started = time.time()
+        self.finished: float | None = None
+        self.stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self.finished is None
+
+    def folded(self) -> str:
+        """One `frame;frame;...;leaf count` line per stack, root first (flamegraph.pl / speedscope input)."""
+        stacks = Counter(dict(self.stacks))
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.most_common())
+
+    def functions(self) -> list:
+        own: Counter = Counter()
+        total: Counter = Counter()
+        # dict() copies in one step, so a running sampler cannot change it mid-loop.
+        stacks = dict(self.stacks)
+        for stack, count in stacks.items():
+            own[stack[-1]] += count
+            # A recursive function is counted once per sample.
+            for frame in set(stack[1:]):
+                total[frame] += count
+        samples = max(1, sum(stacks.values()))
+        # Ranked by self time, like pprof's top: outer frames such as the
+        # event loop have full inclusive totals but are rarely the hot spot.
+        return [
+            {
+                "function": name,
+                "self": own[name],
+                "total": total[name],
+                "self_pct": round(100.0 * own[name] / samples, 2),
+                "total_pct": round(100.0 * total[name] / samples, 2),
+                "self_ms": round(own[name] * INTERVAL_S * 1000, 1),
+            }
+            for name, _ in own.most_common(TOP_FUNCTIONS)
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "mode": "requests" if self.every else "timed",
+            "every": self.every or None,
+            "running": self.running,
+            "duration_s": round((self.finished or time.time()) - self.started, 3),
+            "interval_ms": INTERVAL_S * 1000,
+            "samples": self.samples,
+            "requests": self.requests,
+            "functions": self.functions(),
+            "folded": self.folded(),
+        }
+
+
+class Profiler:
+    """Wall-clock sampler over sys._current_frames().
+
+    A background thread records every busy thread's stack each
+    PROFILE_INTERVAL_MS; nothing is hooked into the interpreter, so code runs
+    at full speed between samples and the cost is zero when no session runs.
+    In request mode the thread samples only while a sampled request is in
+    flight, so stacks can include other requests running alongside it.
+    """
+
+    def __init__(self) -> None:
+        self.session: Session | None = None
+        self._lock = threading.Lock()
+        self._labels: Dict[Any, str] = {}
+        self._active = 0
+        self._busy = threading.Event()
+        self._counter = itertools.count()
+
+    def _label(self, code: Any, module: str) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+        return label
+
+    def _sample(self, session: Session) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            leaf = (frame.f_globals.get("__name__", "?"), frame.f_code.co_name)
+            if not session.include_idle and leaf in IDLE_LEAVES:
+                continue
+            frames = []
+            while frame is not None and len(frames) < MAX_DEPTH:
+                frames.append(self._label(frame.f_code, frame.f_globals.get("__name__", "?")))
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}"))
+            session.stacks[tuple(reversed(frames))] += 1
+        session.samples += 1
+
+    def _run(self, session: Session) -> None:
+        deadline = time.monotonic() + session.seconds
+        while not session.stop.is_set() and time.monotonic() < deadline:
+            if session.every and not self._active:
+                self._busy.wait(0.1)
+                continue
+            self._sample(session)
+            session.stop.wait(INTERVAL_S)
+        session.finished = time.time()
+
+    def start(self, seconds: float, every: int = 0, include_idle: bool = False) -> Session:
+        with self._lock:
+            if self.session is not None and self.session.running:
+                raise HTTPException(status_code=409, detail="A profiling session is already running")
+            session = self.session = Session(min(seconds, MAX_SECONDS), every, include_idle)
+            self._counter = itertools.count()
+        threading.Thread(target=self._run, args=(session,), name="govai-profiler", daemon=True).start()
+        return session
+
+    def sampled(self) -> bool:
+        session = self.session
+        if session is None or not session.every or not session.running:
+            return False
+        return next(self._counter) % session.every == 0
+
+    def enter(self) -> None:
+        self.session.requests += 1
+        self._active += 1
+        self._busy.set()
+
+    def exit(self) -> None:
+        self._active -= 1
+        if not self._active:
+            self._busy.clear()
+
+
+profiler = Profiler()
+
+
+class SamplingMiddleware:
+    """Profiles one in every N requests while a request-mode session runs."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"].startswith("/admin/profile") or not profiler.sampled():
+            await self.app(scope, receive, send)
+            return
+        profiler.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.exit()
+
+
+def _render(session: Session, format: str):
+    if format == "folded":
+        return PlainTextResponse(session.folded())
+    return session.report()
+
+
+router = APIRouter(prefix="/admin/profile", dependencies=[Depends(require_admin)])
+
+
+@router.get("")
+async def profile(
+    seconds: float = Query(default=10.0, gt=0, le=MAX_SECONDS),
+    format: str = Query(default="json", pattern="^(json|folded)$"),
+    idle: bool = False,
+):
+    """Sample the whole process for `seconds` and return the profile."""
+    session = profiler.start(seconds, include_idle=idle)
+    await asyncio.sleep(session.seconds)
+    while session.running:
+        await asyncio.sleep(INTERVAL_S)
+    return _render(session, format)
+
+
+@router.post("/requests")
+def profile_requests(
+    every: int = Query(default=100, ge=1),
+    seconds: float = Query(default=60.0, gt=0),
+    idle: bool = False,
+):
+    """Sample 1 in `every` requests for the next `seconds`; read the result with GET."""
+    session = profiler.start(seconds, every=every, include_idle=idle)
+    return {"status": "started", "every": every, "seconds": session.seconds}
+
+
+@router.get("/requests")
+def profile_requests_result(format: str = Query(default="json", pattern="^(json|folded)$")):
+    session = profiler.session
+    if session is None or not session.every:
+        raise HTTPException(status_code=404, detail="No request profile has been started")
+    return _render(session, format)
+
+
+@router.delete("/requests")
+def stop_profile_requests(format: str = Query(default="json", pattern="^(json|folded)$")):
+    session = profiler.session
+    if session is None or not session.every:
+        raise HTTPException(status_code=404, detail="No request profile has been started")
+    session.stop.set()
+    return _render(session, format)
@@ -0,0 +1,120 @@
+import json
+import os
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, List
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+MSGPACK = "application/msgpack"
+REFS_HEADER = "X-GovAI-Refs"
+REF_KEY = "$ref"
+REF_CACHE_SIZE = int(os.getenv("WIRE_REF_CACHE_SIZE", "4096"))
+
+_response_format: ContextVar[str] = ContextVar("govai_wire_format", default="application/json")
+_refs: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def _remember(ref: str, value: Any) -> None:
+    _refs[ref] = value
+    _refs.move_to_end(ref)
+    while len(_refs) > REF_CACHE_SIZE:
+        _refs.popitem(last=False)
+
+
+def resolve_refs(value: Any, missing: List[str]) -> Any:
+    """Replace `{"$ref": h, ...}` markers with the cached value for h.
+
+    `{"$ref": h, "value": v}` also caches v. Any other keys next to `$ref`
+    are per-request fields (e.g. a source's score) laid over the cached dict.
+    """
+    if isinstance(value, list):
+        return [resolve_refs(item, missing) for item in value]
+    if not isinstance(value, dict):
+        return value
+    ref = value.get(REF_KEY)
+    if ref is None:
+        return {key: resolve_refs(item, missing) for key, item in value.items()}
+    extra = {key: item for key, item in value.items() if key not in (REF_KEY, "value")}
+    if "value" in value:
+        _remember(ref, value["value"])
+        cached = value["value"]
+    elif ref in _refs:
+        _refs.move_to_end(ref)
+        cached = _refs[ref]
+    else:
+        missing.append(ref)
+        return None
+    return {**cached, **extra} if extra and isinstance(cached, dict) else cached
+
+
+async def _decoded(request: Request) -> Request:
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith(MSGPACK):
+        if msgpack is None:
+            raise HTTPException(status_code=415, detail="msgpack is not installed")
+        data = msgpack.unpackb(body)
+    else:
+        data = json.loads(body) if body else None
+    if request.headers.get(REFS_HEADER) == "1":
+        missing: List[str] = []
+        data = resolve_refs(data, missing)
+        if missing:
+            raise HTTPException(status_code=409, detail={"missing_refs": missing})
+
+    # Hand FastAPI a JSON-typed request with the body already parsed, so it
+    # validates `data` directly instead of decoding the bytes again.
+    headers = [(k, v) for k, v in request.scope["headers"] if k != b"content-type"]
+    headers.append((b"content-type", b"application/json"))
+    decoded = Request({**request.scope, "headers": headers}, request.receive)
+    decoded._body = body
+    decoded._json = data
+    return decoded
+
+
+class WireRoute(APIRoute):
+    """Accepts msgpack and reference-encoded bodies and answers in the format the caller accepts."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def wire_handler(request: Request) -> Response:
+            wants = MSGPACK if msgpack is not None and MSGPACK in request.headers.get("accept", "") else "application/json"
+            token = _response_format.set(wants)
+            try:
+                if (
+                    request.headers.get("content-type", "").startswith(MSGPACK)
+                    or request.headers.get(REFS_HEADER) == "1"
+                ):
+                    request = await _decoded(request)
+                return await handler(request)
+            finally:
+                _response_format.reset(token)
+
+        return wire_handler
+
+
+class WireResponse(JSONResponse):
+    def __init__(self, content: Any, *args: Any, **kwargs: Any) -> None:
+        self.media_type = _response_format.get()
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type == MSGPACK:
+            return msgpack.packb(content)
+        if orjson is not None:
+            return orjson.dumps(content)
+        return super().render(content)
+
@@ -1,53 +1,80 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+SECTIONS = ("model", "sources", "decisioning", "evidence", "risk", "trace")
+
+
+def uncertainty_level(confidence: float, bias: Dict[str, Any]) -> str:
+    if bias.get("risk_level") == "high":
+        return "high"
+    if confidence < 0.2:
+        return "high"
+    if confidence < 0.4:
+        return "medium"
+    return "low"
 
 
 def build_explanation(
     prompt: str,
     answer: str,
-    sources: List[Dict[str, Any]],
+    sources: Sequence[Any],
     confidence: float,
     bias: Dict[str, Any],
     governance: Dict[str, Any],
     model_id: str,
     evidence: Dict[str, Any],
+    verbosity: str = "full",
+    fields: Optional[Iterable[str]] = None,
 ) -> Dict[str, Any]:
-    avg_source_score = 0.0
-    if sources:
-        avg_source_score = round(sum(s["score"] for s in sources) / len(sources), 4)
+    """Build the explanation at the requested verbosity.
 
-    uncertainty = "low"
-    if confidence < 0.2:
-        uncertainty = "high"
-    elif confidence < 0.4:
-        uncertainty = "medium"
+    `sources` are the request's Source models and are referenced, not copied.
+    Below "full", data the caller already has (sources, evidence, bias metrics,
+    policy hits) is pointed to by ID, and the trace is only the decision ID,
+    which the gateway resolves from the audit record on demand.
+    """
+    wanted = set(fields) if fields else set(SECTIONS)
+    full = verbosity == "full"
+    summary = verbosity == "summary"
+    explanation: Dict[str, Any] = {}
+
+    if "model" in wanted:
+        explanation["model"] = {"model_id": model_id, "confidence": confidence}
+
+    if "sources" in wanted:
+        avg_source_score = 0.0
+        if sources:
+            avg_source_score = round(sum(s.score for s in sources) / len(sources), 4)
+        section: Dict[str, Any] = {"count": len(sources), "avg_score": avg_source_score}
+        if full:
+            section["items"] = sources
+        elif not summary:
+            section["ids"] = [s.id for s in sources]
+        explanation["sources"] = section
+
+    if "decisioning" in wanted:
+        section = {"status": governance.get("status")}
+        if not summary:
+            section["reasons"] = governance.get("reasons", [])
+        if full:
+            section["policy_hits"] = governance.get("policy_hits", [])
+        explanation["decisioning"] = section
+
+    if "evidence" in wanted and full:
+        explanation["evidence"] = evidence
+
+    if "risk" in wanted:
+        section = {"bias_risk": bias.get("risk_level"), "uncertainty": uncertainty_level(confidence, bias)}
+        if not summary:
+            section["bias_score"] = bias.get("bias_score")
+        if full:
+            section["bias_metrics"] = bias.get("metrics", {})
+        explanation["risk"] = section
+
+    if "trace" in wanted:
+        if full:
+            explanation["trace"] = {"prompt": prompt, "answer": answer}
+        else:
+            explanation["trace"] = {"decision_id": governance.get("decision_id")}
+
+    return explanation
 
-    if bias.get("risk_level") == "high":
-        uncertainty = "high"
-
-    return {
-        "model": {
-            "model_id": model_id,
-            "confidence": confidence,
-        },
-        "sources": {
-            "count": len(sources),
-            "avg_score": avg_source_score,
-            "items": sources,
-        },
-        "decisioning": {
-            "status": governance.get("status"),
-            "reasons": governance.get("reasons", []),
-            "policy_hits": governance.get("policy_hits", []),
-        },
-        "evidence": evidence,
-        "risk": {
-            "bias_score": bias.get("bias_score"),
-            "bias_risk": bias.get("risk_level"),
-            "bias_metrics": bias.get("metrics", {}),
-            "uncertainty": uncertainty,
-        },
-        "trace": {
-            "prompt": prompt,
-            "answer": answer,
-        },
-    }
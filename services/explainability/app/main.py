@@ -1,8 +1,13 @@
 from fastapi import FastAPI
-from .schemas import ExplainRequest, ExplainResponse
+from govai_common.profiling import SamplingMiddleware, router as profiling_router
+from govai_common.wire import WireResponse, WireRoute
+from .schemas import ExplainRequest, ExplainResponse, ExplainBatchRequest, ExplainBatchResponse
 from .explain import build_explanation
 
-app = FastAPI(title="GovAI Explainability", version="0.1.0")
+app = FastAPI(title="GovAI Explainability", version="0.1.0", default_response_class=WireResponse)
+app.router.route_class = WireRoute
+app.add_middleware(SamplingMiddleware)
+app.include_router(profiling_router)
 
 @app.get("/health")
 def health():
@@ -13,11 +18,17 @@ def explain(req: ExplainRequest):
     explanation = build_explanation(
         prompt=req.prompt,
         answer=req.answer,
-        sources=[s.model_dump() for s in req.sources],
+        sources=req.sources,
         confidence=req.confidence,
         bias=req.bias,
         governance=req.governance,
         model_id=req.model_id,
         evidence=req.evidence,
+        verbosity=req.verbosity,
+        fields=req.fields,
     )
     return {"explanation": explanation}
+
+@app.post("/explain/batch", response_model=ExplainBatchResponse)
+def explain_batch(req: ExplainBatchRequest):
+    return {"results": [explain(item) for item in req.items]}
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel
 
 class Source(BaseModel):
@@ -18,6 +18,14 @@ class ExplainRequest(BaseModel):
     governance: Dict[str, Any]
     model_id: str
     evidence: Dict[str, Any]
+    verbosity: Literal["summary", "standard", "full"] = "full"
+    fields: Optional[List[Literal["model", "sources", "decisioning", "evidence", "risk", "trace"]]] = None
 
 class ExplainResponse(BaseModel):
     explanation: Dict[str, Any]
+
+class ExplainBatchRequest(BaseModel):
+    items: List[ExplainRequest]
+
+class ExplainBatchResponse(BaseModel):
+    results: List[ExplainResponse]
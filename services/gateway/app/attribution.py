@@ -0,0 +1,57 @@
+import asyncio
+import contextvars
+import logging
+from typing import Any, Dict, Tuple
+
+from .clients import call_attribution, call_store_attribution
+from .config import settings
+from .resilience import deadline_scope
+
+logger = logging.getLogger(__name__)
+
+# decision_id -> (tenant_id, task) for attribution jobs still running here.
+_pending: Dict[str, Tuple[str, asyncio.Task]] = {}
+_slots: asyncio.Semaphore | None = None
+
+
+async def _run(decision_id: str, tenant_id: str, answer: str, sources: Any) -> None:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(1, settings.attribution_concurrency))
+    async with _slots:
+        record: Dict[str, Any] = {"decision_id": decision_id, "tenant_id": tenant_id}
+        try:
+            with deadline_scope(settings.attribution_timeout_s):
+                result = await call_attribution({"decision_id": decision_id, "answer": answer, "sources": sources})
+            result.pop("decision_id", None)
+            record.update(status="completed", method=result.pop("method", None), result=result)
+        except Exception as exc:
+            record.update(status="failed", result={"error": str(exc) or exc.__class__.__name__})
+        try:
+            with deadline_scope(settings.call_timeout_s):
+                await call_store_attribution(record)
+        except Exception:
+            logger.exception("Could not store attribution for decision %s", decision_id)
+
+
+def schedule(tenant_id: str, rag: Dict[str, Any], governance: Dict[str, Any]) -> None:
+    """Start attribution for a recorded decision without waiting for it."""
+    if not settings.attribution_enabled:
+        return
+    decision_id = governance["decision_id"]
+    # Start from an empty context so the job does not inherit the request's deadline.
+    task = contextvars.Context().run(
+        asyncio.create_task, _run(decision_id, tenant_id, rag["answer"], rag["sources"])
+    )
+    _pending[decision_id] = (tenant_id, task)
+    task.add_done_callback(lambda _: _pending.pop(decision_id, None))
+
+
+def pending_tenant(decision_id: str) -> str | None:
+    entry = _pending.get(decision_id)
+    return entry[0] if entry else None
+
+
+def cancel_all() -> None:
+    for _, task in list(_pending.values()):
+        task.cancel()
@@ -1,31 +1,247 @@
-from typing import Any, Dict
+from typing import Any, Awaitable, Dict, List
 import asyncio
+import random
 import httpx
 from .config import settings
+from . import inprocess, wire
+from .ratelimit import downstream_slot
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RetryBudget,
+    UpstreamError,
+    breaker_for,
+    budget_for,
+    remaining,
+)
 
-async def post_json(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-    backoff = 0.5
-    last_error: Exception | None = None
-    for _ in range(5):
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+RETRYABLE_STATUS = {502, 503, 504}
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_connections,
+            )
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _never_sent(exc: Exception) -> bool:
+    return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+
+def _is_retryable(exc: Exception, idempotent: bool) -> bool:
+    # A request that never reached the service is safe to resend even for
+    # non-idempotent endpoints such as governance /evaluate.
+    if _never_sent(exc):
+        return True
+    if not idempotent:
+        return False
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+def _is_service_failure(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _describe(exc: Exception) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"HTTP {exc.response.status_code}"
+    return exc.__class__.__name__
+
+
+async def _send(
+    service: str, url: str, payload: Dict[str, Any] | None, timeout: float, refs: bool = True
+) -> httpx.Response:
+    deadline = {DEADLINE_HEADER: str(int(timeout * 1000))}
+    if payload is None:
+        return await get_client().get(url, timeout=timeout, headers=deadline)
+    body, headers = wire.encode_request(service, payload, refs)
+    return await get_client().post(url, content=body, timeout=timeout, headers={**headers, **deadline})
+
+
+async def _attempt(service: str, url: str, payload: Dict[str, Any] | None, breaker: CircuitBreaker) -> Dict[str, Any]:
+    left = remaining(settings.call_timeout_s)
+    if left <= 0:
+        raise DeadlineExceeded(service, "deadline exceeded")
+    timeout = min(settings.call_timeout_s, left)
+    probe = breaker.before_call()
+    try:
+        resp = await _send(service, url, payload, timeout)
+        missing = wire.missing_refs(resp)
+        if missing:
+            # Each replica behind the Service has its own ref cache, so a
+            # resend with refs could 409 again on another replica: send every
+            # value inline this time. Forgetting the refs makes the next
+            # request carry them again to repopulate the caches.
+            wire.forget(service, missing)
+            resp = await _send(service, url, payload, timeout, refs=False)
+        resp.raise_for_status()
+    except Exception as exc:
+        if _is_service_failure(exc):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    except BaseException:
+        # Cancelled (lost a hedge race, coalesced waiter gone, client
+        # disconnected): says nothing about the service, but must not leave
+        # the half-open probe slot taken or the breaker never closes again.
+        if probe:
+            breaker.release_probe()
+        raise
+    breaker.record_success()
+    return wire.decode_response(resp)
+
+
+async def _hedged(
+    service: str,
+    url: str,
+    payload: Dict[str, Any],
+    breaker: CircuitBreaker,
+    budget: RetryBudget,
+    delay: float,
+) -> Dict[str, Any]:
+    first = asyncio.create_task(_attempt(service, url, payload, breaker))
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done or remaining(settings.call_timeout_s) <= 0 or not budget.try_spend():
+        return await first
+
+    pending = {first, asyncio.create_task(_attempt(service, url, payload, breaker))}
+    error: BaseException | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def post_json(
+    service: str,
+    url: str,
+    payload: Dict[str, Any] | None,
+    idempotent: bool = True,
+    hedge_delay: float = 0.0,
+) -> Dict[str, Any]:
+    """POST `payload` (or GET when it is None) with retries, breaker and deadline."""
+    breaker = breaker_for(service, settings.breaker_failure_threshold, settings.breaker_reset_s)
+    budget = budget_for(service, settings.retry_budget_ratio)
+    budget.record_request()
+    backoff = settings.retry_backoff_s
+    retries = 0
+    while True:
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                resp = await client.post(url, json=payload)
-                resp.raise_for_status()
-                return resp.json()
+            if hedge_delay > 0:
+                return await _hedged(service, url, payload, breaker, budget, hedge_delay)
+            return await _attempt(service, url, payload, breaker)
+        except (CircuitOpenError, DeadlineExceeded):
+            raise
         except Exception as exc:
-            last_error = exc
-            await asyncio.sleep(backoff)
+            if remaining(1.0) <= 0:
+                raise DeadlineExceeded(service, "deadline exceeded") from exc
+            if retries >= settings.max_retries or not _is_retryable(exc, idempotent) or not budget.try_spend():
+                raise UpstreamError(service, _describe(exc)) from exc
+            retries += 1
+            await asyncio.sleep(min(backoff * random.uniform(0.5, 1.5), max(0.0, remaining(backoff))))
             backoff *= 2
-    raise last_error if last_error else RuntimeError("Request failed")
+
+
+async def get_json(service: str, url: str) -> Dict[str, Any]:
+    return await post_json(service, url, None)
+
+
+async def _local(service: str, call: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        return await asyncio.wait_for(call, timeout=max(0.0, remaining(settings.call_timeout_s)))
+    except asyncio.TimeoutError as exc:
+        raise DeadlineExceeded(service, "deadline exceeded") from exc
+
 
 async def call_rag(payload: Dict[str, Any]) -> Dict[str, Any]:
-    return await post_json(f"{settings.rag_url}/generate", payload)
+    async with downstream_slot(payload["tenant_id"]):
+        return await post_json("rag", f"{settings.rag_url}/generate", payload, hedge_delay=settings.rag_hedge_delay_s)
 
 async def call_bias(payload: Dict[str, Any]) -> Dict[str, Any]:
-    return await post_json(f"{settings.bias_url}/analyze", payload)
+    async with downstream_slot(payload["tenant_id"]):
+        if inprocess.is_local("bias"):
+            return await _local("bias", inprocess.analyze_bias(payload))
+        return await post_json("bias", f"{settings.bias_url}/analyze", payload)
+
+async def call_bias_batch(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async with downstream_slot(payloads[0]["tenant_id"]):
+        if inprocess.is_local("bias"):
+            return await _local("bias", inprocess.analyze_bias_batch(payloads))
+        resp = await post_json("bias", f"{settings.bias_url}/analyze/batch", {"items": payloads})
+        return resp["results"]
 
 async def call_governance(payload: Dict[str, Any]) -> Dict[str, Any]:
-    return await post_json(f"{settings.gov_url}/evaluate", payload)
+    async with downstream_slot(payload["tenant_id"]):
+        if inprocess.is_local("governance"):
+            return await _local("governance", inprocess.evaluate_governance(payload))
+        return await post_json("governance", f"{settings.gov_url}/evaluate", payload, idempotent=False)
 
 async def call_explain(payload: Dict[str, Any]) -> Dict[str, Any]:
-    return await post_json(f"{settings.explain_url}/explain", payload)
+    async with downstream_slot(payload["tenant_id"]):
+        if inprocess.is_local("explainability"):
+            return await _local("explainability", inprocess.explain(payload))
+        return await post_json("explainability", f"{settings.explain_url}/explain", payload)
+
+async def call_explain_batch(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async with downstream_slot(payloads[0]["tenant_id"]):
+        if inprocess.is_local("explainability"):
+            return await _local("explainability", inprocess.explain_batch(payloads))
+        resp = await post_json("explainability", f"{settings.explain_url}/explain/batch", {"items": payloads})
+        return resp["results"]
+
+async def _get_optional(service: str, url: str) -> Dict[str, Any] | None:
+    try:
+        return await get_json(service, url)
+    except UpstreamError as exc:
+        cause = exc.__cause__
+        if isinstance(cause, httpx.HTTPStatusError) and cause.response.status_code == 404:
+            return None
+        raise
+
+async def call_decision_detail(decision_id: str) -> Dict[str, Any] | None:
+    if inprocess.is_local("governance"):
+        return await _local("governance", inprocess.decision_detail(decision_id))
+    return await _get_optional("governance", f"{settings.gov_url}/decisions/{decision_id}/detail")
+
+async def call_attribution(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Own breaker and retry budget so background attribution failures never trip /generate.
+    return await post_json("attribution", f"{settings.rag_url}/attribution", payload)
+
+async def call_store_attribution(record: Dict[str, Any]) -> Dict[str, Any]:
+    if inprocess.is_local("governance"):
+        return await _local("governance", inprocess.store_attribution(record))
+    return await post_json("governance", f"{settings.gov_url}/attributions", record)
+
+async def call_get_attribution(decision_id: str) -> Dict[str, Any] | None:
+    if inprocess.is_local("governance"):
+        return await _local("governance", inprocess.get_attribution(decision_id))
+    return await _get_optional("governance", f"{settings.gov_url}/attributions/{decision_id}")
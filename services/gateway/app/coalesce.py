@@ -0,0 +1,65 @@
+import asyncio
+import copy
+import math
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from .resilience import DeadlineExceeded, remaining
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+        self.callers = 0
+
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share one execution.
+
+    The work runs as its own task, so a caller that disconnects or runs out of
+    time does not fail the others; it is cancelled only once nobody waits for
+    it. The task carries the first caller's deadline, and every caller still
+    stops waiting at its own.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def _finished(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(work()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finished(key, flight))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        flight.waiters += 1
+        flight.callers += 1
+        try:
+            budget = remaining(math.inf)
+            done, _ = await asyncio.wait({flight.task}, timeout=None if budget == math.inf else max(0.0, budget))
+            if not done:
+                raise DeadlineExceeded("gateway", "deadline exceeded waiting for a shared request")
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self._finished(key, flight)
+                flight.task.cancel()
+        result = flight.task.result()
+        # Callers go on to build and mutate payloads from the result independently.
+        return copy.deepcopy(result) if flight.callers > 1 else result
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._flights), "leaders": self.leaders, "followers": self.followers}
+
+
+def normalise_prompt(prompt: str) -> str:
+    return " ".join(prompt.split()).casefold()
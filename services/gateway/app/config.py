@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from pathlib import Path
+from typing import Any, Dict, List, Literal
+from pydantic import BaseModel, Field
+import json
 import os
 
 class Settings(BaseModel):
@@ -9,5 +12,39 @@ class Settings(BaseModel):
     explain_url: str = os.getenv("EXPLAIN_URL", "http://localhost:8004")
     api_key: str = os.getenv("GOVAI_API_KEY", "")
     enforce_api_key: bool = os.getenv("GOVAI_ENFORCE_API_KEY", "true").lower() == "true"
+    request_deadline_s: float = float(os.getenv("GATEWAY_REQUEST_DEADLINE_S", "60"))
+    call_timeout_s: float = float(os.getenv("GATEWAY_CALL_TIMEOUT_S", "30"))
+    max_retries: int = int(os.getenv("GATEWAY_MAX_RETRIES", "2"))
+    retry_backoff_s: float = float(os.getenv("GATEWAY_RETRY_BACKOFF_S", "0.1"))
+    retry_budget_ratio: float = float(os.getenv("GATEWAY_RETRY_BUDGET_RATIO", "0.2"))
+    breaker_failure_threshold: int = int(os.getenv("GATEWAY_BREAKER_FAILURES", "5"))
+    breaker_reset_s: float = float(os.getenv("GATEWAY_BREAKER_RESET_S", "30"))
+    rag_hedge_delay_s: float = float(os.getenv("GATEWAY_RAG_HEDGE_DELAY_S", "0"))
+    max_connections: int = int(os.getenv("GATEWAY_MAX_CONNECTIONS", "100"))
+    batch_max_items: int = int(os.getenv("GATEWAY_BATCH_MAX_ITEMS", "5000"))
+    batch_concurrency: int = int(os.getenv("GATEWAY_BATCH_CONCURRENCY", "8"))
+    batch_chunk_size: int = int(os.getenv("GATEWAY_BATCH_CHUNK_SIZE", "16"))
+    job_ttl_s: int = int(os.getenv("GATEWAY_JOB_TTL_S", "3600"))
+    rate_limit_rps: float = float(os.getenv("GATEWAY_RATE_LIMIT_RPS", "0"))
+    rate_limit_burst: float = float(os.getenv("GATEWAY_RATE_LIMIT_BURST", "20"))
+    tenant_quotas: Dict[str, Dict[str, Any]] = json.loads(os.getenv("GATEWAY_TENANT_QUOTAS") or "{}")
+    rate_limit_store: str = os.getenv("GATEWAY_RATE_LIMIT_STORE", "")
+    max_inflight: int = int(os.getenv("GATEWAY_MAX_INFLIGHT", "0"))
+    tenant_queue_limit: int = int(os.getenv("GATEWAY_TENANT_QUEUE_LIMIT", "200"))
+    # Validated when settings load, so a bad value fails startup rather than every request.
+    explain_verbosity: Literal["summary", "standard", "full"] = Field(
+        default=os.getenv("GATEWAY_EXPLAIN_VERBOSITY", "standard").lower(), validate_default=True
+    )
+    coalesce_requests: bool = os.getenv("GATEWAY_COALESCE", "true").lower() == "true"
+    attribution_enabled: bool = os.getenv("GATEWAY_ATTRIBUTION", "false").lower() == "true"
+    attribution_concurrency: int = int(os.getenv("GATEWAY_ATTRIBUTION_CONCURRENCY", "2"))
+    attribution_timeout_s: float = float(os.getenv("GATEWAY_ATTRIBUTION_TIMEOUT_S", "120"))
+    wire_format: str = os.getenv("GATEWAY_WIRE_FORMAT", "json").lower()
+    wire_refs: bool = os.getenv("GATEWAY_WIRE_REFS", "false").lower() == "true"
+    wire_ref_cache_size: int = int(os.getenv("WIRE_REF_CACHE_SIZE", "4096"))
+    inprocess_services: List[str] = [
+        name.strip() for name in os.getenv("GATEWAY_INPROCESS_SERVICES", "").split(",") if name.strip()
+    ]
+    services_root: str = os.getenv("GOVAI_SERVICES_ROOT", str(Path(__file__).resolve().parents[2]))
 
 settings = Settings()
@@ -0,0 +1,107 @@
+import asyncio
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List
+
+from fastapi import HTTPException
+
+from .config import settings
+
+LOCAL_CAPABLE = ("bias", "governance", "explainability")
+
+
+def _load(service: str, module: str) -> ModuleType:
+    # Every service ships its code as a top-level `app` package, so sibling
+    # services are imported under a distinct name to avoid clashing with ours.
+    package = f"govai_{service}"
+    if package not in sys.modules:
+        init = Path(settings.services_root) / service / "app" / "__init__.py"
+        spec = importlib.util.spec_from_file_location(
+            package, init, submodule_search_locations=[str(init.parent)]
+        )
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load {service} from {init}")
+        pkg = importlib.util.module_from_spec(spec)
+        sys.modules[package] = pkg
+        spec.loader.exec_module(pkg)
+    return importlib.import_module(f"{package}.{module}")
+
+
+def is_local(service: str) -> bool:
+    return service in settings.inprocess_services
+
+
+def startup() -> None:
+    for service in settings.inprocess_services:
+        if service not in LOCAL_CAPABLE:
+            raise ValueError(f"{service} cannot run in-process; choose from {', '.join(LOCAL_CAPABLE)}")
+        _load(service, "main")
+    if is_local("governance"):
+        _load("governance", "main").init_db()
+
+
+async def shutdown() -> None:
+    if is_local("governance"):
+        await _load("governance", "main").close_db()
+
+
+async def analyze_bias(payload: Dict[str, Any]) -> Dict[str, Any]:
+    main = _load("bias", "main")
+    schemas = _load("bias", "schemas")
+    return main.analyze(schemas.BiasRequest(**payload))
+
+
+async def analyze_bias_batch(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    main = _load("bias", "main")
+    schemas = _load("bias", "schemas")
+    return [main.analyze(schemas.BiasRequest(**payload)) for payload in payloads]
+
+
+async def evaluate_governance(payload: Dict[str, Any]) -> Dict[str, Any]:
+    main = _load("governance", "main")
+    schemas = _load("governance", "schemas")
+    # Governance talks to Postgres synchronously; keep it off the event loop.
+    return await asyncio.to_thread(main.evaluate_direct, schemas.EvaluateRequest(**payload))
+
+
+def _with_session(handler, *args: Any) -> Dict[str, Any] | None:
+    db = _load("governance", "main").SessionLocal()
+    try:
+        return handler(*args, db)
+    except HTTPException as exc:
+        if exc.status_code == 404:
+            return None
+        raise
+    finally:
+        db.close()
+
+
+async def decision_detail(decision_id: str) -> Dict[str, Any] | None:
+    main = _load("governance", "main")
+    return await asyncio.to_thread(_with_session, main.decision_detail, decision_id)
+
+
+async def store_attribution(record: Dict[str, Any]) -> Dict[str, Any]:
+    main = _load("governance", "main")
+    schemas = _load("governance", "schemas")
+    return await asyncio.to_thread(_with_session, main.store_attribution, schemas.AttributionCreate(**record))
+
+
+async def get_attribution(decision_id: str) -> Dict[str, Any] | None:
+    main = _load("governance", "main")
+    return await asyncio.to_thread(_with_session, main.get_attribution, decision_id)
+
+
+async def explain(payload: Dict[str, Any]) -> Dict[str, Any]:
+    main = _load("explainability", "main")
+    schemas = _load("explainability", "schemas")
+    return main.explain(schemas.ExplainRequest(**payload))
+
+
+async def explain_batch(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    main = _load("explainability", "main")
+    schemas = _load("explainability", "schemas")
+    return [main.explain(schemas.ExplainRequest(**payload)) for payload in payloads]
@@ -0,0 +1,81 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from .config import settings
+from .pipeline import run_batch
+from .schemas import GenerateRequest
+
+
+@dataclass
+class BatchJob:
+    job_id: str
+    tenant_id: str
+    total: int
+    status: str = "queued"
+    completed: int = 0
+    failed: int = 0
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    finished_at: float | None = None
+    task: asyncio.Task | None = None
+
+    def view(self, offset: int, limit: int) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "results": self.results[offset : offset + limit],
+        }
+
+
+_jobs: Dict[str, BatchJob] = {}
+
+
+def _evict_expired() -> None:
+    now = time.monotonic()
+    for job_id, job in list(_jobs.items()):
+        if job.finished_at is not None and now - job.finished_at > settings.job_ttl_s:
+            del _jobs[job_id]
+
+
+async def _run(job: BatchJob, items: List[GenerateRequest], concurrency: int) -> None:
+    job.status = "running"
+    try:
+        async for row in run_batch(items, concurrency):
+            job.results.append(row)
+            if "error" in row:
+                job.failed += 1
+            else:
+                job.completed += 1
+        job.status = "completed"
+    except asyncio.CancelledError:
+        job.status = "cancelled"
+        raise
+    except Exception:
+        job.status = "failed"
+    finally:
+        job.finished_at = time.monotonic()
+        job.task = None
+
+
+def submit(tenant_id: str, items: List[GenerateRequest], concurrency: int) -> BatchJob:
+    _evict_expired()
+    job = BatchJob(job_id=str(uuid.uuid4()), tenant_id=tenant_id, total=len(items))
+    _jobs[job.job_id] = job
+    job.task = asyncio.create_task(_run(job, items, concurrency))
+    return job
+
+
+def get(job_id: str) -> BatchJob | None:
+    _evict_expired()
+    return _jobs.get(job_id)
+
+
+def cancel_all() -> None:
+    for job in _jobs.values():
+        if job.task is not None:
+            job.task.cancel()
@@ -1,9 +1,62 @@
-from fastapi import FastAPI, Header, HTTPException, Depends
+import json
+
+from fastapi import FastAPI, Header, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from govai_common.profiling import SamplingMiddleware, router as profiling_router
 from .config import settings
-from .schemas import GenerateRequest, GenerateResponse
-from .clients import call_rag, call_bias, call_governance, call_explain
+from .schemas import (
+    AttributionRecord,
+    BatchGenerateRequest,
+    ExplanationTrace,
+    GenerateRequest,
+    GenerateResponse,
+    JobStatus,
+)
+from .clients import call_decision_detail, call_get_attribution, close_client
+from .pipeline import inflight, run_batch, run_pipeline
+from . import attribution, jobs
+from .resilience import CircuitOpenError, DeadlineExceeded, UpstreamError, breaker_states, deadline_scope
+from . import inprocess
+from . import ratelimit
 
 app = FastAPI(title="GovAI Gateway", version="0.1.0")
+app.add_middleware(SamplingMiddleware)
+app.include_router(profiling_router)
+
+
+@app.on_event("startup")
+def load_inprocess_services():
+    inprocess.startup()
+
+
+@app.on_event("shutdown")
+async def close_inprocess_services():
+    jobs.cancel_all()
+    attribution.cancel_all()
+    await inprocess.shutdown()
+    await close_client()
+
+
+@app.exception_handler(UpstreamError)
+async def upstream_error(request: Request, exc: UpstreamError):
+    status_code = 502
+    if isinstance(exc, CircuitOpenError):
+        status_code = 503
+    elif isinstance(exc, DeadlineExceeded):
+        status_code = 504
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": f"Upstream {exc.service} unavailable: {exc.detail}"},
+    )
+
+
+def request_timeout(
+    x_request_timeout_ms: int | None = Header(default=None, alias="X-Request-Timeout-Ms"),
+) -> float:
+    timeout = settings.request_deadline_s
+    if x_request_timeout_ms is not None and x_request_timeout_ms > 0:
+        timeout = min(timeout, x_request_timeout_ms / 1000.0)
+    return timeout
 
 
 def enforce_security(
@@ -19,66 +72,100 @@ def enforce_security(
         raise HTTPException(status_code=400, detail="Missing X-Tenant-Id header")
     return x_tenant_id
 
+
+async def rate_limited(tenant_id: str = Depends(enforce_security)) -> str:
+    await ratelimit.enforce(tenant_id)
+    return tenant_id
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
+@app.get("/health/upstreams")
+async def upstream_health():
+    return {"breakers": breaker_states(), "coalescing": inflight.stats()}
+
 @app.post("/generate", response_model=GenerateResponse)
-async def generate(req: GenerateRequest, tenant_header: str = Depends(enforce_security)):
+async def generate(
+    req: GenerateRequest,
+    tenant_header: str = Depends(rate_limited),
+    timeout: float = Depends(request_timeout),
+):
     if tenant_header != req.tenant_id:
         raise HTTPException(status_code=403, detail="Tenant header mismatch")
-    rag_payload = {
-        "tenant_id": req.tenant_id,
-        "user_id": req.user_id,
-        "prompt": req.prompt,
-        "top_k": req.top_k,
-    }
-    rag = await call_rag(rag_payload)
+    with deadline_scope(timeout):
+        return await run_pipeline(req)
 
-    bias_payload = {
-        "tenant_id": req.tenant_id,
-        "user_id": req.user_id,
-        "prompt": req.prompt,
-        "answer": rag["answer"],
-    }
-    bias = await call_bias(bias_payload)
-
-    gov_payload = {
-        "tenant_id": req.tenant_id,
-        "user_id": req.user_id,
-        "prompt": req.prompt,
-        "answer": rag["answer"],
-        "sources": rag["sources"],
-        "confidence": rag["confidence"],
-        "bias_score": bias["bias_score"],
-        "policy_mode": req.policy_mode,
-        "model_id": rag.get("model_id", "unknown"),
-        "consistency_score": rag.get("evidence", {}).get("consistency_score", 0.0),
-        "evidence_flags": rag.get("evidence", {}).get("flags", []),
-    }
-    governance = await call_governance(gov_payload)
-
-    explain_payload = {
-        "tenant_id": req.tenant_id,
-        "user_id": req.user_id,
-        "prompt": req.prompt,
-        "answer": rag["answer"],
-        "sources": rag["sources"],
-        "confidence": rag["confidence"],
-        "bias": bias,
-        "governance": governance,
-        "model_id": rag.get("model_id", "unknown"),
-        "evidence": rag.get("evidence", {}),
-    }
-    explainability = await call_explain(explain_payload)
 
+@app.get("/explanations/{decision_id}/trace", response_model=ExplanationTrace)
+async def explanation_trace(decision_id: str, tenant_header: str = Depends(rate_limited)):
+    """Full trace for an explanation returned at summary/standard verbosity, read from the audit record."""
+    with deadline_scope(settings.request_deadline_s):
+        detail = await call_decision_detail(decision_id)
+    if detail is None or detail["audit"]["tenant_id"] != tenant_header:
+        raise HTTPException(status_code=404, detail="Decision not found")
+    decision, audit = detail["decision"], detail["audit"]
     return {
-        "answer": rag["answer"],
-        "sources": rag["sources"],
-        "confidence": rag["confidence"],
-        "model_id": rag.get("model_id", "unknown"),
-        "bias": bias,
-        "governance": governance,
-        "explainability": explainability,
-        "evidence": rag.get("evidence", {}),
+        "decision_id": decision["id"],
+        "status": decision["status"],
+        "reasons": decision["reasons"],
+        "policy_hits": decision["policy_hits"],
+        "prompt": audit["prompt"],
+        "answer": audit["answer"],
+        "model_id": audit["model_id"],
+        "confidence": audit["confidence"],
+        "bias_score": audit["bias_score"],
+        "created_at": decision["created_at"],
     }
+
+
+@app.get("/explanations/{decision_id}/attribution", response_model=AttributionRecord)
+async def explanation_attribution(decision_id: str, tenant_header: str = Depends(rate_limited)):
+    with deadline_scope(settings.request_deadline_s):
+        record = await call_get_attribution(decision_id)
+    if record is None:
+        if attribution.pending_tenant(decision_id) == tenant_header:
+            return {"decision_id": decision_id, "status": "pending"}
+        raise HTTPException(status_code=404, detail="Attribution not found")
+    if record["tenant_id"] != tenant_header:
+        raise HTTPException(status_code=404, detail="Attribution not found")
+    return record
+
+
+def _check_batch(batch: BatchGenerateRequest, tenant_header: str) -> int:
+    if not batch.items:
+        raise HTTPException(status_code=400, detail="Batch has no items")
+    if len(batch.items) > settings.batch_max_items:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {settings.batch_max_items} items")
+    if any(item.tenant_id != tenant_header for item in batch.items):
+        raise HTTPException(status_code=403, detail="Tenant header mismatch")
+    return min(batch.concurrency or settings.batch_concurrency, settings.batch_concurrency)
+
+
+@app.post("/generate/batch")
+async def generate_batch(batch: BatchGenerateRequest, tenant_header: str = Depends(enforce_security)):
+    # Not rate_limited: every item is admitted through the tenant's bucket in run_batch.
+    concurrency = _check_batch(batch, tenant_header)
+
+    async def stream():
+        async for row in run_batch(batch.items, concurrency):
+            yield json.dumps(row) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs/generate", response_model=JobStatus, status_code=202)
+async def submit_generate_job(batch: BatchGenerateRequest, tenant_header: str = Depends(enforce_security)):
+    concurrency = _check_batch(batch, tenant_header)
+    job = jobs.submit(tenant_header, batch.items, concurrency)
+    return job.view(0, 0)
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_generate_job(
+    job_id: str, offset: int = 0, limit: int = 500, tenant_header: str = Depends(enforce_security)
+):
+    job = jobs.get(job_id)
+    if job is None or job.tenant_id != tenant_header:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.view(max(0, offset), max(0, min(limit, 5000)))
@@ -0,0 +1,190 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from .config import settings
+from .schemas import GenerateRequest, GenerateResponse
+from .clients import (
+    call_rag,
+    call_bias,
+    call_bias_batch,
+    call_governance,
+    call_explain,
+    call_explain_batch,
+)
+from .resilience import deadline_scope
+from .coalesce import SingleFlight, normalise_prompt
+from . import attribution, ratelimit
+
+inflight = SingleFlight()
+
+
+def rag_payload(req: GenerateRequest) -> Dict[str, Any]:
+    return {
+        "tenant_id": req.tenant_id,
+        "user_id": req.user_id,
+        "prompt": req.prompt,
+        "top_k": req.top_k,
+    }
+
+
+def bias_payload(req: GenerateRequest, rag: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "tenant_id": req.tenant_id,
+        "user_id": req.user_id,
+        "prompt": req.prompt,
+        "answer": rag["answer"],
+    }
+
+
+def gov_payload(req: GenerateRequest, rag: Dict[str, Any], bias: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "tenant_id": req.tenant_id,
+        "user_id": req.user_id,
+        "prompt": req.prompt,
+        "answer": rag["answer"],
+        "sources": rag["sources"],
+        "confidence": rag["confidence"],
+        "bias_score": bias["bias_score"],
+        "policy_mode": req.policy_mode,
+        "model_id": rag.get("model_id", "unknown"),
+        "consistency_score": rag.get("evidence", {}).get("consistency_score", 0.0),
+        "evidence_flags": rag.get("evidence", {}).get("flags", []),
+    }
+
+
+def explain_payload(
+    req: GenerateRequest, rag: Dict[str, Any], bias: Dict[str, Any], governance: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "tenant_id": req.tenant_id,
+        "user_id": req.user_id,
+        "prompt": req.prompt,
+        "answer": rag["answer"],
+        "sources": rag["sources"],
+        "confidence": rag["confidence"],
+        "bias": bias,
+        "governance": governance,
+        "model_id": rag.get("model_id", "unknown"),
+        "evidence": rag.get("evidence", {}),
+        "verbosity": req.explain_verbosity or settings.explain_verbosity,
+        "fields": req.explain_fields,
+    }
+
+
+def assemble(
+    rag: Dict[str, Any], bias: Dict[str, Any], governance: Dict[str, Any], explainability: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "answer": rag["answer"],
+        "sources": rag["sources"],
+        "confidence": rag["confidence"],
+        "model_id": rag.get("model_id", "unknown"),
+        "bias": bias,
+        "governance": governance,
+        "explainability": explainability,
+        "evidence": rag.get("evidence", {}),
+    }
+
+
+def coalesce_key(req: GenerateRequest) -> Tuple[Any, ...]:
+    return (req.tenant_id, normalise_prompt(req.prompt), req.top_k, req.policy_mode)
+
+
+async def _rag_and_bias(req: GenerateRequest) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    rag = await call_rag(rag_payload(req))
+    bias = await call_bias(bias_payload(req, rag))
+    return rag, bias
+
+
+async def run_pipeline(req: GenerateRequest) -> Dict[str, Any]:
+    # Identical questions in flight share retrieval, generation and bias
+    # scoring; governance and explainability stay per request so every caller
+    # gets its own audit entry and decision ID.
+    if settings.coalesce_requests:
+        rag, bias = await inflight.do(coalesce_key(req), lambda: _rag_and_bias(req))
+    else:
+        rag, bias = await _rag_and_bias(req)
+    governance = await call_governance(gov_payload(req, rag, bias))
+    attribution.schedule(req.tenant_id, rag, governance)
+    explainability = await call_explain(explain_payload(req, rag, bias, governance))
+    return assemble(rag, bias, governance, explainability)
+
+
+BatchRow = Dict[str, Any]
+
+
+def _error_row(index: int, exc: BaseException) -> BatchRow:
+    return {"index": index, "error": str(exc) or exc.__class__.__name__}
+
+
+async def _run_chunk(
+    chunk: List[Tuple[int, GenerateRequest]], rag_slots: asyncio.Semaphore
+) -> List[BatchRow]:
+    async def rag_for(req: GenerateRequest) -> Dict[str, Any]:
+        await ratelimit.admit(req.tenant_id)
+        async with rag_slots:
+            with deadline_scope(settings.request_deadline_s):
+                return await call_rag(rag_payload(req))
+
+    rags = await asyncio.gather(*(rag_for(req) for _, req in chunk), return_exceptions=True)
+    rows: List[BatchRow] = []
+    live: List[Tuple[int, GenerateRequest, Dict[str, Any]]] = []
+    for (index, req), rag in zip(chunk, rags):
+        if isinstance(rag, BaseException):
+            rows.append(_error_row(index, rag))
+        else:
+            live.append((index, req, rag))
+    if not live:
+        return rows
+
+    # Bias and explainability are cheap and stateless, so each stage goes out
+    # as one batched call per chunk; governance stays per item because every
+    # answer needs its own audit record.
+    try:
+        with deadline_scope(settings.request_deadline_s):
+            biases = await call_bias_batch([bias_payload(req, rag) for _, req, rag in live])
+
+            async def gov_for(req: GenerateRequest, rag: Dict[str, Any], bias: Dict[str, Any]) -> Dict[str, Any]:
+                async with rag_slots:
+                    return await call_governance(gov_payload(req, rag, bias))
+
+            governances = await asyncio.gather(
+                *(gov_for(req, rag, bias) for (_, req, rag), bias in zip(live, biases)),
+                return_exceptions=True,
+            )
+            done = []
+            for (index, req, rag), bias, governance in zip(live, biases, governances):
+                if isinstance(governance, BaseException):
+                    rows.append(_error_row(index, governance))
+                else:
+                    attribution.schedule(req.tenant_id, rag, governance)
+                    done.append((index, req, rag, bias, governance))
+            explains = await call_explain_batch(
+                [explain_payload(req, rag, bias, gov) for _, req, rag, bias, gov in done]
+            ) if done else []
+    except Exception as exc:
+        handled = {row["index"] for row in rows}
+        return rows + [_error_row(index, exc) for index, _, _ in live if index not in handled]
+
+    for (index, _, rag, bias, governance), explainability in zip(done, explains):
+        result = GenerateResponse(**assemble(rag, bias, governance, explainability))
+        rows.append({"index": index, "result": result.model_dump()})
+    return rows
+
+
+async def run_batch(items: List[GenerateRequest], concurrency: int) -> AsyncIterator[BatchRow]:
+    """Yield one row per item, chunk by chunk as they finish (not in input order)."""
+    rag_slots = asyncio.Semaphore(max(1, concurrency))
+    size = max(1, settings.batch_chunk_size)
+    indexed = list(enumerate(items))
+    tasks = [
+        asyncio.create_task(_run_chunk(indexed[start : start + size], rag_slots))
+        for start in range(0, len(indexed), size)
+    ]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for row in await finished:
+                yield row
+    finally:
+        for task in tasks:
+            task.cancel()
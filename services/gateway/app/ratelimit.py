@@ -0,0 +1,208 @@
+import asyncio
+import math
+import sqlite3
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Tuple
+
+from fastapi import HTTPException
+
+from .config import settings
+from .resilience import DeadlineExceeded, remaining
+
+
+@dataclass
+class Quota:
+    rate: float
+    burst: float
+    weight: float
+    queue_limit: int
+
+
+def quota_for(tenant_id: str) -> Quota:
+    override = settings.tenant_quotas.get(tenant_id, {})
+    return Quota(
+        rate=float(override.get("rate", settings.rate_limit_rps)),
+        burst=float(override.get("burst", settings.rate_limit_burst)),
+        weight=max(0.01, float(override.get("weight", 1.0))),
+        queue_limit=int(override.get("queue_limit", settings.tenant_queue_limit)),
+    )
+
+
+def _refill(tokens: float, updated: float, now: float, quota: Quota) -> float:
+    return min(quota.burst, tokens + max(0.0, now - updated) * quota.rate)
+
+
+class MemoryBucketStore:
+    def __init__(self) -> None:
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def take(self, tenant_id: str, cost: float, quota: Quota) -> float:
+        now = time.monotonic()
+        tokens, updated = self.buckets.get(tenant_id, (quota.burst, now))
+        tokens = _refill(tokens, updated, now, quota)
+        if tokens >= cost:
+            self.buckets[tenant_id] = (tokens - cost, now)
+            return 0.0
+        self.buckets[tenant_id] = (tokens, now)
+        return (cost - tokens) / quota.rate
+
+
+class SqliteBucketStore:
+    """Token buckets in a SQLite file so replicas on one node share a budget."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (tenant_id TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+
+    def _take(self, tenant_id: str, cost: float, quota: Quota) -> float:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE tenant_id = ?", (tenant_id,)).fetchone()
+            tokens = _refill(row[0], row[1], now, quota) if row else quota.burst
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / quota.rate
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (tenant_id, tokens, updated) VALUES (?, ?, ?)",
+                (tenant_id, tokens, now),
+            )
+            conn.execute("COMMIT")
+            return wait
+        finally:
+            conn.close()
+
+    async def take(self, tenant_id: str, cost: float, quota: Quota) -> float:
+        return await asyncio.to_thread(self._take, tenant_id, cost, quota)
+
+
+_store: MemoryBucketStore | SqliteBucketStore | None = None
+
+
+def _bucket_store() -> MemoryBucketStore | SqliteBucketStore:
+    global _store
+    if _store is None:
+        _store = SqliteBucketStore(settings.rate_limit_store) if settings.rate_limit_store else MemoryBucketStore()
+    return _store
+
+
+async def enforce(tenant_id: str, cost: float = 1.0) -> None:
+    quota = quota_for(tenant_id)
+    if quota.rate <= 0:
+        return
+    wait = await _bucket_store().take(tenant_id, cost, quota)
+    if wait > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Tenant rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+
+async def admit(tenant_id: str, cost: float = 1.0) -> None:
+    """Wait until the tenant's bucket can pay for cost, then take it.
+
+    Batch items are admitted one by one through the same bucket as /generate,
+    so a batch runs at the tenant's rate instead of costing one request.
+    """
+    quota = quota_for(tenant_id)
+    if quota.rate <= 0:
+        return
+    cost = min(cost, quota.burst)
+    while True:
+        wait = await _bucket_store().take(tenant_id, cost, quota)
+        if wait <= 0:
+            return
+        await asyncio.sleep(wait)
+
+
+class FairQueue:
+    """Weighted fair admission to a fixed number of downstream slots.
+
+    Each tenant carries a virtual time that advances by 1/weight per grant;
+    a freed slot goes to the waiting tenant with the smallest virtual time, so
+    a tenant flooding the queue only delays itself.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.in_use = 0
+        self.waiters: Dict[str, Deque[asyncio.Future]] = {}
+        self.vtime: Dict[str, float] = {}
+        self.global_vtime = 0.0
+
+    def _grant(self, tenant_id: str) -> None:
+        start = max(self.vtime.get(tenant_id, 0.0), self.global_vtime)
+        self.global_vtime = start
+        self.vtime[tenant_id] = start + 1.0 / quota_for(tenant_id).weight
+        self.in_use += 1
+
+    def _release(self) -> None:
+        self.in_use -= 1
+        while self.in_use < self.capacity:
+            ready = [tenant for tenant, queue in self.waiters.items() if queue]
+            if not ready:
+                return
+            tenant = min(ready, key=lambda name: max(self.vtime.get(name, 0.0), self.global_vtime))
+            future = self.waiters[tenant].popleft()
+            if not self.waiters[tenant]:
+                del self.waiters[tenant]
+            if future.done():
+                continue
+            self._grant(tenant)
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, tenant_id: str) -> AsyncIterator[None]:
+        if self.in_use < self.capacity and not any(self.waiters.values()):
+            self._grant(tenant_id)
+        else:
+            queue = self.waiters.setdefault(tenant_id, deque())
+            if len(queue) >= quota_for(tenant_id).queue_limit:
+                raise HTTPException(
+                    status_code=429, detail="Tenant queue is full", headers={"Retry-After": "1"}
+                )
+            future = asyncio.get_running_loop().create_future()
+            queue.append(future)
+            try:
+                await asyncio.wait_for(future, timeout=max(0.0, remaining(settings.call_timeout_s)))
+            except BaseException as exc:
+                if future.done() and not future.cancelled():
+                    # Granted just as we gave up: hand the slot back.
+                    self._release()
+                elif future in queue:
+                    queue.remove(future)
+                if isinstance(exc, asyncio.TimeoutError):
+                    raise DeadlineExceeded("gateway", "timed out waiting for a downstream slot") from exc
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+
+_queue: FairQueue | None = None
+
+
+@asynccontextmanager
+async def downstream_slot(tenant_id: str) -> AsyncIterator[None]:
+    global _queue
+    if settings.max_inflight <= 0:
+        yield
+        return
+    if _queue is None:
+        _queue = FairQueue(settings.max_inflight)
+    async with _queue.slot(tenant_id):
+        yield
@@ -0,0 +1,126 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator
+
+
+class UpstreamError(Exception):
+    def __init__(self, service: str, detail: str) -> None:
+        super().__init__(f"{service}: {detail}")
+        self.service = service
+        self.detail = detail
+
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+
+class DeadlineExceeded(UpstreamError):
+    pass
+
+
+_deadline: ContextVar[float | None] = ContextVar("govai_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[float]:
+    """Bound every downstream call made inside the block by one end-to-end deadline."""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining(default: float) -> float:
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    return deadline - time.monotonic()
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe."""
+
+    def __init__(self, service: str, failure_threshold: int, reset_after: float) -> None:
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """Admit a call or raise CircuitOpenError; True when the call is the half-open probe."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self.probing):
+            raise CircuitOpenError(self.service, "circuit open")
+        if state == "half_open":
+            self.probing = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """The probe ended without an outcome (e.g. it was cancelled); let the next call probe."""
+        self.probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """Allows retries up to `ratio` of recent first attempts, so retries cannot multiply load."""
+
+    def __init__(self, ratio: float, min_tokens: float = 3.0, max_tokens: float = 20.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = min_tokens
+
+    def record_request(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_budgets: Dict[str, RetryBudget] = {}
+
+
+def breaker_for(service: str, failure_threshold: int, reset_after: float) -> CircuitBreaker:
+    if service not in _breakers:
+        _breakers[service] = CircuitBreaker(service, failure_threshold, reset_after)
+    return _breakers[service]
+
+
+def budget_for(service: str, ratio: float) -> RetryBudget:
+    if service not in _budgets:
+        _budgets[service] = RetryBudget(ratio)
+    return _budgets[service]
+
+
+def breaker_states() -> Dict[str, str]:
+    return {service: breaker.state for service, breaker in _breakers.items()}
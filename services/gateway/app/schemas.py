@@ -1,16 +1,21 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
 class BaseSchema(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
 
+ExplainVerbosity = Literal["summary", "standard", "full"]
+ExplainSection = Literal["model", "sources", "decisioning", "evidence", "risk", "trace"]
+
 class GenerateRequest(BaseSchema):
     tenant_id: str
     user_id: str
     prompt: str
     top_k: int = 4
     policy_mode: Optional[str] = Field(default="enforce", description="enforce|advisory")
+    explain_verbosity: Optional[ExplainVerbosity] = None
+    explain_fields: Optional[List[ExplainSection]] = None
 
 class Source(BaseSchema):
     id: str
@@ -40,6 +45,25 @@ class GovernanceDecision(BaseSchema):
 class ExplainabilityResponse(BaseSchema):
     explanation: Dict[str, Any]
 
+class ExplanationTrace(BaseSchema):
+    decision_id: str
+    status: str
+    reasons: List[Any]
+    policy_hits: List[Any]
+    prompt: Optional[str]
+    answer: Optional[str]
+    model_id: Optional[str]
+    confidence: Optional[float]
+    bias_score: Optional[float]
+    created_at: Optional[str]
+
+class AttributionRecord(BaseSchema):
+    decision_id: str
+    status: str
+    method: Optional[str] = None
+    result: Dict[str, Any] = {}
+    created_at: Optional[str] = None
+
 class GenerateResponse(BaseSchema):
     answer: str
     sources: List[Source]
@@ -49,3 +73,15 @@ class GenerateResponse(BaseSchema):
     governance: GovernanceDecision
     explainability: ExplainabilityResponse
     evidence: Dict[str, Any]
+
+class BatchGenerateRequest(BaseSchema):
+    items: List[GenerateRequest]
+    concurrency: Optional[int] = Field(default=None, ge=1, description="max in-flight RAG calls")
+
+class JobStatus(BaseSchema):
+    job_id: str
+    status: str
+    total: int
+    completed: int
+    failed: int
+    results: List[Dict[str, Any]] = []
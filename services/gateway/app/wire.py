@@ -0,0 +1,114 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+import httpx
+
+from .config import settings
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+MSGPACK = "application/msgpack"
+REFS_HEADER = "X-GovAI-Refs"
+REF_KEY = "$ref"
+# Services whose payloads carry the retrieved `sources`, which repeat across
+# requests because the corpus is small; everything else is sent inline.
+REF_SERVICES = {"governance", "explainability"}
+# Per-query source fields, sent next to the reference instead of hashed into it.
+VOLATILE_SOURCE_FIELDS = ("score",)
+
+_known: Dict[str, "OrderedDict[str, None]"] = {}
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _ref(value: Any) -> str:
+    return hashlib.blake2b(_dumps(value), digest_size=16).hexdigest()
+
+
+def _known_refs(service: str) -> "OrderedDict[str, None]":
+    return _known.setdefault(service, OrderedDict())
+
+
+def _mark(service: str, ref: str) -> None:
+    known = _known_refs(service)
+    known[ref] = None
+    known.move_to_end(ref)
+    while len(known) > settings.wire_ref_cache_size:
+        known.popitem(last=False)
+
+
+def forget(service: str, refs: Iterable[str]) -> None:
+    known = _known_refs(service)
+    for ref in refs:
+        known.pop(ref, None)
+
+
+def _ref_sources(service: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    sources = payload.get("sources")
+    if not sources:
+        return payload
+    known = _known_refs(service)
+    encoded: List[Dict[str, Any]] = []
+    for source in sources:
+        stable = {key: item for key, item in source.items() if key not in VOLATILE_SOURCE_FIELDS}
+        ref = _ref(stable)
+        marker = {key: source[key] for key in VOLATILE_SOURCE_FIELDS if key in source}
+        marker[REF_KEY] = ref
+        if ref in known:
+            known.move_to_end(ref)
+        else:
+            # The first send carries the value so the service can cache it;
+            # if it was evicted there, the service answers 409 and we resend.
+            _mark(service, ref)
+            marker["value"] = stable
+        encoded.append(marker)
+    return {**payload, "sources": encoded}
+
+
+def encode_request(service: str, payload: Dict[str, Any], refs: bool = True) -> Tuple[bytes, Dict[str, str]]:
+    headers: Dict[str, str] = {}
+    if refs and settings.wire_refs and service in REF_SERVICES:
+        if "items" in payload:
+            payload = {**payload, "items": [_ref_sources(service, item) for item in payload["items"]]}
+        else:
+            payload = _ref_sources(service, payload)
+        headers[REFS_HEADER] = "1"
+    if settings.wire_format == "msgpack" and msgpack is not None:
+        headers["Content-Type"] = MSGPACK
+        headers["Accept"] = MSGPACK
+        return msgpack.packb(payload), headers
+    headers["Content-Type"] = "application/json"
+    if orjson is not None:
+        return orjson.dumps(payload), headers
+    return json.dumps(payload).encode(), headers
+
+
+def missing_refs(resp: httpx.Response) -> List[str]:
+    if resp.status_code != 409:
+        return []
+    detail = resp.json().get("detail")
+    if isinstance(detail, dict):
+        return list(detail.get("missing_refs", []))
+    return []
+
+
+def decode_response(resp: httpx.Response) -> Any:
+    if resp.headers.get("content-type", "").startswith(MSGPACK):
+        return msgpack.unpackb(resp.content)
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_DIR.parent / "common"))
+sys.path.insert(0, str(SERVICE_DIR))
+
+
+@pytest.fixture
+def quotas(monkeypatch):
+    """Per-test tenant quota overrides (GATEWAY_TENANT_QUOTAS)."""
+    from app.config import settings
+
+    overrides = {}
+    monkeypatch.setattr(settings, "tenant_quotas", overrides)
+    return overrides
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from app.coalesce import SingleFlight, normalise_prompt
+from app.resilience import DeadlineExceeded, deadline_scope
+
+
+def test_concurrent_callers_share_one_execution_with_private_copies():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"answer": "shared", "sources": [{"id": "doc-1"}]}
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+        return flight, results
+
+    flight, results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "followers": 2}
+    results[0]["sources"].append({"id": "doc-2"})
+    results[1]["answer"] = "changed"
+    assert results[2] == {"answer": "shared", "sources": [{"id": "doc-1"}]}
+
+
+def test_a_lone_caller_gets_the_result_itself():
+    result = {"answer": "only"}
+
+    async def work():
+        return result
+
+    assert asyncio.run(SingleFlight().do("key", work)) is result
+
+
+def test_a_caller_stops_at_its_own_deadline_without_failing_the_others():
+    async def work():
+        await asyncio.sleep(0.2)
+        return "done"
+
+    async def impatient(flight):
+        with deadline_scope(0.05):
+            return await flight.do("key", work)
+
+    async def scenario():
+        flight = SingleFlight()
+        leader = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        return await asyncio.gather(leader, impatient(flight), return_exceptions=True)
+
+    leader, follower = asyncio.run(scenario())
+    assert leader == "done"
+    assert isinstance(follower, DeadlineExceeded)
+
+
+def test_the_shared_task_is_cancelled_once_every_caller_gave_up():
+    cancelled = asyncio.Event()
+
+    async def work():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def scenario():
+        flight = SingleFlight()
+        with deadline_scope(0.02):
+            with pytest.raises(DeadlineExceeded):
+                await flight.do("key", work)
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        return flight
+
+    flight = asyncio.run(scenario())
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_prompts_are_normalised_for_the_coalescing_key():
+    assert normalise_prompt("  What IS\tthe  policy?\n") == normalise_prompt("what is the policy?")
@@ -0,0 +1,174 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app import ratelimit
+from app.ratelimit import FairQueue, MemoryBucketStore, Quota, SqliteBucketStore
+
+QUOTA = Quota(rate=10.0, burst=3.0, weight=1.0, queue_limit=10)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBucketStore()
+    return SqliteBucketStore(str(tmp_path / "buckets.db"))
+
+
+def test_bucket_allows_burst_then_asks_to_wait(store):
+    async def scenario():
+        waits = [await store.take("t1", 1.0, QUOTA) for _ in range(4)]
+        other = await store.take("t2", 1.0, QUOTA)
+        return waits, other
+
+    waits, other = asyncio.run(scenario())
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert other == 0.0
+
+
+def test_bucket_charges_cost_and_refills(store):
+    async def scenario():
+        first = await store.take("t1", 2.0, QUOTA)
+        short = await store.take("t1", 2.0, QUOTA)
+        await asyncio.sleep(short + 0.01)
+        return first, short, await store.take("t1", 2.0, QUOTA)
+
+    first, short, refilled = asyncio.run(scenario())
+    assert first == 0.0
+    # One token left, so a cost of two waits for one more token at 10/s.
+    assert short == pytest.approx(0.1, abs=0.02)
+    assert refilled == 0.0
+
+
+def test_sqlite_buckets_are_shared_between_stores(tmp_path):
+    path = str(tmp_path / "shared.db")
+    first, second = SqliteBucketStore(path), SqliteBucketStore(path)
+
+    async def scenario():
+        return [await store.take("t1", 1.0, QUOTA) for store in (first, second, first, second)]
+
+    waits = asyncio.run(scenario())
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] > 0
+
+
+def test_enforce_rejects_with_retry_after(monkeypatch, quotas):
+    monkeypatch.setattr(ratelimit, "_store", MemoryBucketStore())
+    quotas["t1"] = {"rate": 0.5, "burst": 2}
+
+    async def scenario():
+        await ratelimit.enforce("t1", cost=2.0)
+        await ratelimit.enforce("t1")
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(scenario())
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers["Retry-After"] == "2"
+
+
+def test_admit_paces_items_at_the_tenant_rate(monkeypatch, quotas):
+    monkeypatch.setattr(ratelimit, "_store", MemoryBucketStore())
+    quotas["t1"] = {"rate": 20, "burst": 2}
+
+    async def scenario():
+        started = time.monotonic()
+        for _ in range(6):
+            await ratelimit.admit("t1")
+        return time.monotonic() - started
+
+    # Two from the burst, then four at 20/s.
+    assert asyncio.run(scenario()) == pytest.approx(0.2, abs=0.08)
+
+
+def _record(queue: FairQueue, tenant_id: str, order: list, hold: asyncio.Event | None = None):
+    async def run():
+        async with queue.slot(tenant_id):
+            order.append(tenant_id)
+            if hold is not None:
+                await hold.wait()
+
+    return asyncio.ensure_future(run())
+
+
+def test_fair_queue_interleaves_a_quiet_tenant_with_a_flood(quotas):
+    async def scenario():
+        queue = FairQueue(capacity=1)
+        order: list = []
+        release = asyncio.Event()
+        tasks = [_record(queue, "holder", order, release)]
+        await asyncio.sleep(0)
+        tasks += [_record(queue, "noisy", order) for _ in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(_record(queue, "quiet", order))
+        await asyncio.sleep(0)
+        assert queue.in_use == 1 and len(queue.waiters["noisy"]) == 4
+        release.set()
+        await asyncio.gather(*tasks)
+        return order
+
+    # The quiet tenant arrives last but waits behind one noisy grant, not four.
+    assert asyncio.run(scenario()) == ["holder", "noisy", "quiet", "noisy", "noisy", "noisy"]
+
+
+def test_fair_queue_serves_tenants_by_weight(quotas):
+    quotas["heavy"] = {"weight": 3}
+
+    async def scenario():
+        queue = FairQueue(capacity=1)
+        order: list = []
+        release = asyncio.Event()
+        tasks = [_record(queue, "holder", order, release)]
+        await asyncio.sleep(0)
+        tasks += [_record(queue, tenant, order) for tenant in ["light"] * 4 + ["heavy"] * 8]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+        return order[1:9]
+
+    first = asyncio.run(scenario())
+    assert first.count("heavy") == 6 and first.count("light") == 2
+
+
+def test_fair_queue_rejects_past_the_tenant_queue_limit(quotas):
+    quotas["t1"] = {"queue_limit": 1}
+
+    async def scenario():
+        queue = FairQueue(capacity=1)
+        hold = asyncio.Event()
+        running = _record(queue, "t1", [], hold)
+        await asyncio.sleep(0)
+        waiting = _record(queue, "t1", [], hold)
+        await asyncio.sleep(0)
+        try:
+            async with queue.slot("t1"):
+                pass
+        finally:
+            hold.set()
+            await asyncio.gather(running, waiting)
+        return queue
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(scenario())
+    assert excinfo.value.status_code == 429
+
+
+def test_fair_queue_returns_the_slot_of_a_cancelled_waiter(quotas):
+    async def scenario():
+        queue = FairQueue(capacity=1)
+        hold = asyncio.Event()
+        running = _record(queue, "t1", [], hold)
+        await asyncio.sleep(0)
+        waiting = _record(queue, "t2", [], asyncio.Event())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        hold.set()
+        await running
+        return queue
+
+    queue = asyncio.run(scenario())
+    assert queue.in_use == 0
+    assert not any(queue.waiters.values())
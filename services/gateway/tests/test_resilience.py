@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app import clients
+from app.resilience import CircuitBreaker, CircuitOpenError
+
+
+async def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/slow":
+        await asyncio.sleep(5)
+    return httpx.Response(200, json={"ok": True})
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    monkeypatch.setattr(clients, "_client", httpx.AsyncClient(transport=httpx.MockTransport(_handler)))
+    breaker = CircuitBreaker("bias", failure_threshold=1, reset_after=0.05)
+    breaker.record_failure()
+    breaker.opened_at = time.monotonic() - 1
+    assert breaker.state == "half_open"
+    return breaker
+
+
+def test_a_cancelled_probe_frees_the_half_open_slot(breaker):
+    async def scenario():
+        probe = asyncio.ensure_future(clients._attempt("bias", "http://bias/slow", None, breaker))
+        await asyncio.sleep(0.05)
+        assert breaker.probing
+        # Only one probe at a time while half-open.
+        with pytest.raises(CircuitOpenError):
+            await clients._attempt("bias", "http://bias/fast", None, breaker)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        assert breaker.state == "half_open" and not breaker.probing
+        return await clients._attempt("bias", "http://bias/fast", None, breaker)
+
+    assert asyncio.run(scenario()) == {"ok": True}
+    assert breaker.state == "closed"
+
+
+def test_a_cancelled_call_is_not_counted_as_a_failure_or_success(breaker):
+    breaker.record_success()
+    breaker.failure_threshold = 2
+    breaker.record_failure()
+
+    async def scenario():
+        call = asyncio.ensure_future(clients._attempt("bias", "http://bias/slow", None, breaker))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert breaker.failures == 1 and breaker.state == "closed"
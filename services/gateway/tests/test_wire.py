@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from govai_common import wire as service_wire
+
+from app import clients, wire
+from app.config import settings
+from app.resilience import CircuitBreaker
+
+SOURCES = [
+    {"id": "doc-1", "title": "Retention", "snippet": "seven years", "score": 0.91},
+    {"id": "doc-2", "title": "Encryption", "snippet": "at rest", "score": 0.42},
+]
+
+
+def _service(seen: List[Dict[str, Any]]) -> FastAPI:
+    app = FastAPI(default_response_class=service_wire.WireResponse)
+    app.router.route_class = service_wire.WireRoute
+
+    @app.middleware("http")
+    async def record(request: Request, call_next):
+        seen.append({"refs": request.headers.get(service_wire.REFS_HEADER), "body": await request.body()})
+        return await call_next(request)
+
+    @app.post("/evaluate")
+    def evaluate(payload: Dict[str, Any]):
+        return {"sources": payload["sources"]}
+
+    return app
+
+
+@pytest.fixture(params=["json", "msgpack"])
+def service(request, monkeypatch):
+    monkeypatch.setattr(settings, "wire_refs", True)
+    monkeypatch.setattr(settings, "wire_format", request.param)
+    monkeypatch.setattr(wire, "_known", {})
+    service_wire._refs.clear()
+    seen: List[Dict[str, Any]] = []
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=_service(seen)), base_url="http://governance")
+    monkeypatch.setattr(clients, "_client", client)
+    return seen
+
+
+def _call(sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+    breaker = CircuitBreaker("governance", 5, 30.0)
+    return asyncio.run(clients._attempt("governance", "http://governance/evaluate", {"sources": sources}, breaker))
+
+
+def test_repeated_sources_are_sent_by_reference(service):
+    assert _call(SOURCES)["sources"] == SOURCES
+    rescored = [{**source, "score": 0.1} for source in SOURCES]
+    assert _call(rescored)["sources"] == rescored
+
+    first, second = service
+    assert first["refs"] == second["refs"] == "1"
+    assert b"seven years" in first["body"]
+    # Only the reference and the per-query score go out the second time.
+    assert b"seven years" not in second["body"]
+
+
+def test_missing_refs_are_resent_inline(service):
+    _call(SOURCES)
+    # A service replica that never saw (or evicted) the values.
+    service_wire._refs.clear()
+
+    assert _call(SOURCES)["sources"] == SOURCES
+    rejected, resent = service[1:]
+    assert rejected["refs"] == "1" and b"seven years" not in rejected["body"]
+    assert resent["refs"] is None and b"seven years" in resent["body"]
+
+    # The gateway forgot the refs, so the next request repopulates the cache.
+    service_wire._refs.clear()
+    assert _call(SOURCES)["sources"] == SOURCES
+    assert service[-1]["refs"] == "1" and b"seven years" in service[-1]["body"]
+    assert len(service) == 4
+
+
+def test_unresolved_refs_are_reported():
+    missing: List[str] = []
+    resolved = service_wire.resolve_refs({"sources": [{"$ref": "unknown-ref", "score": 0.5}]}, missing)
+    assert resolved == {"sources": [None]}
+    assert missing == ["unknown-ref"]
@@ -0,0 +1,184 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .db import engine
+from .models import AuditLog, Decision, DecisionStat
+
+HISTOGRAM_BINS = 10
+MAX_RANGE_DAYS = 731
+
+
+def bucket(value: float) -> str:
+    if value != value:  # NaN
+        value = 0.0
+    index = min(max(int(value * HISTOGRAM_BINS), 0), HISTOGRAM_BINS - 1)
+    return f"{index / HISTOGRAM_BINS:.1f}"
+
+
+def decision_counts(
+    status: str, policy_hits: List[Dict[str, Any]], confidence: float, bias_score: float
+) -> Counter:
+    counts = Counter({("status", status): 1, ("confidence", bucket(confidence)): 1, ("bias", bucket(bias_score)): 1})
+    for hit in policy_hits:
+        counts[("rule", hit.get("rule") or "unknown")] += 1
+        counts[("policy", hit.get("policy_id") or "unknown")] += 1
+    return counts
+
+
+def stat_rows(tenant_id: str, day: date, counts: Counter) -> List[Dict[str, Any]]:
+    # Sorted so concurrent writers lock counter rows in the same order, and
+    # de-duplicated because one ON CONFLICT statement cannot touch a row twice.
+    return [
+        {"tenant_id": tenant_id, "day": day, "metric": metric, "label": label, "total": total}
+        for (metric, label), total in sorted(counts.items())
+        if total
+    ]
+
+
+def decision_stats(
+    tenant_id: str,
+    created_at: datetime,
+    status: str,
+    policy_hits: List[Dict[str, Any]],
+    confidence: float,
+    bias_score: float,
+) -> List[Dict[str, Any]]:
+    return stat_rows(tenant_id, created_at.date(), decision_counts(status, policy_hits, confidence, bias_score))
+
+
+def _upsert_statement(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = DecisionStat.__table__
+    statement = insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.tenant_id, table.c.day, table.c.metric, table.c.label],
+        set_={"total": table.c.total + statement.excluded.total},
+    )
+
+
+# Adds each row's total to the stored counter; works on sessions and connections alike.
+UPSERT_STATS = _upsert_statement(engine.dialect.name)
+
+
+def record_status_change(db: Session, tenant_id: str, created_at: datetime, old: str, new: str) -> None:
+    """Move one decision's status count from `old` to `new`; the caller commits.
+
+    The decrement is a plain UPDATE of a positive counter, not an upsert:
+    decisions written before decision_stats existed (or outside a rebuilt
+    range) have no row for `old`, and an upsert would insert -1 there.
+    """
+    if old == new:
+        return
+    day = created_at.date()
+    # Label order, like stat_rows, so concurrent changes lock counters in the same order.
+    for label in sorted((old, new)):
+        if label == new:
+            db.execute(UPSERT_STATS, stat_rows(tenant_id, day, Counter({("status", new): 1})))
+            continue
+        db.execute(
+            update(DecisionStat)
+            .where(
+                DecisionStat.tenant_id == tenant_id,
+                DecisionStat.day == day,
+                DecisionStat.metric == "status",
+                DecisionStat.label == old,
+                DecisionStat.total > 0,
+            )
+            .values(total=DecisionStat.total - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def summarize(tenant_id: str, start: date, end: date, rows: Iterable[Tuple[date, str, str, int]], daily: bool):
+    days: Dict[date, Dict[str, Dict[str, int]]] = defaultdict(lambda: defaultdict(dict))
+    totals: Dict[str, Counter] = defaultdict(Counter)
+    for day, metric, label, total in rows:
+        if total:
+            days[day][metric][label] = total
+            totals[metric][label] += total
+
+    def section(metrics: Dict[str, Any]) -> Dict[str, Any]:
+        status = dict(metrics.get("status", {}))
+        decisions = sum(status.values())
+        return {
+            "decisions": decisions,
+            "status": status,
+            "status_rates": {key: round(value / decisions, 4) for key, value in status.items()} if decisions else {},
+            "rules": dict(metrics.get("rule", {})),
+            "policies": dict(metrics.get("policy", {})),
+            "confidence": dict(sorted(metrics.get("confidence", {}).items())),
+            "bias": dict(sorted(metrics.get("bias", {}).items())),
+        }
+
+    report: Dict[str, Any] = {
+        "tenant_id": tenant_id,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "totals": section(totals),
+    }
+    if daily:
+        report["days"] = [{"day": day.isoformat(), **section(days[day])} for day in sorted(days)]
+    return report
+
+
+def decision_analytics(db: Session, tenant_id: str, start: date, end: date, daily: bool = True) -> Dict[str, Any]:
+    rows = (
+        db.query(DecisionStat.day, DecisionStat.metric, DecisionStat.label, DecisionStat.total)
+        .filter(DecisionStat.tenant_id == tenant_id, DecisionStat.day >= start, DecisionStat.day <= end)
+        .all()
+    )
+    return summarize(tenant_id, start, end, rows, daily)
+
+
+def rebuild_stats(bind: Engine, start: date, end: date, tenant_id: str | None = None) -> Dict[str, Any]:
+    """Recompute counters for [start, end] from decisions and their audit rows.
+
+    Meant for backfilling databases that predate decision_stats; decisions
+    written while it runs may be counted twice or not at all, so run it when
+    the range is quiet.
+    """
+    lower = datetime.combine(start, datetime.min.time())
+    upper = datetime.combine(end + timedelta(days=1), datetime.min.time())
+    counts: Dict[Tuple[str, date], Counter] = defaultdict(Counter)
+    decisions = 0
+    with Session(bind) as db:
+        query = (
+            db.query(
+                Decision.tenant_id,
+                Decision.created_at,
+                Decision.status,
+                Decision.policy_hits,
+                AuditLog.confidence,
+                AuditLog.bias_score,
+            )
+            .join(AuditLog, AuditLog.id == Decision.audit_id)
+            .filter(
+                Decision.created_at >= lower,
+                Decision.created_at < upper,
+                AuditLog.created_at >= lower - timedelta(days=1),
+                AuditLog.created_at < upper,
+            )
+        )
+        if tenant_id:
+            query = query.filter(Decision.tenant_id == tenant_id)
+        for row_tenant, created_at, status, hits, confidence, bias_score in query.yield_per(1000):
+            counts[(row_tenant, created_at.date())].update(decision_counts(status, hits or [], confidence, bias_score))
+            decisions += 1
+
+    rows = [row for (row_tenant, day), counter in sorted(counts.items()) for row in stat_rows(row_tenant, day, counter)]
+    with bind.begin() as conn:
+        cleared = delete(DecisionStat).where(DecisionStat.day >= start, DecisionStat.day <= end)
+        if tenant_id:
+            cleared = cleared.where(DecisionStat.tenant_id == tenant_id)
+        conn.execute(cleared)
+        if rows:
+            conn.execute(UPSERT_STATS, rows)
+    return {"decisions": decisions, "days": len({day for _, day in counts}), "rows": len(rows)}
@@ -0,0 +1,128 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from govai_common.wire import WireRoute
+
+from .config import settings
+from .db import AsyncSessionLocal
+from .models import PolicyRule, Decision, AuditLog
+from .schemas import EvaluateRequest, DecisionResponse
+from .policies import apply_policy_mode, default_policies, evaluate_policies, policy_to_dict
+from .analytics import decision_stats
+from .audit import create_audit_log_async, create_decision_async, decision_summary, drift_report
+from .fastpath import evaluate_core_async
+from .partitions import query_window_start
+from .review import announce_pending, review_fields
+
+router = APIRouter(route_class=WireRoute)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def evaluate(payload: EvaluateRequest, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(PolicyRule).where(PolicyRule.tenant_id == payload.tenant_id))
+    rules = result.scalars().all()
+    if rules:
+        policy_data = [policy_to_dict(rule) for rule in rules]
+    else:
+        policy_data = default_policies(payload.tenant_id)
+
+    status, reasons, hits = evaluate_policies(
+        policy_data,
+        payload.prompt,
+        payload.answer,
+        payload.confidence,
+        payload.bias_score,
+        len(payload.sources),
+        payload.consistency_score,
+        payload.evidence_flags,
+    )
+
+    status = apply_policy_mode(status, reasons, payload.policy_mode)
+
+    audit = await create_audit_log_async(
+        db=db,
+        tenant_id=payload.tenant_id,
+        user_id=payload.user_id,
+        prompt=payload.prompt,
+        answer=payload.answer,
+        confidence=payload.confidence,
+        bias_score=payload.bias_score,
+        model_id=payload.model_id,
+        decision_status=status,
+        sources_count=len(payload.sources),
+        consistency_score=payload.consistency_score,
+        evidence_flag_count=len(payload.evidence_flags),
+    )
+
+    review = review_fields(payload.bias_score, payload.confidence)
+    decision = await create_decision_async(
+        db=db,
+        audit_id=audit.id,
+        tenant_id=payload.tenant_id,
+        status=status,
+        reasons=reasons,
+        policy_hits=hits,
+        review=review,
+        stats=decision_stats(payload.tenant_id, review["created_at"], status, hits, payload.confidence, payload.bias_score),
+    )
+    announce_pending(payload.tenant_id, decision.id, status, reasons, review)
+
+    return {
+        "decision_id": decision.id,
+        "status": decision.status,
+        "reasons": decision.reasons,
+        "policy_hits": decision.policy_hits,
+    }
+
+
+router.add_api_route(
+    "/evaluate",
+    evaluate_core_async if settings.evaluate_path == "core" else evaluate,
+    methods=["POST"],
+    response_model=DecisionResponse,
+)
+
+
+@router.get("/decisions")
+async def list_decisions(
+    tenant_id: str,
+    status: str | None = None,
+    limit: int = 50,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    limit = max(1, min(limit, 200))
+    query = select(Decision).where(Decision.tenant_id == tenant_id)
+    if status:
+        query = query.where(Decision.status == status)
+    since = query_window_start(since)
+    if since:
+        query = query.where(Decision.created_at >= since)
+    if until:
+        query = query.where(Decision.created_at < until)
+    result = await db.execute(query.order_by(Decision.created_at.desc()).limit(limit))
+    return [decision_summary(d) for d in result.scalars().all()]
+
+
+@router.get("/bias/drift")
+async def bias_drift(
+    tenant_id: str,
+    window: int = 50,
+    threshold: float = 0.1,
+    since: datetime | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    window = max(10, min(window, 500))
+    query = select(AuditLog.bias_score).where(AuditLog.tenant_id == tenant_id)
+    since = query_window_start(since)
+    if since:
+        query = query.where(AuditLog.created_at >= since)
+    result = await db.execute(query.order_by(AuditLog.created_at.desc()).limit(window * 2))
+    return drift_report(tenant_id, window, threshold, list(result.scalars().all()))
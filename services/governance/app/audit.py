@@ -1,5 +1,7 @@
 from typing import Any, Dict, List
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from .analytics import UPSERT_STATS
 from .models import AuditLog, Decision
 
 
@@ -13,6 +15,9 @@ def create_audit_log(
     bias_score: float,
     model_id: str,
     decision_status: str,
+    sources_count: int | None = None,
+    consistency_score: float | None = None,
+    evidence_flag_count: int | None = None,
 ) -> AuditLog:
     audit = AuditLog(
         tenant_id=tenant_id,
@@ -23,6 +28,9 @@ def create_audit_log(
         bias_score=bias_score,
         model_id=model_id,
         decision_status=decision_status,
+        sources_count=sources_count,
+        consistency_score=consistency_score,
+        evidence_flag_count=evidence_flag_count,
     )
     db.add(audit)
     db.commit()
@@ -37,6 +45,8 @@ def create_decision(
     status: str,
     reasons: List[str],
     policy_hits: List[Dict[str, Any]],
+    review: Dict[str, Any] | None = None,
+    stats: List[Dict[str, Any]] | None = None,
 ) -> Decision:
     decision = Decision(
         audit_id=audit_id,
@@ -44,8 +54,107 @@ def create_decision(
         status=status,
         reasons=reasons,
         policy_hits=policy_hits,
+        **(review or {}),
     )
     db.add(decision)
+    if stats:
+        db.execute(UPSERT_STATS, stats)
     db.commit()
     db.refresh(decision)
     return decision
+
+
+async def create_audit_log_async(
+    db: AsyncSession,
+    tenant_id: str,
+    user_id: str,
+    prompt: str,
+    answer: str,
+    confidence: float,
+    bias_score: float,
+    model_id: str,
+    decision_status: str,
+    sources_count: int | None = None,
+    consistency_score: float | None = None,
+    evidence_flag_count: int | None = None,
+) -> AuditLog:
+    audit = AuditLog(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        prompt=prompt,
+        answer=answer,
+        confidence=confidence,
+        bias_score=bias_score,
+        model_id=model_id,
+        decision_status=decision_status,
+        sources_count=sources_count,
+        consistency_score=consistency_score,
+        evidence_flag_count=evidence_flag_count,
+    )
+    db.add(audit)
+    await db.commit()
+    await db.refresh(audit)
+    return audit
+
+
+async def create_decision_async(
+    db: AsyncSession,
+    audit_id: str,
+    tenant_id: str,
+    status: str,
+    reasons: List[str],
+    policy_hits: List[Dict[str, Any]],
+    review: Dict[str, Any] | None = None,
+    stats: List[Dict[str, Any]] | None = None,
+) -> Decision:
+    decision = Decision(
+        audit_id=audit_id,
+        tenant_id=tenant_id,
+        status=status,
+        reasons=reasons,
+        policy_hits=policy_hits,
+        **(review or {}),
+    )
+    db.add(decision)
+    if stats:
+        await db.execute(UPSERT_STATS, stats)
+    await db.commit()
+    await db.refresh(decision)
+    return decision
+
+
+def decision_summary(decision: Decision) -> Dict[str, Any]:
+    return {
+        "id": decision.id,
+        "status": decision.status,
+        "reasons": decision.reasons,
+        "policy_hits": decision.policy_hits,
+        "created_at": decision.created_at.isoformat(),
+        "updated_at": decision.updated_at.isoformat() if decision.updated_at else None,
+    }
+
+
+def drift_report(tenant_id: str, window: int, threshold: float, scores: List[float]) -> Dict[str, Any]:
+    if len(scores) < window * 2:
+        return {
+            "tenant_id": tenant_id,
+            "status": "insufficient_data",
+            "required": window * 2,
+            "available": len(scores),
+        }
+
+    recent = scores[:window]
+    prev = scores[window : window * 2]
+    recent_mean = sum(recent) / len(recent)
+    prev_mean = sum(prev) / len(prev)
+    drift_score = abs(recent_mean - prev_mean)
+
+    return {
+        "tenant_id": tenant_id,
+        "window": window,
+        "recent_mean": round(recent_mean, 4),
+        "previous_mean": round(prev_mean, 4),
+        "drift_score": round(drift_score, 4),
+        "status": "drift_detected" if drift_score >= threshold else "stable",
+        "threshold": threshold,
+    }
@@ -8,14 +8,50 @@ class Settings(BaseModel):
     db_name: str = os.getenv("POSTGRES_DB", "govai")
     db_host: str = os.getenv("POSTGRES_HOST", "localhost")
     db_port: str = os.getenv("POSTGRES_PORT", "5432")
+    db_url_override: str = os.getenv("DATABASE_URL", "")
+    async_db_url_override: str = os.getenv("ASYNC_DATABASE_URL", "")
+    db_async: bool = os.getenv("GOV_DB_ASYNC", "false").lower() == "true"
+    db_pool_size: int = int(os.getenv("GOV_DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("GOV_DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("GOV_DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("GOV_DB_POOL_RECYCLE", "1800"))
+    db_statement_timeout_ms: int = int(os.getenv("GOV_DB_STATEMENT_TIMEOUT_MS", "0"))
+    evaluate_path: str = os.getenv("GOV_EVALUATE_PATH", "orm").lower()
+    audit_partitioning: bool = os.getenv("GOV_AUDIT_PARTITIONING", "false").lower() == "true"
+    partition_months_ahead: int = int(os.getenv("GOV_PARTITION_MONTHS_AHEAD", "2"))
+    partition_maintenance_interval_s: int = int(os.getenv("GOV_PARTITION_MAINTENANCE_INTERVAL_S", "3600"))
+    partition_lock_timeout_ms: int = int(os.getenv("GOV_PARTITION_LOCK_TIMEOUT_MS", "2000"))
+    audit_retention_months: int = int(os.getenv("GOV_AUDIT_RETENTION_MONTHS", "0"))
+    audit_archive_dir: str = os.getenv("GOV_AUDIT_ARCHIVE_DIR", "/var/lib/govai/archive")
+    audit_archive_compression: str = os.getenv("GOV_AUDIT_ARCHIVE_COMPRESSION", "zstd").lower()
+    query_lookback_days: int = int(os.getenv("GOV_QUERY_LOOKBACK_DAYS", "0"))
+    review_bias_weight: float = float(os.getenv("GOV_REVIEW_BIAS_WEIGHT", "0.6"))
+    review_confidence_weight: float = float(os.getenv("GOV_REVIEW_CONFIDENCE_WEIGHT", "0.4"))
+    review_priority_window_s: int = int(os.getenv("GOV_REVIEW_PRIORITY_WINDOW_S", "3600"))
+    review_lease_s: int = int(os.getenv("GOV_REVIEW_LEASE_S", "300"))
+    review_poll_s: float = float(os.getenv("GOV_REVIEW_POLL_S", "0"))
+    review_heartbeat_s: float = float(os.getenv("GOV_REVIEW_HEARTBEAT_S", "15"))
+    replay_max_rows: int = int(os.getenv("GOV_REPLAY_MAX_ROWS", "5000000"))
+    replay_cache_ttl_s: float = float(os.getenv("GOV_REPLAY_CACHE_TTL_S", "300"))
     default_confidence: float = float(os.getenv("POLICY_DEFAULT_CONFIDENCE", "0.25"))
     require_citations: bool = os.getenv("POLICY_REQUIRE_CITATIONS", "true").lower() == "true"
 
     @property
     def database_url(self) -> str:
+        if self.db_url_override:
+            return self.db_url_override
         return (
             f"postgresql+psycopg2://{self.db_user}:{self.db_password}"
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        if self.async_db_url_override:
+            return self.async_db_url_override
+        url = self.database_url
+        if url.startswith("sqlite://"):
+            return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+
 settings = Settings()
@@ -0,0 +1,190 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.engine import Engine
+
+from .models import AuditLog, Decision
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+BATCH_SIZE = 1000
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+COLUMNS = (
+    Decision.id.label("decision_id"),
+    Decision.tenant_id,
+    Decision.status,
+    Decision.reasons,
+    Decision.policy_hits,
+    Decision.reviewer,
+    Decision.review_notes,
+    Decision.priority,
+    Decision.created_at,
+    Decision.updated_at,
+    Decision.audit_id,
+    AuditLog.user_id,
+    AuditLog.prompt,
+    AuditLog.answer,
+    AuditLog.confidence,
+    AuditLog.bias_score,
+    AuditLog.model_id,
+    AuditLog.decision_status.label("audit_status"),
+    AuditLog.created_at.label("audit_created_at"),
+)
+
+
+def encode_cursor(created_at: datetime, decision_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{decision_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Raises ValueError for anything encode_cursor did not produce."""
+    created_at, _, decision_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+    if not decision_id:
+        raise ValueError("malformed cursor")
+    return datetime.fromisoformat(created_at), decision_id
+
+
+def export_query(
+    tenant_id: str,
+    since: datetime | None,
+    until: datetime | None,
+    after: Tuple[datetime, str] | None,
+    limit: int | None,
+):
+    """Decisions joined to their audit rows in (created_at, id) order.
+
+    Resuming from `after` is a keyset seek on the tenant/created_at index, so
+    every page costs the same no matter how deep into the export it starts.
+    """
+    audit_join = AuditLog.id == Decision.audit_id
+    # The audit row is written just before its decision; bounding its
+    # created_at lets a partitioned audit_logs prune to the exported months.
+    if since is not None:
+        audit_join = and_(audit_join, AuditLog.created_at >= since - timedelta(days=1))
+    if until is not None:
+        audit_join = and_(audit_join, AuditLog.created_at < until)
+    query = select(*COLUMNS).outerjoin(AuditLog, audit_join).where(Decision.tenant_id == tenant_id)
+    if since is not None:
+        query = query.where(Decision.created_at >= since)
+    if until is not None:
+        query = query.where(Decision.created_at < until)
+    if after is not None:
+        query = query.where(tuple_(Decision.created_at, Decision.id) > tuple_(*after))
+    query = query.order_by(Decision.created_at, Decision.id)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def iter_records(bind: Engine, query) -> Iterator[List[Dict[str, Any]]]:
+    """Yield batches of export records from a server-side cursor."""
+    with bind.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=BATCH_SIZE).execute(query)
+        for rows in result.mappings().partitions():
+            batch = []
+            for row in rows:
+                record = dict(row)
+                record["cursor"] = encode_cursor(record["created_at"], record["decision_id"])
+                batch.append(record)
+            yield batch
+
+
+def _dumps(record: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, default=lambda value: value.isoformat()) + "\n").encode()
+
+
+def ndjson_stream(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(_dumps(record) for record in batch)
+
+
+class _ChunkSink:
+    """Write-only file object that hands finished bytes back to the caller."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    text = pa.string()
+    timestamp = pa.timestamp("us")
+    return pa.schema(
+        [
+            ("decision_id", text),
+            ("tenant_id", text),
+            ("status", text),
+            ("reasons", text),
+            ("policy_hits", text),
+            ("reviewer", text),
+            ("review_notes", text),
+            ("priority", pa.float64()),
+            ("created_at", timestamp),
+            ("updated_at", timestamp),
+            ("audit_id", text),
+            ("user_id", text),
+            ("prompt", text),
+            ("answer", text),
+            ("confidence", pa.float64()),
+            ("bias_score", pa.float64()),
+            ("model_id", text),
+            ("audit_status", text),
+            ("audit_created_at", timestamp),
+            ("cursor", text),
+        ]
+    )
+
+
+def parquet_stream(batches: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """One row group per cursor batch, flushed to the client as it is written."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            for record in batch:
+                record["reasons"] = json.dumps(record["reasons"])
+                record["policy_hits"] = json.dumps(record["policy_hits"])
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,117 @@
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import bindparam, insert, select
+
+from .analytics import UPSERT_STATS, decision_stats
+from .db import engine, async_engine
+from .models import PolicyRule, AuditLog, Decision
+from .schemas import EvaluateRequest
+from .policies import apply_policy_mode, default_policies, evaluate_policies
+from .review import announce_pending, review_fields
+
+# Statements are built once at import so SQLAlchemy's compiled cache (and
+# asyncpg's per-connection prepared statement cache) is hit on every request.
+SELECT_RULES = select(
+    PolicyRule.id,
+    PolicyRule.tenant_id,
+    PolicyRule.name,
+    PolicyRule.rule_type,
+    PolicyRule.params,
+    PolicyRule.enabled,
+).where(PolicyRule.tenant_id == bindparam("tenant_id"))
+INSERT_AUDIT = insert(AuditLog.__table__)
+INSERT_DECISION = insert(Decision.__table__)
+
+
+def _decide(payload: EvaluateRequest, rows: List[Any]) -> Dict[str, Any]:
+    policy_data = [row._asdict() for row in rows] or default_policies(payload.tenant_id)
+    status, reasons, hits = evaluate_policies(
+        policy_data,
+        payload.prompt,
+        payload.answer,
+        payload.confidence,
+        payload.bias_score,
+        len(payload.sources),
+        payload.consistency_score,
+        payload.evidence_flags,
+    )
+    status = apply_policy_mode(status, reasons, payload.policy_mode)
+    return {
+        "decision_id": str(uuid.uuid4()),
+        "status": status,
+        "reasons": reasons,
+        "policy_hits": hits,
+    }
+
+
+def _audit_row(payload: EvaluateRequest, audit_id: str, status: str) -> Dict[str, Any]:
+    return {
+        "id": audit_id,
+        "tenant_id": payload.tenant_id,
+        "user_id": payload.user_id,
+        "prompt": payload.prompt,
+        "answer": payload.answer,
+        "confidence": payload.confidence,
+        "bias_score": payload.bias_score,
+        "model_id": payload.model_id,
+        "decision_status": status,
+        "sources_count": len(payload.sources),
+        "consistency_score": payload.consistency_score,
+        "evidence_flag_count": len(payload.evidence_flags),
+    }
+
+
+def _decision_row(
+    payload: EvaluateRequest, audit_id: str, result: Dict[str, Any], review: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "id": result["decision_id"],
+        "audit_id": audit_id,
+        "tenant_id": payload.tenant_id,
+        "status": result["status"],
+        "reasons": result["reasons"],
+        "policy_hits": result["policy_hits"],
+        **review,
+    }
+
+
+def _stats(payload: EvaluateRequest, result: Dict[str, Any], review: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return decision_stats(
+        payload.tenant_id,
+        review["created_at"],
+        result["status"],
+        result["policy_hits"],
+        payload.confidence,
+        payload.bias_score,
+    )
+
+
+def _announce(payload: EvaluateRequest, result: Dict[str, Any], review: Dict[str, Any]) -> None:
+    announce_pending(payload.tenant_id, result["decision_id"], result["status"], result["reasons"], review)
+
+
+def evaluate_core(payload: EvaluateRequest):
+    with engine.begin() as conn:
+        rows = conn.execute(SELECT_RULES, {"tenant_id": payload.tenant_id}).all()
+        result = _decide(payload, rows)
+        audit_id = str(uuid.uuid4())
+        conn.execute(INSERT_AUDIT, _audit_row(payload, audit_id, result["status"]))
+        review = review_fields(payload.bias_score, payload.confidence)
+        conn.execute(INSERT_DECISION, _decision_row(payload, audit_id, result, review))
+        conn.execute(UPSERT_STATS, _stats(payload, result, review))
+    _announce(payload, result, review)
+    return result
+
+
+async def evaluate_core_async(payload: EvaluateRequest):
+    async with async_engine.begin() as conn:
+        rows = (await conn.execute(SELECT_RULES, {"tenant_id": payload.tenant_id})).all()
+        result = _decide(payload, rows)
+        audit_id = str(uuid.uuid4())
+        await conn.execute(INSERT_AUDIT, _audit_row(payload, audit_id, result["status"]))
+        review = review_fields(payload.bias_score, payload.confidence)
+        await conn.execute(INSERT_DECISION, _decision_row(payload, audit_id, result, review))
+        await conn.execute(UPSERT_STATS, _stats(payload, result, review))
+    _announce(payload, result, review)
+    return result
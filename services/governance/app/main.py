@@ -1,18 +1,63 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import time
 from typing import List
 
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy.orm import Session
-
-from .db import Base, engine, SessionLocal
-from .models import PolicyRule, Decision, AuditLog
-from .schemas import EvaluateRequest, PolicyCreate, PolicyResponse, DecisionResponse, DecisionUpdate
-from .policies import default_policies, evaluate_policies
-from .audit import create_audit_log, create_decision
-
-app = FastAPI(title="GovAI Governance", version="0.1.0")
+from govai_common.admin import require_admin
+from govai_common.profiling import SamplingMiddleware, router as profiling_router
+from govai_common.wire import WireResponse, WireRoute
+
+from .config import settings
+from .db import Base, add_missing_columns, engine, SessionLocal, async_engine
+from .models import Attribution, PolicyRule, Decision, AuditLog
+from .schemas import (
+    AttributionCreate,
+    AttributionResponse,
+    EvaluateRequest,
+    PolicyCreate,
+    PolicyResponse,
+    DecisionResponse,
+    DecisionUpdate,
+    ReplayRequest,
+    ReviewClaim,
+    ReviewLease,
+)
+from .policies import apply_policy_mode, default_policies, evaluate_policies, policy_to_dict
+from .analytics import (
+    MAX_RANGE_DAYS,
+    decision_analytics,
+    decision_stats,
+    rebuild_stats,
+    record_status_change,
+)
+from .audit import create_audit_log, create_decision, decision_summary, drift_report
+from .export import FORMATS, decode_cursor, export_query, iter_records, ndjson_stream, parquet_stream
+from .fastpath import evaluate_core
+from .partitions import query_window_start, run_maintenance, start_maintenance_thread, stop_maintenance_thread
+from .replay import load_history, needs_text, replay
+from .review import (
+    announce,
+    backfill_review_rank,
+    announce_pending,
+    change_lease,
+    claim,
+    event_stream,
+    pending_queue,
+    pending_since,
+    queue_item,
+    resolve,
+    review_fields,
+)
+
+app = FastAPI(title="GovAI Governance", version="0.1.0", default_response_class=WireResponse)
+app.router.route_class = WireRoute
+app.add_middleware(SamplingMiddleware)
+app.include_router(profiling_router)
+db_routes = APIRouter(route_class=WireRoute)
+# Maintenance endpoints that rewrite or drop data; they need GOVAI_ADMIN_TOKEN.
+admin_routes = APIRouter(prefix="/admin", route_class=WireRoute, dependencies=[Depends(require_admin)])
 
 
 def get_db():
@@ -30,11 +75,23 @@ def init_db():
     for _ in range(15):
         try:
             Base.metadata.create_all(bind=engine)
-            return
+            add_missing_columns(engine)
+            backfill_review_rank(engine)
+            break
         except Exception as exc:
             last_error = exc
             time.sleep(2)
-    raise last_error
+    else:
+        raise last_error
+    run_maintenance(engine)
+    start_maintenance_thread(engine)
+
+
+@app.on_event("shutdown")
+async def close_db():
+    stop_maintenance_thread()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 @app.get("/health")
@@ -42,6 +99,16 @@ def health():
     return {"status": "ok"}
 
 
+@admin_routes.post("/partitions/maintain")
+def maintain_partitions():
+    return run_maintenance(engine)
+
+
+@admin_routes.post("/analytics/rebuild")
+def rebuild_analytics(start: date, end: date | None = None, tenant_id: str | None = None):
+    return rebuild_stats(engine, start, end or datetime.utcnow().date(), tenant_id)
+
+
 @app.post("/policies", response_model=PolicyResponse)
 def create_policy(payload: PolicyCreate, db: Session = Depends(get_db)):
     rule = PolicyRule(
@@ -54,47 +121,36 @@ def create_policy(payload: PolicyCreate, db: Session = Depends(get_db)):
     db.add(rule)
     db.commit()
     db.refresh(rule)
-    return {
-        "id": rule.id,
-        "tenant_id": rule.tenant_id,
-        "name": rule.name,
-        "rule_type": rule.rule_type,
-        "params": rule.params,
-        "enabled": rule.enabled,
-    }
+    return policy_to_dict(rule)
 
 
 @app.get("/policies", response_model=List[PolicyResponse])
 def list_policies(tenant_id: str, db: Session = Depends(get_db)):
     rules = db.query(PolicyRule).filter(PolicyRule.tenant_id == tenant_id).all()
-    return [
-        {
-            "id": rule.id,
-            "tenant_id": rule.tenant_id,
-            "name": rule.name,
-            "rule_type": rule.rule_type,
-            "params": rule.params,
-            "enabled": rule.enabled,
-        }
-        for rule in rules
-    ]
+    return [policy_to_dict(rule) for rule in rules]
+
+
+@app.post("/policies/replay")
+def replay_policies(payload: ReplayRequest, db: Session = Depends(get_db)):
+    """What-if: evaluate a candidate policy set against the tenant's audit history."""
+    started = time.perf_counter()
+    if payload.policies is None:
+        rules = db.query(PolicyRule).filter(PolicyRule.tenant_id == payload.tenant_id).all()
+        policy_data = [policy_to_dict(rule) for rule in rules] or default_policies(payload.tenant_id)
+    else:
+        policy_data = [
+            {**policy.model_dump(), "id": policy.id or f"candidate-{index}"}
+            for index, policy in enumerate(payload.policies)
+        ]
+    history = load_history(engine, payload.tenant_id, payload.since, payload.until, needs_text(policy_data))
+    report = replay(policy_data, history, payload.policy_mode)
+    return {"tenant_id": payload.tenant_id, **report, "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
 
 
-@app.post("/evaluate", response_model=DecisionResponse)
 def evaluate(payload: EvaluateRequest, db: Session = Depends(get_db)):
     rules = db.query(PolicyRule).filter(PolicyRule.tenant_id == payload.tenant_id).all()
     if rules:
-        policy_data = [
-            {
-                "id": rule.id,
-                "tenant_id": rule.tenant_id,
-                "name": rule.name,
-                "rule_type": rule.rule_type,
-                "params": rule.params,
-                "enabled": rule.enabled,
-            }
-            for rule in rules
-        ]
+        policy_data = [policy_to_dict(rule) for rule in rules]
     else:
         policy_data = default_policies(payload.tenant_id)
 
@@ -109,9 +165,7 @@ def evaluate(payload: EvaluateRequest, db: Session = Depends(get_db)):
         payload.evidence_flags,
     )
 
-    if payload.policy_mode == "advisory" and status == "rejected":
-        status = "pending"
-        reasons.append("Advisory mode: rejection downgraded to pending")
+    status = apply_policy_mode(status, reasons, payload.policy_mode)
 
     audit = create_audit_log(
         db=db,
@@ -123,8 +177,12 @@ def evaluate(payload: EvaluateRequest, db: Session = Depends(get_db)):
         bias_score=payload.bias_score,
         model_id=payload.model_id,
         decision_status=status,
+        sources_count=len(payload.sources),
+        consistency_score=payload.consistency_score,
+        evidence_flag_count=len(payload.evidence_flags),
     )
 
+    review = review_fields(payload.bias_score, payload.confidence)
     decision = create_decision(
         db=db,
         audit_id=audit.id,
@@ -132,7 +190,10 @@ def evaluate(payload: EvaluateRequest, db: Session = Depends(get_db)):
         status=status,
         reasons=reasons,
         policy_hits=hits,
+        review=review,
+        stats=decision_stats(payload.tenant_id, review["created_at"], status, hits, payload.confidence, payload.bias_score),
     )
+    announce_pending(payload.tenant_id, decision.id, status, reasons, review)
 
     return {
         "decision_id": decision.id,
@@ -142,39 +203,179 @@ def evaluate(payload: EvaluateRequest, db: Session = Depends(get_db)):
     }
 
 
+def evaluate_direct(payload: EvaluateRequest):
+    """Entry point for callers that embed governance in-process (gateway monolith mode)."""
+    if settings.evaluate_path == "core":
+        return evaluate_core(payload)
+    db = SessionLocal()
+    try:
+        return evaluate(payload, db)
+    finally:
+        db.close()
+
+
+db_routes.add_api_route(
+    "/evaluate",
+    evaluate_core if settings.evaluate_path == "core" else evaluate,
+    methods=["POST"],
+    response_model=DecisionResponse,
+)
+
+
 @app.post("/decisions/{decision_id}")
 def update_decision(decision_id: str, payload: DecisionUpdate, db: Session = Depends(get_db)):
     decision = db.query(Decision).filter(Decision.id == decision_id).first()
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
 
-    decision.status = payload.status
-    decision.reviewer = payload.reviewer
-    decision.review_notes = payload.notes
-    decision.updated_at = datetime.utcnow()
+    old_status = decision.status
+    if not resolve(db, decision, payload.reviewer, payload.status, payload.notes):
+        db.rollback()
+        db.refresh(decision)
+        if decision.claimed_by and decision.claimed_by != payload.reviewer:
+            raise HTTPException(status_code=409, detail=f"Decision is claimed by {decision.claimed_by}")
+        raise HTTPException(status_code=409, detail="Decision was updated concurrently; reload and retry")
+
+    record_status_change(db, decision.tenant_id, decision.created_at, old_status, payload.status)
     db.commit()
+    announce("resolved" if payload.status != "pending" else "released", decision.tenant_id, queue_item(decision))
 
     return {"status": "updated", "decision_id": decision_id}
 
 
-@app.get("/decisions")
-def list_decisions(tenant_id: str, status: str | None = None, limit: int = 50, db: Session = Depends(get_db)):
+@app.get("/review/queue")
+def review_queue(tenant_id: str, limit: int = 20, db: Session = Depends(get_db)):
+    """Unclaimed pending decisions, highest priority first."""
+    return [queue_item(d) for d in pending_queue(db, tenant_id, max(1, min(limit, 200)))]
+
+
+@app.post("/review/claim")
+def review_claim(payload: ReviewClaim, db: Session = Depends(get_db)):
+    lease_s = payload.lease_s or settings.review_lease_s
+    claimed = claim(db, payload.tenant_id, payload.reviewer, max(1, min(payload.limit, 50)), lease_s)
+    items = [queue_item(d) for d in claimed]
+    for item in items:
+        announce("claimed", payload.tenant_id, item)
+    return items
+
+
+def _lease_action(decision_id: str, payload: ReviewLease, lease_s: int | None, event: str, db: Session):
+    if not change_lease(db, decision_id, payload.reviewer, lease_s):
+        raise HTTPException(status_code=409, detail="Lease not held by this reviewer")
+    decision = db.query(Decision).filter(Decision.id == decision_id).first()
+    item = queue_item(decision)
+    announce(event, decision.tenant_id, item)
+    return item
+
+
+@app.post("/review/{decision_id}/renew")
+def review_renew(decision_id: str, payload: ReviewLease, db: Session = Depends(get_db)):
+    return _lease_action(decision_id, payload, payload.lease_s or settings.review_lease_s, "claimed", db)
+
+
+@app.post("/review/{decision_id}/release")
+def review_release(decision_id: str, payload: ReviewLease, db: Session = Depends(get_db)):
+    return _lease_action(decision_id, payload, None, "released", db)
+
+
+def _queue_snapshot(tenant_id: str):
+    db = SessionLocal()
+    try:
+        return [queue_item(d) for d in pending_queue(db, tenant_id, 50)]
+    finally:
+        db.close()
+
+
+def _queue_poll(tenant_id: str, since: datetime):
+    db = SessionLocal()
+    try:
+        return [queue_item(d) for d in pending_since(db, tenant_id, since)]
+    finally:
+        db.close()
+
+
+@app.get("/review/stream")
+async def review_stream(tenant_id: str, request: Request):
+    stream = event_stream(
+        tenant_id,
+        request.is_disconnected,
+        lambda: _queue_snapshot(tenant_id),
+        lambda since: _queue_poll(tenant_id, since),
+    )
+    return StreamingResponse(stream, media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@db_routes.get("/decisions")
+def list_decisions(
+    tenant_id: str,
+    status: str | None = None,
+    limit: int = 50,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    db: Session = Depends(get_db),
+):
     limit = max(1, min(limit, 200))
     query = db.query(Decision).filter(Decision.tenant_id == tenant_id)
     if status:
         query = query.filter(Decision.status == status)
+    since = query_window_start(since)
+    if since:
+        query = query.filter(Decision.created_at >= since)
+    if until:
+        query = query.filter(Decision.created_at < until)
     decisions = query.order_by(Decision.created_at.desc()).limit(limit).all()
-    return [
-        {
-            "id": d.id,
-            "status": d.status,
-            "reasons": d.reasons,
-            "policy_hits": d.policy_hits,
-            "created_at": d.created_at.isoformat(),
-            "updated_at": d.updated_at.isoformat() if d.updated_at else None,
-        }
-        for d in decisions
-    ]
+    return [decision_summary(d) for d in decisions]
+
+
+@app.get("/analytics/decisions")
+def analytics_decisions(
+    tenant_id: str,
+    start: date | None = None,
+    end: date | None = None,
+    daily: bool = True,
+    db: Session = Depends(get_db),
+):
+    """Status counts and rates, rule hits and confidence/bias histograms per day."""
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days")
+    return decision_analytics(db, tenant_id, start, end, daily)
+
+
+@app.get("/export/decisions")
+def export_decisions(
+    tenant_id: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    export_format: str = Query("ndjson", alias="format"),
+    cursor: str | None = None,
+    limit: int | None = None,
+):
+    """Stream decisions joined with their audit records, oldest first.
+
+    Every record carries a `cursor`; pass the last one received to resume.
+    """
+    if export_format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {sorted(FORMATS)}")
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if export_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=400, detail="Parquet export requires pyarrow")
+    batches = iter_records(engine, export_query(tenant_id, since, until, after, limit))
+    stream = parquet_stream(batches) if export_format == "parquet" else ndjson_stream(batches)
+    media_type, suffix = FORMATS[export_format]
+    filename = f"decisions-{tenant_id}.{suffix}"
+    return StreamingResponse(
+        stream, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @app.get("/decisions/{decision_id}/detail")
@@ -182,7 +383,17 @@ def decision_detail(decision_id: str, db: Session = Depends(get_db)):
     decision = db.query(Decision).filter(Decision.id == decision_id).first()
     if not decision:
         raise HTTPException(status_code=404, detail="Decision not found")
-    audit = db.query(AuditLog).filter(AuditLog.id == decision.audit_id).first()
+    # The audit row is written just before its decision; bounding created_at
+    # lets a partitioned audit_logs scan a single partition.
+    audit = (
+        db.query(AuditLog)
+        .filter(
+            AuditLog.id == decision.audit_id,
+            AuditLog.created_at <= decision.created_at,
+            AuditLog.created_at >= decision.created_at - timedelta(days=1),
+        )
+        .first()
+    )
     return {
         "decision": {
             "id": decision.id,
@@ -208,6 +419,40 @@ def decision_detail(decision_id: str, db: Session = Depends(get_db)):
     }
 
 
+def _attribution_to_dict(record: Attribution):
+    return {
+        "decision_id": record.decision_id,
+        "tenant_id": record.tenant_id,
+        "status": record.status,
+        "method": record.method,
+        "result": record.result,
+        "created_at": record.created_at.isoformat(),
+    }
+
+
+@app.post("/attributions", response_model=AttributionResponse)
+def store_attribution(payload: AttributionCreate, db: Session = Depends(get_db)):
+    record = db.get(Attribution, payload.decision_id)
+    if record is None:
+        record = Attribution(decision_id=payload.decision_id)
+        db.add(record)
+    record.tenant_id = payload.tenant_id
+    record.status = payload.status
+    record.method = payload.method
+    record.result = payload.result
+    record.created_at = datetime.utcnow()
+    db.commit()
+    return _attribution_to_dict(record)
+
+
+@app.get("/attributions/{decision_id}", response_model=AttributionResponse)
+def get_attribution(decision_id: str, db: Session = Depends(get_db)):
+    record = db.get(Attribution, decision_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Attribution not found")
+    return _attribution_to_dict(record)
+
+
 @app.get("/dashboard", response_class=HTMLResponse)
 def dashboard():
     return HTMLResponse(
@@ -235,6 +480,19 @@ def dashboard():
     <div class="small">Use this page to review pending decisions and approve or reject them.</div>
 
     <div class="row">
+      <div class="card">
+        <h3>Review Queue</h3>
+        <div class="small">Pending decisions, highest priority first. Updates are pushed live.</div>
+        <label>Tenant ID</label>
+        <input id="queueTenantId" value="gov-dept-a"/>
+        <label>Reviewer</label>
+        <input id="queueReviewer" placeholder="reviewer-name"/>
+        <button onclick="watchQueue()">Watch</button>
+        <button onclick="claimNext()">Claim Next</button>
+        <div class="small" id="queueState">Not connected</div>
+        <pre id="queueList"></pre>
+      </div>
+
       <div class="card">
         <h3>Load Decisions</h3>
         <label>Tenant ID</label>
@@ -278,6 +536,54 @@ def dashboard():
     </div>
 
     <script>
+      let queueSource = null;
+      const queue = new Map();
+      function renderQueue() {
+        const items = [...queue.values()].sort((a, b) => (b.priority || 0) - (a.priority || 0));
+        document.getElementById('queueList').textContent = items.map(item =>
+          `${item.decision_id}  priority=${item.priority}` + (item.claimed_by ? `  claimed by ${item.claimed_by}` : '')
+        ).join('\\n');
+      }
+      function watchQueue() {
+        const tenantId = document.getElementById('queueTenantId').value;
+        if (queueSource) queueSource.close();
+        queue.clear();
+        queueSource = new EventSource('/review/stream?' + new URLSearchParams({ tenant_id: tenantId }));
+        queueSource.onopen = () => { document.getElementById('queueState').textContent = 'Live'; };
+        queueSource.onerror = () => { document.getElementById('queueState').textContent = 'Reconnecting...'; };
+        queueSource.addEventListener('snapshot', e => {
+          queue.clear();
+          JSON.parse(e.data).items.forEach(item => queue.set(item.decision_id, item));
+          renderQueue();
+        });
+        ['pending', 'claimed', 'released'].forEach(name => queueSource.addEventListener(name, e => {
+          const item = JSON.parse(e.data);
+          queue.set(item.decision_id, item);
+          renderQueue();
+        }));
+        queueSource.addEventListener('resolved', e => {
+          queue.delete(JSON.parse(e.data).decision_id);
+          renderQueue();
+        });
+      }
+      async function claimNext() {
+        const tenant_id = document.getElementById('queueTenantId').value;
+        const reviewer = document.getElementById('queueReviewer').value;
+        const resp = await fetch('/review/claim', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({ tenant_id, reviewer })
+        });
+        const items = await resp.json();
+        if (!items.length) {
+          document.getElementById('queueState').textContent = 'Nothing to claim';
+          return;
+        }
+        document.getElementById('decisionId').value = items[0].decision_id;
+        document.getElementById('reviewDecisionId').value = items[0].decision_id;
+        document.getElementById('reviewer').value = reviewer;
+        loadDetail();
+      }
       async function loadDecisions() {
         const tenantId = document.getElementById('tenantId').value;
         const status = document.getElementById('status').value;
@@ -313,37 +619,33 @@ def dashboard():
     )
 
 
-@app.get("/bias/drift")
-def bias_drift(tenant_id: str, window: int = 50, threshold: float = 0.1, db: Session = Depends(get_db)):
+@db_routes.get("/bias/drift")
+def bias_drift(
+    tenant_id: str,
+    window: int = 50,
+    threshold: float = 0.1,
+    since: datetime | None = None,
+    db: Session = Depends(get_db),
+):
     window = max(10, min(window, 500))
+    query = db.query(AuditLog.bias_score).filter(AuditLog.tenant_id == tenant_id)
+    since = query_window_start(since)
+    if since:
+        query = query.filter(AuditLog.created_at >= since)
     scores = (
-        db.query(AuditLog.bias_score)
-        .filter(AuditLog.tenant_id == tenant_id)
-        .order_by(AuditLog.created_at.desc())
+        query.order_by(AuditLog.created_at.desc())
         .limit(window * 2)
         .all()
     )
-    flat = [row[0] for row in scores]
-    if len(flat) < window * 2:
-        return {
-            "tenant_id": tenant_id,
-            "status": "insufficient_data",
-            "required": window * 2,
-            "available": len(flat),
-        }
+    return drift_report(tenant_id, window, threshold, [row[0] for row in scores])
 
-    recent = flat[:window]
-    prev = flat[window : window * 2]
-    recent_mean = sum(recent) / len(recent)
-    prev_mean = sum(prev) / len(prev)
-    drift_score = abs(recent_mean - prev_mean)
 
-    return {
-        "tenant_id": tenant_id,
-        "window": window,
-        "recent_mean": round(recent_mean, 4),
-        "previous_mean": round(prev_mean, 4),
-        "drift_score": round(drift_score, 4),
-        "status": "drift_detected" if drift_score >= threshold else "stable",
-        "threshold": threshold,
-    }
+app.include_router(admin_routes)
+
+# The pool-bound routes run on the async engine when GOV_DB_ASYNC is enabled.
+if settings.db_async:
+    from .async_routes import router as async_db_routes
+
+    app.include_router(async_db_routes)
+else:
+    app.include_router(db_routes)
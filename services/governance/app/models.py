@@ -1,9 +1,21 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, String, Float, Date, DateTime, Boolean, Integer, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from .config import settings
 from .db import Base
 
+# Postgres requires the partition key in every unique constraint, so when
+# audit partitioning is on created_at joins the primary key and the
+# decisions -> audit_logs foreign key is dropped (the join stays in the ORM).
+PARTITIONED = settings.audit_partitioning
+
+
+def _table_args(*indexes):
+    options = {"postgresql_partition_by": "RANGE (created_at)"} if PARTITIONED else {}
+    return (*indexes, options)
+
+
 class PolicyRule(Base):
     __tablename__ = "policy_rules"
 
@@ -16,6 +28,7 @@ class PolicyRule(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = _table_args(Index("ix_audit_logs_tenant_created", "tenant_id", "created_at"))
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     tenant_id = Column(String, nullable=False)
@@ -26,22 +39,71 @@ class AuditLog(Base):
     bias_score = Column(Float, nullable=False)
     model_id = Column(String, nullable=False)
     decision_status = Column(String, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=PARTITIONED, nullable=False, default=datetime.utcnow)
+    # Inputs to evaluate_policies beyond the text, kept so rule changes can be
+    # replayed against history (see replay.py); null on rows written before.
+    sources_count = Column(Integer, nullable=True)
+    consistency_score = Column(Float, nullable=True)
+    evidence_flag_count = Column(Integer, nullable=True)
 
-    decision = relationship("Decision", back_populates="audit", uselist=False)
+    decision = relationship(
+        "Decision",
+        back_populates="audit",
+        uselist=False,
+        primaryjoin="AuditLog.id == foreign(Decision.audit_id)",
+    )
 
 class Decision(Base):
     __tablename__ = "decisions"
+    __table_args__ = _table_args(
+        Index("ix_decisions_tenant_created", "tenant_id", "created_at"),
+        Index("ix_decisions_review_queue", "tenant_id", "status", "review_rank"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    audit_id = Column(String, ForeignKey("audit_logs.id"), nullable=False)
+    audit_id = Column(String, *([] if PARTITIONED else [ForeignKey("audit_logs.id")]), nullable=False)
     tenant_id = Column(String, nullable=False)
     status = Column(String, nullable=False)
     reasons = Column(JSON, nullable=False, default=list)
     policy_hits = Column(JSON, nullable=False, default=list)
     reviewer = Column(String, nullable=True)
     review_notes = Column(String, nullable=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=PARTITIONED, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Review queue: pending decisions are served in review_rank order, which
+    # is created_at pulled earlier by priority (see review.review_rank).
+    priority = Column(Float, nullable=True)
+    review_rank = Column(DateTime, nullable=True)
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    audit = relationship(
+        "AuditLog",
+        back_populates="decision",
+        primaryjoin="AuditLog.id == foreign(Decision.audit_id)",
+    )
+
+class Attribution(Base):
+    __tablename__ = "attributions"
+
+    decision_id = Column(String, primary_key=True)
+    tenant_id = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False)
+    method = Column(String, nullable=True)
+    result = Column(JSON, nullable=False, default=dict)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class DecisionStat(Base):
+    """Per-tenant, per-day decision counters, kept current on every write.
+
+    One row per (metric, label): metric is status, rule, policy, confidence
+    or bias, and label is the status, rule type, policy id or histogram bucket.
+    """
+
+    __tablename__ = "decision_stats"
 
-    audit = relationship("AuditLog", back_populates="decision")
+    tenant_id = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    metric = Column(String, primary_key=True)
+    label = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,270 @@
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ("decisions", "audit_logs")
+MAINTENANCE_LOCK_KEY = 730_031
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y%m}"
+
+
+def query_window_start(since: datetime | None) -> datetime | None:
+    """Lower created_at bound for list queries so Postgres can prune partitions."""
+    if since is not None:
+        return since
+    if settings.query_lookback_days > 0:
+        return datetime.utcnow() - timedelta(days=settings.query_lookback_days)
+    return None
+
+
+def partitioning_active(engine: Engine) -> bool:
+    return settings.audit_partitioning and engine.dialect.name == "postgresql"
+
+
+def list_partitions(conn: Connection, table: str) -> List[Tuple[str, datetime]]:
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ),
+        {"table": table},
+    ).scalars()
+    prefix = f"{table}_p"
+    partitions = []
+    for name in rows:
+        if name.startswith(prefix):
+            try:
+                partitions.append((name, datetime.strptime(name[len(prefix):], "%Y%m")))
+            except ValueError:
+                continue
+    return sorted(partitions, key=lambda item: item[1])
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def _ddl(conn: Connection, action: str, step: Callable[[], Any]) -> bool:
+    """Run one DDL step in its own short transaction.
+
+    Partition DDL needs strong locks on the parent or default partition. The
+    maintenance connection sets lock_timeout, so a step that would queue
+    behind a long query (and block /evaluate inserts queued behind it) gives
+    up instead and is retried on the next run.
+    """
+    try:
+        step()
+        conn.commit()
+    except OperationalError:
+        conn.rollback()
+        logger.warning("Could not take the locks to %s; retrying next run", action)
+        return False
+    return True
+
+
+def _create_partition(conn: Connection, table: str, name: str, start: datetime) -> None:
+    bounds = f"FROM ('{start:%Y-%m-%d}') TO ('{add_months(start, 1):%Y-%m-%d}')"
+    default = default_partition_name(table)
+    stray = conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE created_at >= :start AND created_at < :end)"),
+        {"start": start, "end": add_months(start, 1)},
+    ).scalar()
+    if not stray:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} FOR VALUES {bounds}"))
+        return
+    # Maintenance fell behind and the default partition caught this month's
+    # rows; Postgres refuses a new partition that overlaps them, so move them
+    # into a standalone table first and attach that.
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} (LIKE {table} INCLUDING ALL)"))
+    conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} WHERE created_at >= :start AND created_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"start": start, "end": add_months(start, 1)},
+    )
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+
+
+def ensure_partitions(conn: Connection, now: datetime) -> List[str]:
+    created = []
+    first = month_start(now)
+    for table in PARTITIONED_TABLES:
+        # Catches inserts for months that have no partition yet, so writes keep
+        # working if maintenance stops running for a while.
+        if not _ddl(conn, f"create {default_partition_name(table)}", lambda: conn.execute(
+            text(f"CREATE TABLE IF NOT EXISTS {default_partition_name(table)} PARTITION OF {table} DEFAULT")
+        )):
+            continue
+        existing = {name for name, _ in list_partitions(conn, table)}
+        conn.commit()
+        for offset in range(settings.partition_months_ahead + 1):
+            start = add_months(first, offset)
+            name = partition_name(table, start)
+            if name in existing:
+                continue
+            if _ddl(conn, f"create {name}", lambda: _create_partition(conn, table, name, start)):
+                created.append(name)
+    return created
+
+
+def _open_archive(path: str):
+    if settings.audit_archive_compression == "zstd":
+        import zstandard
+
+        return zstandard.open(path, "wt", encoding="utf-8")
+    return gzip.open(path, "wt", encoding="utf-8")
+
+
+def _archive_suffix() -> str:
+    return ".jsonl.zst" if settings.audit_archive_compression == "zstd" else ".jsonl.gz"
+
+
+def archive_partition(conn: Connection, name: str) -> Dict[str, Any]:
+    os.makedirs(settings.audit_archive_dir, exist_ok=True)
+    path = os.path.join(settings.audit_archive_dir, name + _archive_suffix())
+    tmp_path = path + ".tmp"
+    rows = 0
+    result = conn.execution_options(stream_results=True, yield_per=1000).execute(text(f"SELECT * FROM {name}"))
+    with _open_archive(tmp_path) as handle:
+        for row in result.mappings():
+            handle.write(json.dumps(dict(row), default=lambda value: value.isoformat()) + "\n")
+            rows += 1
+    os.replace(tmp_path, path)
+    return {"partition": name, "path": path, "rows": rows}
+
+
+def _detached_tables(conn: Connection, table: str) -> List[Tuple[str, datetime]]:
+    """Month tables left standalone by a run that stopped between detach and drop."""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relname LIKE :pattern "
+            "AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid)"
+        ),
+        {"pattern": f"{table}_p%"},
+    ).scalars()
+    prefix = f"{table}_p"
+    tables = []
+    for name in rows:
+        try:
+            tables.append((name, datetime.strptime(name[len(prefix):], "%Y%m")))
+        except ValueError:
+            continue
+    return tables
+
+
+def _detach(conn: Connection, table: str, name: str) -> bool:
+    # DETACH ... CONCURRENTLY is not allowed while a default partition exists,
+    # so the detach runs on its own: ACCESS EXCLUSIVE on the parent is held
+    # only for the catalog change, and lock_timeout bounds the wait for it.
+    return _ddl(conn, f"detach {name}", lambda: conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}")))
+
+
+def apply_retention(engine: Engine, conn: Connection, now: datetime) -> List[Dict[str, Any]]:
+    """Archive, detach and drop partitions older than the retention window.
+
+    Each step commits on its own: the archive is a plain read of the still
+    attached partition, and only the detach briefly locks the parent table.
+    """
+    if settings.audit_retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(now), -settings.audit_retention_months)
+    archived = []
+    for table in PARTITIONED_TABLES:
+        for name, start in _detached_tables(conn, table):
+            path = os.path.join(settings.audit_archive_dir, name + _archive_suffix())
+            if add_months(start, 1) <= cutoff and os.path.exists(path):
+                _ddl(conn, f"drop {name}", lambda: conn.execute(text(f"DROP TABLE {name}")))
+        expired = [name for name, start in list_partitions(conn, table) if add_months(start, 1) <= cutoff]
+        conn.commit()
+        for name in expired:
+            with engine.connect() as reader:
+                item = archive_partition(reader, name)
+            if not _detach(conn, table, name):
+                continue
+            # A late write may have landed between the archive and the detach.
+            if conn.execute(text(f"SELECT count(*) FROM {name}")).scalar() != item["rows"]:
+                with engine.connect() as reader:
+                    item = archive_partition(reader, name)
+            conn.commit()
+            # Detached, the table no longer shares locks with the parent.
+            _ddl(conn, f"drop {name}", lambda: conn.execute(text(f"DROP TABLE {name}")))
+            archived.append(item)
+    return archived
+
+
+def run_maintenance(engine: Engine, now: datetime | None = None) -> Dict[str, Any]:
+    if not partitioning_active(engine):
+        return {"status": "disabled", "created": [], "archived": []}
+    now = now or datetime.utcnow()
+    with engine.connect() as conn:
+        # Only one replica maintains partitions at a time; the rest skip. The
+        # lock is session-level because the steps below commit separately.
+        locked = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}).scalar()
+        if not locked:
+            conn.commit()
+            return {"status": "skipped", "created": [], "archived": []}
+        conn.execute(text(f"SET lock_timeout = {int(settings.partition_lock_timeout_ms)}"))
+        conn.commit()
+        try:
+            created = ensure_partitions(conn, now)
+            archived = apply_retention(engine, conn, now)
+        finally:
+            conn.rollback()
+            conn.execute(text("RESET lock_timeout"))
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY})
+            conn.commit()
+    for item in archived:
+        logger.info("Archived %s (%d rows) to %s", item["partition"], item["rows"], item["path"])
+    return {"status": "ok", "created": created, "archived": archived}
+
+
+_stop = threading.Event()
+
+
+def start_maintenance_thread(engine: Engine) -> threading.Thread | None:
+    if not partitioning_active(engine):
+        return None
+
+    _stop.clear()
+
+    def loop() -> None:
+        while not _stop.wait(settings.partition_maintenance_interval_s):
+            try:
+                run_maintenance(engine)
+            except Exception:
+                logger.exception("Partition maintenance failed")
+
+    thread = threading.Thread(target=loop, name="partition-maintenance", daemon=True)
+    thread.start()
+    return thread
+
+
+def stop_maintenance_thread() -> None:
+    _stop.set()
@@ -2,6 +2,24 @@ from typing import Any, Dict, List, Tuple
 from .config import settings
 
 
+def policy_to_dict(rule: Any) -> Dict[str, Any]:
+    return {
+        "id": rule.id,
+        "tenant_id": rule.tenant_id,
+        "name": rule.name,
+        "rule_type": rule.rule_type,
+        "params": rule.params,
+        "enabled": rule.enabled,
+    }
+
+
+def apply_policy_mode(status: str, reasons: List[str], policy_mode: str) -> str:
+    if policy_mode == "advisory" and status == "rejected":
+        reasons.append("Advisory mode: rejection downgraded to pending")
+        return "pending"
+    return status
+
+
 def default_policies(tenant_id: str) -> List[Dict[str, Any]]:
     policies = [
         {
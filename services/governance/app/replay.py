@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .models import AuditLog
+
+STATUSES = ("approved", "pending", "rejected")
+APPROVED, PENDING, REJECTED = range(3)
+TEXT_RULES = {"BLOCKLIST_TERM"}
+CACHE_ENTRIES = 8
+
+
+@dataclass
+class History:
+    """Policy inputs for a tenant's audit rows, one array per column."""
+
+    confidence: np.ndarray
+    bias_score: np.ndarray
+    sources_count: np.ndarray
+    consistency_score: np.ndarray
+    evidence_flag_count: np.ndarray
+    status: np.ndarray
+    skipped: int
+    truncated: bool
+    text: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+
+_cache: "OrderedDict[Tuple[Any, ...], Tuple[float, History]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _window(query, tenant_id: str, since: datetime | None, until: datetime | None):
+    query = query.where(AuditLog.tenant_id == tenant_id)
+    if since is not None:
+        query = query.where(AuditLog.created_at >= since)
+    if until is not None:
+        query = query.where(AuditLog.created_at < until)
+    return query
+
+
+def load_history(
+    bind: Engine, tenant_id: str, since: datetime | None, until: datetime | None, with_text: bool = False
+) -> History:
+    """Read audit metrics into arrays, newest GOV_REPLAY_MAX_ROWS rows at most.
+
+    Rows written before the metric columns existed cannot be replayed and are
+    only counted. Results are cached for GOV_REPLAY_CACHE_TTL_S so repeated
+    what-if runs while tuning thresholds skip the database entirely.
+    """
+    key = (str(bind.url), tenant_id, since, until, with_text)
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and now - cached[0] < settings.replay_cache_ttl_s:
+            _cache.move_to_end(key)
+            return cached[1]
+
+    columns = [
+        AuditLog.confidence,
+        AuditLog.bias_score,
+        AuditLog.sources_count,
+        AuditLog.consistency_score,
+        AuditLog.evidence_flag_count,
+        AuditLog.decision_status,
+    ]
+    if with_text:
+        columns += [AuditLog.prompt, AuditLog.answer]
+    query = (
+        _window(select(*columns), tenant_id, since, until)
+        .where(AuditLog.sources_count.is_not(None))
+        .order_by(AuditLog.created_at.desc())
+        .limit(settings.replay_max_rows + 1)
+    )
+    skipped_query = _window(select(func.count()).select_from(AuditLog), tenant_id, since, until).where(
+        AuditLog.sources_count.is_(None)
+    )
+
+    values: List[List[Any]] = [[] for _ in columns]
+    with bind.connect() as conn:
+        skipped = conn.execute(skipped_query).scalar_one()
+        result = conn.execution_options(stream_results=True, yield_per=50_000).execute(query)
+        for rows in result.partitions():
+            for target, column in zip(values, zip(*rows)):
+                target.extend(column)
+    truncated = len(values[0]) > settings.replay_max_rows
+    if truncated:
+        values = [column[: settings.replay_max_rows] for column in values]
+
+    status_codes = {name: code for code, name in enumerate(STATUSES)}
+    history = History(
+        confidence=np.asarray(values[0], dtype=np.float64),
+        bias_score=np.asarray(values[1], dtype=np.float64),
+        sources_count=np.asarray(values[2], dtype=np.int32),
+        consistency_score=np.asarray([v or 0.0 for v in values[3]], dtype=np.float64),
+        evidence_flag_count=np.asarray([v or 0 for v in values[4]], dtype=np.int32),
+        status=np.fromiter((status_codes.get(v, PENDING) for v in values[5]), dtype=np.int8, count=len(values[5])),
+        skipped=skipped,
+        truncated=truncated,
+        text=np.asarray([f"{p}\n{a}".lower() for p, a in zip(values[6], values[7])], dtype=object)
+        if with_text
+        else None,
+    )
+    with _cache_lock:
+        _cache[key] = (now, history)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return history
+
+
+def _rule_masks(policy: Dict[str, Any], history: History) -> List[Tuple[np.ndarray, int]]:
+    """(mask, status level) per hit the rule can record, mirroring evaluate_policies."""
+    rule_type = policy["rule_type"]
+    params = policy.get("params", {})
+    if rule_type == "REQUIRE_CONFIDENCE":
+        return [(history.confidence < float(params.get("min_confidence", 0.0)), PENDING)]
+    if rule_type == "REQUIRE_CITATIONS":
+        return [(history.sources_count < int(params.get("min_sources", 1)), PENDING)]
+    if rule_type == "REQUIRE_GROUNDING":
+        return [
+            (history.consistency_score < float(params.get("min_consistency", 0.0)), PENDING),
+            (history.evidence_flag_count > 0, PENDING),
+        ]
+    if rule_type == "BLOCKLIST_TERM":
+        terms = [t.lower() for t in params.get("terms", [])]
+        mask = np.fromiter(
+            (any(term in text for term in terms) for text in history.text), dtype=bool, count=len(history)
+        )
+        return [(mask, REJECTED)]
+    if rule_type == "MAX_BIAS":
+        return [(history.bias_score > float(params.get("max_bias", 1.0)), PENDING)]
+    if rule_type == "REQUIRE_HUMAN_REVIEW":
+        if params.get("always", False):
+            return [(np.ones(len(history), dtype=bool), PENDING)]
+        return [
+            (history.bias_score > float(params.get("if_bias_over", 1.1)), PENDING),
+            (history.confidence < float(params.get("if_confidence_below", -1.0)), PENDING),
+        ]
+    return []
+
+
+def replay(policies: List[Dict[str, Any]], history: History, policy_mode: str = "enforce") -> Dict[str, Any]:
+    """Evaluate a policy set over every historical row at once.
+
+    Statuses are ordered approved < pending < rejected and a hit only ever
+    raises a row's status, so the outcome is the maximum over all hits.
+    """
+    status = np.zeros(len(history), dtype=np.int8)
+    rule_hits: Counter = Counter()
+    policy_hits: Counter = Counter()
+    for policy in policies:
+        if not policy.get("enabled", True):
+            continue
+        for mask, level in _rule_masks(policy, history):
+            hits = int(mask.sum())
+            if not hits:
+                continue
+            rule_hits[policy["rule_type"]] += hits
+            policy_hits[policy["id"]] += hits
+            np.maximum(status, np.where(mask, level, APPROVED).astype(np.int8), out=status)
+    if policy_mode == "advisory":
+        status[status == REJECTED] = PENDING
+
+    baseline = np.bincount(history.status, minlength=len(STATUSES))
+    replayed = np.bincount(status, minlength=len(STATUSES))
+    pairs = np.bincount(history.status.astype(np.int32) * len(STATUSES) + status, minlength=len(STATUSES) ** 2)
+    transitions = {
+        f"{STATUSES[index // len(STATUSES)]}->{STATUSES[index % len(STATUSES)]}": int(count)
+        for index, count in enumerate(pairs)
+        if count and index // len(STATUSES) != index % len(STATUSES)
+    }
+    return {
+        "records": len(history),
+        "skipped": history.skipped,
+        "truncated": history.truncated,
+        "baseline": dict(zip(STATUSES, baseline.tolist())),
+        "replayed": dict(zip(STATUSES, replayed.tolist())),
+        "delta": {name: int(replayed[i] - baseline[i]) for i, name in enumerate(STATUSES)},
+        "changed": int((history.status != status).sum()),
+        "transitions": transitions,
+        "rule_hits": dict(rule_hits),
+        "policy_hits": dict(policy_hits),
+    }
+
+
+def needs_text(policies: List[Dict[str, Any]]) -> bool:
+    return any(policy["rule_type"] in TEXT_RULES and policy.get("enabled", True) for policy in policies)
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Set, Tuple
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import Decision
+
+
+def review_priority(bias_score: float, confidence: float) -> float:
+    bias = min(max(bias_score, 0.0), 1.0)
+    doubt = 1.0 - min(max(confidence, 0.0), 1.0)
+    return round(settings.review_bias_weight * bias + settings.review_confidence_weight * doubt, 4)
+
+
+def review_rank(created_at: datetime, priority: float) -> datetime:
+    # A priority-1.0 item queues as if it had arrived review_priority_window_s
+    # earlier, so severity wins over recency but old items still surface.
+    return created_at - timedelta(seconds=priority * settings.review_priority_window_s)
+
+
+def review_fields(bias_score: float, confidence: float) -> Dict[str, Any]:
+    created_at = datetime.utcnow()
+    priority = review_priority(bias_score, confidence)
+    return {"created_at": created_at, "priority": priority, "review_rank": review_rank(created_at, priority)}
+
+
+def backfill_review_rank(bind) -> int:
+    """Give decisions written before review_rank existed a rank of created_at.
+
+    Those rows also predate `priority`, so created_at is the rank they would
+    have had; without it NULLs sort first on SQLite and last on Postgres.
+    """
+    with bind.begin() as conn:
+        result = conn.execute(
+            update(Decision).where(Decision.review_rank.is_(None)).values(review_rank=Decision.created_at)
+        )
+    return result.rowcount
+
+
+def queue_item(decision: Decision) -> Dict[str, Any]:
+    return {
+        "decision_id": decision.id,
+        "status": decision.status,
+        "priority": decision.priority,
+        "reasons": decision.reasons,
+        "claimed_by": decision.claimed_by,
+        "lease_expires_at": decision.lease_expires_at.isoformat() if decision.lease_expires_at else None,
+        "created_at": decision.created_at.isoformat(),
+    }
+
+
+def _available(tenant_id: str, now: datetime):
+    return (
+        Decision.tenant_id == tenant_id,
+        Decision.status == "pending",
+        or_(Decision.lease_expires_at.is_(None), Decision.lease_expires_at < now),
+    )
+
+
+def pending_queue(db: Session, tenant_id: str, limit: int) -> List[Decision]:
+    now = datetime.utcnow()
+    return (
+        db.query(Decision)
+        .filter(*_available(tenant_id, now))
+        .order_by(Decision.review_rank.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def pending_since(db: Session, tenant_id: str, since: datetime, limit: int = 200) -> List[Decision]:
+    return (
+        db.query(Decision)
+        .filter(Decision.tenant_id == tenant_id, Decision.status == "pending", Decision.created_at > since)
+        .order_by(Decision.created_at.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def claim(db: Session, tenant_id: str, reviewer: str, limit: int, lease_s: int) -> List[Decision]:
+    """Lease up to `limit` decisions from the head of the queue.
+
+    Each lease is a conditional UPDATE that only succeeds while the row is
+    still pending and unleased, so concurrent reviewers never get the same item.
+    """
+    now = datetime.utcnow()
+    candidates = (
+        db.query(Decision.id)
+        .filter(*_available(tenant_id, now))
+        .order_by(Decision.review_rank.asc())
+        .limit(limit * 4)
+        .all()
+    )
+    claimed: List[str] = []
+    for (decision_id,) in candidates:
+        result = db.execute(
+            update(Decision)
+            .where(Decision.id == decision_id, *_available(tenant_id, now))
+            .values(claimed_by=reviewer, lease_expires_at=now + timedelta(seconds=lease_s))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            claimed.append(decision_id)
+            if len(claimed) == limit:
+                break
+    db.commit()
+    if not claimed:
+        return []
+    rows = db.query(Decision).filter(Decision.id.in_(claimed)).all()
+    return sorted(rows, key=lambda row: claimed.index(row.id))
+
+
+def change_lease(db: Session, decision_id: str, reviewer: str, lease_s: int | None) -> bool:
+    """Renew (lease_s set) or release (None) a lease held by `reviewer`."""
+    now = datetime.utcnow()
+    values: Dict[str, Any] = {"lease_expires_at": now + timedelta(seconds=lease_s)} if lease_s else {
+        "claimed_by": None,
+        "lease_expires_at": None,
+    }
+    result = db.execute(
+        update(Decision)
+        .where(
+            Decision.id == decision_id,
+            Decision.claimed_by == reviewer,
+            Decision.lease_expires_at >= now,
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def resolve(db: Session, decision: Decision, reviewer: str, status: str, notes: str) -> bool:
+    """Record a reviewer's verdict unless another reviewer holds a live lease.
+
+    One conditional UPDATE like claim and change_lease, so a claim taken after
+    `decision` was read is never overwritten. The row must also still have the
+    status read then, so the caller's stats delta matches the change. The
+    caller commits.
+    """
+    now = datetime.utcnow()
+    result = db.execute(
+        update(Decision)
+        .where(
+            Decision.id == decision.id,
+            Decision.status == decision.status,
+            or_(
+                Decision.claimed_by.is_(None),
+                Decision.claimed_by == reviewer,
+                Decision.lease_expires_at.is_(None),
+                Decision.lease_expires_at < now,
+            ),
+        )
+        .values(
+            status=status,
+            reviewer=reviewer,
+            review_notes=notes,
+            updated_at=now,
+            claimed_by=None,
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+class ReviewBroker:
+    """Fans queue events out to SSE subscribers of this process.
+
+    Publishers may run in worker threads (sync routes), so events are handed
+    to each subscriber's loop with call_soon_threadsafe.
+    """
+
+    def __init__(self, max_backlog: int = 1000) -> None:
+        self.max_backlog = max_backlog
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def subscribe(self, tenant_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_backlog)
+        with self._lock:
+            self._subscribers.setdefault(tenant_id, set()).add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, tenant_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(tenant_id, set())
+            for entry in [entry for entry in subscribers if entry[1] is queue]:
+                subscribers.discard(entry)
+            if not subscribers:
+                self._subscribers.pop(tenant_id, None)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    def publish(self, tenant_id: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(tenant_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:
+                # Subscriber's loop already closed; it unsubscribes on its way out.
+                pass
+
+
+broker = ReviewBroker()
+
+
+def announce(event: str, tenant_id: str, item: Dict[str, Any]) -> None:
+    broker.publish(tenant_id, {"event": event, **item})
+
+
+def announce_pending(tenant_id: str, decision_id: str, status: str, reasons: List[str], fields: Dict[str, Any]) -> None:
+    if status != "pending":
+        return
+    announce(
+        "pending",
+        tenant_id,
+        {
+            "decision_id": decision_id,
+            "status": status,
+            "priority": fields["priority"],
+            "reasons": reasons,
+            "claimed_by": None,
+            "lease_expires_at": None,
+            "created_at": fields["created_at"].isoformat(),
+        },
+    )
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def event_stream(
+    tenant_id: str,
+    is_disconnected: Callable[[], Any],
+    snapshot: Callable[[], List[Dict[str, Any]]],
+    poll: Callable[[datetime], List[Dict[str, Any]]],
+) -> AsyncIterator[str]:
+    """SSE stream: a snapshot of the queue head, then pending/claimed/released/resolved events.
+
+    Events come from this process's broker; with GOV_REVIEW_POLL_S set the
+    stream also polls for pending decisions recorded by other replicas.
+    """
+    queue = broker.subscribe(tenant_id)
+    seen: deque = deque(maxlen=1000)
+    try:
+        items = await asyncio.to_thread(snapshot)
+        seen.extend(item["decision_id"] for item in items)
+        yield _sse("snapshot", {"items": items})
+        last_poll = datetime.utcnow()
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time() + settings.review_poll_s
+        while not await is_disconnected():
+            timeout = settings.review_heartbeat_s
+            if settings.review_poll_s > 0:
+                timeout = max(0.0, min(timeout, next_poll - loop.time()))
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                if settings.review_poll_s > 0 and loop.time() >= next_poll:
+                    since, last_poll = last_poll, datetime.utcnow()
+                    next_poll = loop.time() + settings.review_poll_s
+                    for item in await asyncio.to_thread(poll, since - timedelta(seconds=1)):
+                        if item["decision_id"] not in seen:
+                            seen.append(item["decision_id"])
+                            yield _sse("pending", {"event": "pending", **item})
+                else:
+                    yield ": keepalive\n\n"
+                continue
+            if event["event"] == "pending":
+                if event["decision_id"] in seen:
+                    continue
+                seen.append(event["decision_id"])
+            yield _sse(event["event"], event)
+    finally:
+        broker.unsubscribe(tenant_id, queue)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Any, Dict, List
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -31,6 +32,20 @@ class PolicyCreate(BaseSchema):
     params: Dict[str, Any]
     enabled: bool = True
 
+class ReplayPolicy(BaseSchema):
+    id: str | None = None
+    name: str = ""
+    rule_type: str
+    params: Dict[str, Any] = {}
+    enabled: bool = True
+
+class ReplayRequest(BaseSchema):
+    tenant_id: str
+    policies: List[ReplayPolicy] | None = Field(default=None, description="candidate set; omitted replays the current policies")
+    since: datetime | None = None
+    until: datetime | None = None
+    policy_mode: str = Field(default="enforce", description="enforce|advisory")
+
 class PolicyResponse(BaseSchema):
     id: str
     tenant_id: str
@@ -49,3 +64,23 @@ class DecisionUpdate(BaseSchema):
     status: str
     reviewer: str
     notes: str = ""
+
+class ReviewClaim(BaseSchema):
+    tenant_id: str
+    reviewer: str
+    limit: int = 1
+    lease_s: int | None = None
+
+class ReviewLease(BaseSchema):
+    reviewer: str
+    lease_s: int | None = None
+
+class AttributionCreate(BaseSchema):
+    decision_id: str
+    tenant_id: str
+    status: str = Field(description="completed|failed")
+    method: str | None = None
+    result: Dict[str, Any] = {}
+
+class AttributionResponse(AttributionCreate):
+    created_at: str
@@ -0,0 +1,54 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Settings are read at import time, so point the service at a throwaway
+# SQLite file before anything under app/ is imported.
+_db_dir = tempfile.mkdtemp(prefix="govai-governance-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/governance.db"
+os.environ.setdefault("GOV_REPLAY_CACHE_TTL_S", "0")
+os.environ["GOVAI_ADMIN_TOKEN"] = "test-admin-token"
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_DIR.parent / "common"))
+sys.path.insert(0, str(SERVICE_DIR))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin_headers():
+    return {"X-Admin-Token": os.environ["GOVAI_ADMIN_TOKEN"]}
+
+
+@pytest.fixture
+def evaluate_payload():
+    """Builds an /evaluate body for a tenant; keyword arguments override its fields."""
+    return _evaluate_payload
+
+
+def _evaluate_payload(tenant_id: str, **overrides):
+    payload = {
+        "tenant_id": tenant_id,
+        "user_id": "u-1",
+        "prompt": "What is the retention policy?",
+        "answer": "Records are kept for seven years.",
+        "sources": [{"id": "doc-1", "title": "Retention", "snippet": "seven years", "score": 0.9}],
+        "confidence": 0.8,
+        "bias_score": 0.1,
+        "model_id": "test-model",
+        "consistency_score": 0.9,
+        "evidence_flags": [],
+    }
+    payload.update(overrides)
+    return payload
@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/admin/partitions/maintain", "/admin/analytics/rebuild?start=2026-01-01"])
+def test_admin_routes_need_the_admin_token(client, admin_headers, path):
+    assert client.post(path).status_code == 401
+    assert client.post(path, headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert client.post(path, headers=admin_headers).status_code == 200
+
+
+def test_partition_maintenance_reports_disabled_without_partitioning(client, admin_headers):
+    response = client.post("/admin/partitions/maintain", headers=admin_headers)
+    assert response.json() == {"status": "disabled", "created": [], "archived": []}
@@ -0,0 +1,82 @@
+import random
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
+from app.db import engine
+from app.models import DecisionStat
+
+TENANT = "stats-tenant"
+
+
+def _counters():
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(DecisionStat.day, DecisionStat.metric, DecisionStat.label, DecisionStat.total).where(
+                DecisionStat.tenant_id == TENANT
+            )
+        )
+        return {(day, metric, label): total for day, metric, label, total in rows if total}
+
+
+def test_rebuild_matches_incremental_counters(client, admin_headers, evaluate_payload):
+    rng = random.Random(39)
+    pending = []
+    for index in range(60):
+        response = client.post(
+            "/evaluate",
+            json=evaluate_payload(
+                TENANT,
+                confidence=round(rng.random(), 3),
+                bias_score=round(rng.random(), 3),
+                consistency_score=round(rng.random(), 3),
+                sources=[] if index % 7 == 0 else evaluate_payload(TENANT)["sources"],
+                evidence_flags=["unsupported_claim"] if index % 5 == 0 else [],
+            ),
+        )
+        if response.json()["status"] == "pending":
+            pending.append(response.json()["decision_id"])
+    assert len(pending) > 3
+    # Reviews move counts between statuses in place.
+    for decision_id, status in zip(pending, ["approved", "rejected", "approved"]):
+        client.post(f"/decisions/{decision_id}", json={"status": status, "reviewer": "alice"})
+
+    incremental = _counters()
+    today = datetime.utcnow().date().isoformat()
+    report = client.post(
+        "/admin/analytics/rebuild", params={"start": today, "tenant_id": TENANT}, headers=admin_headers
+    ).json()
+    assert report["decisions"] == 60
+    assert _counters() == incremental
+
+
+def test_analytics_reports_the_counters(client, evaluate_payload):
+    tenant = "stats-report"
+    for confidence in (0.1, 0.15, 0.9):
+        client.post("/evaluate", json=evaluate_payload(tenant, confidence=confidence))
+
+    report = client.get("/analytics/decisions", params={"tenant_id": tenant}).json()
+    assert report["totals"]["decisions"] == 3
+    assert report["totals"]["status"] == {"pending": 2, "approved": 1}
+    assert report["totals"]["rules"] == {"REQUIRE_CONFIDENCE": 2}
+
+
+def test_reviewing_a_decision_without_counters_never_goes_negative(client, evaluate_payload):
+    tenant = "stats-legacy"
+    decision_id = client.post("/evaluate", json=evaluate_payload(tenant, confidence=0.1)).json()["decision_id"]
+    # As if the decision predates decision_stats.
+    with engine.begin() as conn:
+        conn.execute(delete(DecisionStat).where(DecisionStat.tenant_id == tenant))
+
+    assert client.post(f"/decisions/{decision_id}", json={"status": "approved", "reviewer": "alice"}).status_code == 200
+    with engine.connect() as conn:
+        totals = dict(
+            conn.execute(
+                select(DecisionStat.label, DecisionStat.total).where(
+                    DecisionStat.tenant_id == tenant, DecisionStat.metric == "status"
+                )
+            ).all()
+        )
+    assert totals == {"approved": 1}
+    report = client.get("/analytics/decisions", params={"tenant_id": tenant}).json()
+    assert report["totals"]["status"] == {"approved": 1}
@@ -0,0 +1,94 @@
+import random
+from collections import Counter
+
+from app.db import engine
+from app.policies import evaluate_policies
+from app.replay import load_history, replay
+
+POLICIES = [
+    {"id": "conf", "rule_type": "REQUIRE_CONFIDENCE", "params": {"min_confidence": 0.4}},
+    {"id": "cite", "rule_type": "REQUIRE_CITATIONS", "params": {"min_sources": 2}},
+    {"id": "ground", "rule_type": "REQUIRE_GROUNDING", "params": {"min_consistency": 0.3}},
+    {"id": "block", "rule_type": "BLOCKLIST_TERM", "params": {"terms": ["Forbidden"]}},
+    {"id": "bias", "rule_type": "MAX_BIAS", "params": {"max_bias": 0.7}},
+    {"id": "human", "rule_type": "REQUIRE_HUMAN_REVIEW", "params": {"if_bias_over": 0.5, "if_confidence_below": 0.2}},
+    {"id": "off", "rule_type": "MAX_BIAS", "params": {"max_bias": 0.0}, "enabled": False},
+]
+
+
+def _rows(evaluate_payload, count: int):
+    rng = random.Random(43)
+    for index in range(count):
+        yield evaluate_payload(
+            "replay-tenant",
+            prompt=f"question {index}",
+            answer="this is forbidden" if index % 17 == 0 else f"answer {index}",
+            sources=[
+                {"id": f"d{n}", "title": "t", "snippet": "s", "score": 0.5} for n in range(rng.randint(0, 3))
+            ],
+            confidence=round(rng.random(), 3),
+            bias_score=round(rng.random(), 3),
+            consistency_score=round(rng.random(), 3),
+            evidence_flags=["unsupported_claim"] * rng.choice([0, 0, 0, 1, 2]),
+        )
+
+
+def _expected(rows, policy_mode: str = "enforce"):
+    statuses: Counter = Counter()
+    rule_hits: Counter = Counter()
+    policy_hits: Counter = Counter()
+    for row in rows:
+        status, _, hits = evaluate_policies(
+            POLICIES,
+            row["prompt"],
+            row["answer"],
+            row["confidence"],
+            row["bias_score"],
+            len(row["sources"]),
+            row["consistency_score"],
+            row["evidence_flags"],
+        )
+        if policy_mode == "advisory" and status == "rejected":
+            status = "pending"
+        statuses[status] += 1
+        for hit in hits:
+            rule_hits[hit["rule"]] += 1
+            policy_hits[hit["policy_id"]] += 1
+    return statuses, dict(rule_hits), dict(policy_hits)
+
+
+def test_replay_matches_evaluate_policies(client, evaluate_payload):
+    rows = list(_rows(evaluate_payload, 300))
+    for row in rows:
+        assert client.post("/evaluate", json=row).status_code == 200
+
+    history = load_history(engine, "replay-tenant", None, None, with_text=True)
+    assert len(history) == len(rows)
+
+    for policy_mode in ("enforce", "advisory"):
+        statuses, rule_hits, policy_hits = _expected(rows, policy_mode)
+        report = replay(POLICIES, history, policy_mode)
+        assert report["replayed"] == {name: statuses[name] for name in ("approved", "pending", "rejected")}
+        assert report["rule_hits"] == rule_hits
+        assert report["policy_hits"] == policy_hits
+
+
+def test_replay_endpoint_reports_changes_against_history(client, evaluate_payload):
+    tenant = "replay-endpoint"
+    for confidence in (0.1, 0.3, 0.6, 0.9):
+        assert client.post("/evaluate", json=evaluate_payload(tenant, confidence=confidence)).status_code == 200
+
+    response = client.post(
+        "/policies/replay",
+        json={
+            "tenant_id": tenant,
+            "policies": [{"rule_type": "REQUIRE_CONFIDENCE", "params": {"min_confidence": 0.5}}],
+        },
+    )
+    assert response.status_code == 200
+    report = response.json()
+    # The defaults hold only confidence < 0.25, the candidate everything below 0.5.
+    assert report["baseline"] == {"approved": 3, "pending": 1, "rejected": 0}
+    assert report["replayed"] == {"approved": 2, "pending": 2, "rejected": 0}
+    assert report["transitions"] == {"approved->pending": 1}
+    assert report["policy_hits"] == {"candidate-0": 2}
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db import engine
+from app.models import Decision
+from app.review import backfill_review_rank, resolve
+
+
+def _pending(client, evaluate_payload, tenant_id: str, **overrides) -> str:
+    # Confidence below the default 0.25 threshold sends the decision to review.
+    response = client.post("/evaluate", json=evaluate_payload(tenant_id, confidence=0.1, **overrides))
+    assert response.json()["status"] == "pending"
+    return response.json()["decision_id"]
+
+
+def test_queue_puts_severe_items_ahead_of_older_ones(client, evaluate_payload):
+    mild = _pending(client, evaluate_payload, "review-order", bias_score=0.0)
+    severe = _pending(client, evaluate_payload, "review-order", bias_score=0.95)
+    queue = client.get("/review/queue", params={"tenant_id": "review-order"}).json()
+    assert [item["decision_id"] for item in queue] == [severe, mild]
+
+
+def test_claims_never_hand_out_the_same_item_twice(client, evaluate_payload):
+    ids = {_pending(client, evaluate_payload, "review-claim") for _ in range(3)}
+    first = client.post("/review/claim", json={"tenant_id": "review-claim", "reviewer": "alice", "limit": 2}).json()
+    second = client.post("/review/claim", json={"tenant_id": "review-claim", "reviewer": "bob", "limit": 2}).json()
+    third = client.post("/review/claim", json={"tenant_id": "review-claim", "reviewer": "carol"}).json()
+
+    first_ids = {item["decision_id"] for item in first}
+    second_ids = {item["decision_id"] for item in second}
+    assert len(first_ids) == 2 and len(second_ids) == 1
+    assert first_ids | second_ids == ids
+    assert third == []
+    assert all(item["claimed_by"] == "alice" for item in first)
+    assert client.get("/review/queue", params={"tenant_id": "review-claim"}).json() == []
+
+
+def test_only_the_lease_holder_renews_or_releases(client, evaluate_payload):
+    decision_id = _pending(client, evaluate_payload, "review-lease")
+    client.post("/review/claim", json={"tenant_id": "review-lease", "reviewer": "alice"})
+
+    assert client.post(f"/review/{decision_id}/renew", json={"reviewer": "bob"}).status_code == 409
+    assert client.post(f"/review/{decision_id}/release", json={"reviewer": "bob"}).status_code == 409
+    renewed = client.post(f"/review/{decision_id}/renew", json={"reviewer": "alice", "lease_s": 600})
+    assert renewed.status_code == 200
+    assert renewed.json()["claimed_by"] == "alice"
+
+    released = client.post(f"/review/{decision_id}/release", json={"reviewer": "alice"})
+    assert released.status_code == 200 and released.json()["claimed_by"] is None
+    queue = client.get("/review/queue", params={"tenant_id": "review-lease"}).json()
+    assert [item["decision_id"] for item in queue] == [decision_id]
+
+
+def test_another_reviewer_cannot_decide_a_claimed_item(client, evaluate_payload):
+    decision_id = _pending(client, evaluate_payload, "review-decide")
+    client.post("/review/claim", json={"tenant_id": "review-decide", "reviewer": "alice"})
+
+    blocked = client.post(f"/decisions/{decision_id}", json={"status": "approved", "reviewer": "bob"})
+    assert blocked.status_code == 409
+    assert "alice" in blocked.json()["detail"]
+
+    decided = client.post(f"/decisions/{decision_id}", json={"status": "approved", "reviewer": "alice"})
+    assert decided.status_code == 200
+    detail = client.get(f"/decisions/{decision_id}/detail").json()
+    assert detail["decision"]["status"] == "approved"
+
+
+def test_a_claim_taken_after_the_read_is_not_overwritten(client, evaluate_payload):
+    decision_id = _pending(client, evaluate_payload, "review-race")
+    with Session(engine) as db:
+        stale = db.get(Decision, decision_id)
+        assert stale.claimed_by is None
+        # Bob claims the item between alice's read and her write.
+        client.post("/review/claim", json={"tenant_id": "review-race", "reviewer": "bob"})
+        assert not resolve(db, stale, "alice", "approved", "")
+        db.rollback()
+
+    with Session(engine) as db:
+        row = db.get(Decision, decision_id)
+        assert (row.status, row.claimed_by) == ("pending", "bob")
+    totals = client.get("/analytics/decisions", params={"tenant_id": "review-race"}).json()["totals"]
+    assert totals["status"] == {"pending": 1}
+
+
+def test_an_expired_lease_returns_the_item_to_the_queue(client, evaluate_payload):
+    decision_id = _pending(client, evaluate_payload, "review-expiry")
+    client.post("/review/claim", json={"tenant_id": "review-expiry", "reviewer": "alice"})
+    with engine.begin() as conn:
+        conn.execute(
+            update(Decision)
+            .where(Decision.id == decision_id)
+            .values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+
+    claimed = client.post("/review/claim", json={"tenant_id": "review-expiry", "reviewer": "bob"}).json()
+    assert [item["decision_id"] for item in claimed] == [decision_id]
+    assert client.post(f"/decisions/{decision_id}", json={"status": "rejected", "reviewer": "alice"}).status_code == 409
+
+
+def test_backfill_ranks_decisions_that_predate_review_rank(client, evaluate_payload):
+    old = _pending(client, evaluate_payload, "review-backfill", bias_score=0.0)
+    new = _pending(client, evaluate_payload, "review-backfill", bias_score=0.0)
+    with engine.begin() as conn:
+        conn.execute(
+            update(Decision)
+            .where(Decision.id == old)
+            .values(review_rank=None, priority=None, created_at=datetime.utcnow() - timedelta(days=1))
+        )
+
+    assert backfill_review_rank(engine) == 1
+    queue = client.get("/review/queue", params={"tenant_id": "review-backfill"}).json()
+    assert [item["decision_id"] for item in queue] == [old, new]
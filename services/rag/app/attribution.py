@@ -0,0 +1,71 @@
+import re
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+METHOD = "sentence_alignment"
+# Sentences whose best source similarity falls below this are reported as unsupported.
+SUPPORT_THRESHOLD = 0.3
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def align_sentences(embedder: Any, answer: str, sources: Sequence[Any]) -> Dict[str, Any]:
+    """Attribute each answer sentence to the source passages it is closest to.
+
+    Sentences and snippets are embedded in one batch with the retrieval
+    embedder; a source's importance is its share of the positive similarity
+    mass across all sentences.
+    """
+    sentences = split_sentences(answer)
+    if not sentences or not sources:
+        return {"method": METHOD, "sentences": [], "sources": [], "unsupported": list(range(len(sentences)))}
+
+    vectors = np.asarray(embedder.embed_documents(sentences + [s.snippet for s in sources]), dtype=np.float32)
+    vectors = _normalise(vectors)
+    similarity = vectors[: len(sentences)] @ vectors[len(sentences) :].T
+    best = similarity.argmax(axis=1)
+
+    sentence_rows = []
+    unsupported = []
+    for index, sentence in enumerate(sentences):
+        top = int(best[index])
+        score = float(similarity[index, top])
+        if score < SUPPORT_THRESHOLD:
+            unsupported.append(index)
+        sentence_rows.append(
+            {
+                "index": index,
+                "text": sentence,
+                "best_source": sources[top].id,
+                "score": round(score, 4),
+                "scores": {source.id: round(float(similarity[index, j]), 4) for j, source in enumerate(sources)},
+            }
+        )
+
+    mass = np.clip(similarity, 0.0, None).sum(axis=0)
+    total = float(mass.sum()) or 1.0
+    source_rows = [
+        {
+            "id": source.id,
+            "title": source.title,
+            "importance": round(float(mass[j]) / total, 4),
+            "mean_similarity": round(float(similarity[:, j].mean()), 4),
+            "supported_sentences": int(
+                sum(1 for i in range(len(sentences)) if best[i] == j and similarity[i, j] >= SUPPORT_THRESHOLD)
+            ),
+        }
+        for j, source in enumerate(sources)
+    ]
+    source_rows.sort(key=lambda row: row["importance"], reverse=True)
+    return {"method": METHOD, "sentences": sentence_rows, "sources": source_rows, "unsupported": unsupported}
@@ -1,9 +1,41 @@
+from typing import Any, Dict, List
 from pydantic import BaseModel
+import json
 import os
 
 class Settings(BaseModel):
     rag_port: int = int(os.getenv("RAG_PORT", "8001"))
+    rag_host: str = os.getenv("RAG_HOST", "0.0.0.0")
+    # app.serve forks this many workers after loading the models once; above 1
+    # the index is shared read-only and /ingest is disabled.
+    workers: int = int(os.getenv("RAG_WORKERS", "1"))
+    worker_threads: int = int(os.getenv("RAG_WORKER_THREADS", "0"))  # 0: cpu count / workers
+    # Sharded retrieval: each instance indexes only the documents that hash to
+    # shard_index out of shard_count. An instance with shard_urls (one per shard,
+    # in index order; its own entry is ignored) also queries the other shards.
+    shard_index: int = int(os.getenv("RAG_SHARD_INDEX", "0"))
+    shard_count: int = int(os.getenv("RAG_SHARD_COUNT", "1"))
+    shard_urls: List[str] = json.loads(os.getenv("RAG_SHARD_URLS") or "[]")
+    shard_timeout_s: float = float(os.getenv("RAG_SHARD_TIMEOUT_S", "0.5"))
+    # Chunk text is kept in one packed buffer; with a path it is written to
+    # that file and memory-mapped instead of held on the heap.
+    docstore_path: str = os.getenv("RAG_DOCSTORE_PATH", "")
     embed_model: str = os.getenv("HF_EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
     gen_model: str = os.getenv("HF_GEN_MODEL", "distilgpt2")
+    # Speculative decoding: a small model sharing gen_model's tokenizer proposes
+    # draft_tokens tokens that gen_model verifies in one pass. Empty disables it.
+    draft_model: str = os.getenv("HF_DRAFT_MODEL", "")
+    draft_tokens: int = int(os.getenv("RAG_DRAFT_TOKENS", "5"))
+    draft_schedule: str = os.getenv("RAG_DRAFT_SCHEDULE", "heuristic")
+    draft_verify: bool = os.getenv("RAG_DRAFT_VERIFY", "true").lower() == "true"
+    # Generation budget: base + per_word * question words, clamped to [min, max].
+    max_new_tokens: int = int(os.getenv("RAG_MAX_NEW_TOKENS", "120"))
+    min_new_tokens: int = int(os.getenv("RAG_MIN_NEW_TOKENS", "32"))
+    base_new_tokens: int = int(os.getenv("RAG_BASE_NEW_TOKENS", "48"))
+    new_tokens_per_word: int = int(os.getenv("RAG_NEW_TOKENS_PER_WORD", "4"))
+    stop_sequences: List[str] = json.loads(os.getenv("RAG_STOP_SEQUENCES") or '["Question:", "Sources:"]')
+    max_sentences: int = int(os.getenv("RAG_MAX_SENTENCES", "4"))
+    stop_at_newline: bool = os.getenv("RAG_STOP_AT_NEWLINE", "false").lower() == "true"
+    tenant_generation: Dict[str, Dict[str, Any]] = json.loads(os.getenv("RAG_TENANT_GENERATION") or "{}")
 
 settings = Settings()
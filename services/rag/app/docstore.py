@@ -0,0 +1,101 @@
+import mmap
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class StringColumn:
+    """Strings packed end to end as UTF-8 with an offset array.
+
+    One bytes buffer plus 8 bytes of offset per row, instead of a str object
+    per row. With a path, the bytes are appended to that file and read
+    through a shared read-only mmap, so they live in the page cache rather
+    than on the heap and forked workers share them.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.offsets = array("q", [0])
+        self.path = path
+        self._buffer = bytearray()
+        self._file = open(path, "w+b") if path else None
+        self._map: mmap.mmap | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def extend(self, values: Iterable[str]) -> None:
+        chunk = bytearray()
+        ends = []
+        end = self.offsets[-1]
+        for value in values:
+            encoded = value.encode("utf-8")
+            chunk += encoded
+            end += len(encoded)
+            ends.append(end)
+        if self._file is not None:
+            self._file.write(chunk)
+            self._file.flush()
+            # Readers keep whichever map they already hold; the next read maps the new size.
+            self._map = None
+        else:
+            self._buffer += chunk
+        self.offsets.extend(ends)
+
+    def _data(self):
+        if self._file is None:
+            return self._buffer
+        data = self._map
+        if data is None and self.offsets[-1]:
+            data = self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return data
+
+    def get(self, row: int, max_chars: int | None = None) -> str:
+        start, end = self.offsets[row], self.offsets[row + 1]
+        if max_chars is not None:
+            # A character is at most 4 UTF-8 bytes; only decode what the prefix can need.
+            end = min(end, start + 4 * max_chars)
+        data = self._data()
+        text = bytes(data[start:end]).decode("utf-8", errors="ignore") if end > start else ""
+        return text[:max_chars] if max_chars is not None else text
+
+    def nbytes(self) -> int:
+        return self.offsets[-1]
+
+
+class CompactDocstore:
+    """Chunk text and metadata for the vector index, one column per field.
+
+    Row i is the vector at position i in the FAISS index, so lookups need no
+    id mapping and no Document objects.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.ids = StringColumn()
+        self.titles = StringColumn()
+        self.texts = StringColumn(path)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, rows: List[Tuple[str, str, str]]) -> int:
+        """Append (id, title, text) rows; returns the first new row number."""
+        with self._lock:
+            first = len(self)
+            self.ids.extend(row[0] for row in rows)
+            self.titles.extend(row[1] for row in rows)
+            self.texts.extend(row[2] for row in rows)
+        return first
+
+    def row(self, index: int, max_chars: int | None = None) -> Tuple[str, str, str]:
+        return self.ids.get(index), self.titles.get(index), self.texts.get(index, max_chars)
+
+    def stats(self) -> Dict[str, Any]:
+        columns = (self.ids, self.titles, self.texts)
+        return {
+            "documents": len(self),
+            "text_bytes": self.texts.nbytes(),
+            "metadata_bytes": self.ids.nbytes() + self.titles.nbytes(),
+            "offset_bytes": sum(column.offsets.itemsize * len(column.offsets) for column in columns),
+            "text_path": self.texts.path,
+        }
@@ -0,0 +1,85 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Tuple
+
+import torch
+from transformers import StoppingCriteria
+
+from .config import settings
+
+# Sentence end: terminal punctuation, optional closing quote/bracket, then whitespace.
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]?(?=\s)")
+
+
+@dataclass
+class GenerationPlan:
+    max_new_tokens: int
+    stop_sequences: List[str] = field(default_factory=list)
+    max_sentences: int = 0
+    stop_at_newline: bool = False
+
+
+def plan_generation(question: str, tenant_id: str | None, requested: int | None = None) -> GenerationPlan:
+    """Token budget and stop rules for one request.
+
+    The budget grows with the question's length from RAG_MIN_NEW_TOKENS up to
+    the tenant's cap; an explicit request may set it anywhere under the cap.
+    """
+    override = settings.tenant_generation.get(tenant_id or "", {})
+    cap = int(override.get("max_new_tokens", settings.max_new_tokens))
+    budget = settings.base_new_tokens + settings.new_tokens_per_word * len(question.split())
+    budget = min(max(settings.min_new_tokens, budget), cap)
+    if requested:
+        budget = min(requested, cap)
+    return GenerationPlan(
+        max_new_tokens=max(1, budget),
+        stop_sequences=settings.stop_sequences + list(override.get("stop_sequences", [])),
+        max_sentences=int(override.get("max_sentences", settings.max_sentences)),
+        stop_at_newline=bool(override.get("stop_at_newline", settings.stop_at_newline)),
+    )
+
+
+def _cut(text: str, plan: GenerationPlan) -> Tuple[str, str | None]:
+    """Trim text at the first stop condition it meets; returns (text, reason)."""
+    cut, reason = len(text), None
+    for stop in plan.stop_sequences:
+        index = text.find(stop)
+        if 0 <= index < cut:
+            cut, reason = index, "stop_sequence"
+    if plan.stop_at_newline:
+        body = len(text) - len(text.lstrip())
+        index = text.find("\n", body)
+        if 0 <= index < cut:
+            cut, reason = index, "newline"
+    if plan.max_sentences > 0:
+        ends = list(_SENTENCE_END.finditer(text, 0, cut))
+        if len(ends) >= plan.max_sentences:
+            index = ends[plan.max_sentences - 1].end()
+            if index < cut or reason is None:
+                cut, reason = index, "sentences"
+    return text[:cut], reason
+
+
+class StopController(StoppingCriteria):
+    """Stops decoding once the continuation meets one of the plan's stop rules.
+
+    Under assisted decoding several tokens can be accepted at once, so the
+    text may run past the stop point; finish() trims it.
+    """
+
+    def __init__(self, tokenizer: Any, prompt_length: int, plan: GenerationPlan) -> None:
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.plan = plan
+        self.reason: str | None = None
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs: Any) -> torch.BoolTensor:
+        text = self.tokenizer.decode(input_ids[0, self.prompt_length:], skip_special_tokens=True)
+        _, self.reason = _cut(text, self.plan)
+        return torch.full((input_ids.shape[0],), self.reason is not None, dtype=torch.bool, device=input_ids.device)
+
+    def finish(self, text: str, new_tokens: int) -> Tuple[str, str]:
+        text, reason = _cut(text, self.plan)
+        if reason is None:
+            reason = "budget" if new_tokens >= self.plan.max_new_tokens else "eos"
+        return text.strip(), reason
@@ -1,14 +1,28 @@
+import os
 from pathlib import Path
-from fastapi import FastAPI
-from .schemas import GenerateRequest, GenerateResponse, IngestRequest
+from fastapi import FastAPI, HTTPException
+import httpx
+from govai_common.profiling import SamplingMiddleware, router as profiling_router
+from govai_common.wire import WireResponse, WireRoute
+from .schemas import AttributionRequest, AttributionResponse, GenerateRequest, GenerateResponse, IngestRequest, RetrieveRequest
+from .attribution import align_sentences
+from .config import settings
+from .memory import memory_report
 from .rag_pipeline import RagPipeline
+from .shards import shard_of
 
-app = FastAPI(title="GovAI RAG", version="0.1.0")
+app = FastAPI(title="GovAI RAG", version="0.1.0", default_response_class=WireResponse)
+app.router.route_class = WireRoute
+app.add_middleware(SamplingMiddleware)
+app.include_router(profiling_router)
 
 pipeline = RagPipeline()
 
 @app.on_event("startup")
 def load_docs():
+    # app.serve loads the seed documents before forking workers.
+    if pipeline.seeded:
+        return
     data_path = Path(__file__).resolve().parent / "data" / "sample_docs.jsonl"
     pipeline.load_seed_documents(str(data_path))
 
@@ -16,9 +30,45 @@ def load_docs():
 def health():
     return {"status": "ok"}
 
+@app.get("/stats/decoding")
+def decoding_stats():
+    return pipeline.decode_stats.snapshot()
+
+@app.get("/stats/memory")
+def memory_stats():
+    worker = os.getenv("RAG_WORKER_INDEX")
+    report = memory_report(int(worker) if worker else None, settings.workers > 1)
+    report["docstore"] = pipeline.docstore.stats()
+    return report
+
+@app.get("/stats/shards")
+def shard_stats():
+    return {
+        "shard_index": settings.shard_index,
+        "shard_count": settings.shard_count,
+        "documents": len(pipeline.docstore),
+        "coordinator": pipeline.shards.snapshot() if pipeline.shards is not None else None,
+    }
+
+@app.post("/retrieve")
+def retrieve(req: RetrieveRequest):
+    # Searches this instance's shard only and returns raw L2 distances, which
+    # compare across shards; the coordinator merges them.
+    if req.embedding is None and not req.query:
+        raise HTTPException(status_code=422, detail="query or embedding is required")
+    vector = req.embedding if req.embedding is not None else pipeline.embedder.embed_query(req.query)
+    hits = pipeline.nearest(vector, req.top_k)
+    return {
+        "shard": settings.shard_index,
+        "hits": [
+            {"id": doc_id, "title": title, "snippet": snippet, "distance": distance}
+            for distance, doc_id, title, snippet in hits
+        ],
+    }
+
 @app.post("/generate", response_model=GenerateResponse)
 def generate(req: GenerateRequest):
-    answer, sources, confidence, model_id, evidence = pipeline.generate_answer(req.prompt, req.top_k)
+    answer, sources, confidence, model_id, evidence = pipeline.generate_answer(req.prompt, req.top_k, req.tenant_id, req.max_new_tokens)
     return {
         "answer": answer,
         "sources": [s.__dict__ for s in sources],
@@ -29,5 +79,23 @@ def generate(req: GenerateRequest):
 
 @app.post("/ingest")
 def ingest(req: IngestRequest):
+    if settings.workers > 1:
+        # Each worker holds a copy-on-write view of the index; adding to one
+        # would leave the others stale and unshare the pages.
+        raise HTTPException(status_code=409, detail="Ingest is disabled when RAG_WORKERS > 1")
+    if not pipeline.owns(req.id):
+        owner = shard_of(req.id, settings.shard_count)
+        if pipeline.shards is None or owner not in pipeline.shards.urls:
+            raise HTTPException(status_code=409, detail=f"Document {req.id} belongs to shard {owner}")
+        try:
+            return pipeline.shards.forward(owner, "/ingest", req.model_dump())
+        except httpx.HTTPError as exc:
+            raise HTTPException(status_code=502, detail=f"Shard {owner} ingest failed: {exc.__class__.__name__}")
     pipeline.add_document(req.id, req.title, req.text)
-    return {"status": "ingested", "id": req.id}
+    return {"status": "ingested", "id": req.id, "shard": settings.shard_index}
+
+@app.post("/attribution", response_model=AttributionResponse)
+def attribution(req: AttributionRequest):
+    # Called by the gateway in the background after a decision is recorded,
+    # never on the /generate path.
+    return {"decision_id": req.decision_id, **align_sentences(pipeline.embedder, req.answer, req.sources)}
@@ -0,0 +1,66 @@
+import os
+from typing import Any, Dict, List
+
+_ROLLUP_FIELDS = {
+    "Rss": "rss_kb",
+    "Pss": "pss_kb",
+    "Shared_Clean": "shared_clean_kb",
+    "Shared_Dirty": "shared_dirty_kb",
+    "Private_Clean": "private_clean_kb",
+    "Private_Dirty": "private_dirty_kb",
+}
+
+
+def process_memory(pid: int) -> Dict[str, Any]:
+    """RSS/PSS breakdown for pid from /proc (Linux only).
+
+    PSS splits shared pages between the processes mapping them, so summing it
+    over the workers gives the real footprint where summing RSS double counts
+    the weights they share.
+    """
+    usage: Dict[str, Any] = {"pid": pid}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r", encoding="utf-8") as handle:
+            for line in handle:
+                name, _, rest = line.partition(":")
+                if name in _ROLLUP_FIELDS:
+                    usage[_ROLLUP_FIELDS[name]] = int(rest.split()[0])
+    except OSError:
+        try:
+            with open(f"/proc/{pid}/status", "r", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.startswith("VmRSS:"):
+                        usage["rss_kb"] = int(line.split()[1])
+        except OSError:
+            usage["error"] = "unavailable"
+    return usage
+
+
+def _parent_of(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/stat", "r", encoding="utf-8") as handle:
+            # The command name may contain spaces; fields resume after its ')'.
+            return int(handle.read().rsplit(")", 1)[1].split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def sibling_pids() -> List[int]:
+    """Worker processes forked by the same serve.py supervisor as this one."""
+    parent = os.getppid()
+    pids = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit() and _parent_of(int(entry)) == parent:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def memory_report(worker_index: int | None, shared_mode: bool) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"worker": worker_index, "self": process_memory(os.getpid())}
+    if shared_mode:
+        workers = [process_memory(pid) for pid in sibling_pids()]
+        report["workers"] = workers
+        report["supervisor"] = process_memory(os.getppid())
+        report["total_rss_kb"] = sum(w.get("rss_kb", 0) for w in workers)
+        report["total_pss_kb"] = sum(w.get("pss_kb", 0) for w in workers) + report["supervisor"].get("pss_kb", 0)
+    return report
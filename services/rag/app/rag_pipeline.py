@@ -1,17 +1,26 @@
 from __future__ import annotations
 
 import json
-from typing import Dict
+import threading
+import time
+from typing import Any, Dict
 from dataclasses import dataclass
 from typing import List, Tuple
 
-from langchain_community.vectorstores import FAISS
 from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain.schema import Document
+import faiss
 import numpy as np
-from transformers import pipeline
+import torch
+from transformers import StoppingCriteriaList, pipeline
 
 from .config import settings
+from .docstore import CompactDocstore
+from .generation import GenerationPlan, StopController, plan_generation
+from .shards import Hit, ShardCoordinator, shard_of
+from .speculative import DecodeStats, load_draft_model, verify_draft
+
+SNIPPET_CHARS = 240
+SEED_BATCH = 256
 
 @dataclass
 class RagSource:
@@ -23,54 +32,98 @@ class RagSource:
 class RagPipeline:
     def __init__(self) -> None:
         self.embedder = HuggingFaceEmbeddings(model_name=settings.embed_model)
-        self.vectorstore = None
+        # Row i of the docstore is vector i of the index.
+        self.index: faiss.IndexFlatL2 | None = None
+        self.docstore = CompactDocstore(settings.docstore_path or None)
+        # Guards the index and docstore together: FAISS does not allow search
+        # while an add is running, and a row must be read back whole.
+        self._index_lock = threading.Lock()
+        self.seeded = False
+        self.shards = None
+        if settings.shard_urls:
+            if len(settings.shard_urls) != settings.shard_count:
+                raise ValueError("RAG_SHARD_URLS must list one URL per shard (RAG_SHARD_COUNT)")
+            self.shards = ShardCoordinator(settings.shard_urls, settings.shard_index, settings.shard_timeout_s)
         self.generator = pipeline("text-generation", model=settings.gen_model)
+        self.draft_model = load_draft_model(self.generator.model) if settings.draft_model else None
+        self.decode_stats = DecodeStats(self.generator.model, self.draft_model)
+        if self.draft_model is not None and settings.draft_verify:
+            if not verify_draft(self._generate):
+                self.draft_model = None
+                self.decode_stats.active = False
+            self.decode_stats.reset()
 
     def load_seed_documents(self, path: str) -> None:
-        docs = []
+        # Embedded and stored in batches so a large seed file never exists as
+        # one list of Python objects.
+        batch: List[Tuple[str, str, str]] = []
         with open(path, "r", encoding="utf-8") as handle:
             for line in handle:
                 if not line.strip():
                     continue
                 payload = json.loads(line)
-                docs.append(
-                    Document(
-                        page_content=payload["text"],
-                        metadata={"id": payload["id"], "title": payload["title"]},
-                    )
-                )
-        if docs:
-            self.vectorstore = FAISS.from_documents(docs, self.embedder)
+                if not self.owns(payload["id"]):
+                    continue
+                batch.append((payload["id"], payload["title"], payload["text"]))
+                if len(batch) >= SEED_BATCH:
+                    self._add(batch)
+                    batch = []
+        if batch:
+            self._add(batch)
+        self.seeded = True
+
+    def owns(self, doc_id: str) -> bool:
+        return shard_of(doc_id, settings.shard_count) == settings.shard_index
+
+    def _add(self, rows: List[Tuple[str, str, str]]) -> None:
+        vectors = np.asarray(self.embedder.embed_documents([row[2] for row in rows]), dtype=np.float32)
+        with self._index_lock:
+            if self.index is None:
+                self.index = faiss.IndexFlatL2(vectors.shape[1])
+            self.docstore.add(rows)
+            self.index.add(vectors)
 
     def add_document(self, doc_id: str, title: str, text: str) -> None:
-        document = Document(page_content=text, metadata={"id": doc_id, "title": title})
-        if self.vectorstore is None:
-            self.vectorstore = FAISS.from_documents([document], self.embedder)
-        else:
-            self.vectorstore.add_documents([document])
+        self._add([(doc_id, title, text)])
 
     def _score_to_confidence(self, score: float) -> float:
         # FAISS returns distance-like scores; convert to a bounded confidence
         return 1.0 / (1.0 + max(score, 0.0))
 
+    def nearest(self, vector: List[float], k: int) -> List[Hit]:
+        """Nearest chunks in this instance's own index, with raw L2 distances."""
+        query = np.asarray([vector], dtype=np.float32)
+        hits = []
+        # Searches are serialised with adds and each other. A flat-index search
+        # is short next to embedding the query, which stays outside the lock.
+        with self._index_lock:
+            if self.index is None:
+                return []
+            distances, rows = self.index.search(query, k)
+            for distance, row in zip(distances[0], rows[0]):
+                if row < 0:
+                    continue
+                doc_id, title, snippet = self.docstore.row(int(row), SNIPPET_CHARS)
+                hits.append((float(distance), doc_id, title, snippet))
+        return hits
+
+    def _retrieve(self, query: str, top_k: int) -> Tuple[List[RagSource], Dict[str, Any] | None]:
+        if self.shards is None:
+            if self.index is None:
+                return [], None
+            hits, report = self.nearest(self.embedder.embed_query(query), top_k), None
+        else:
+            # Embed once here and send the vector, so shards only search.
+            vector = self.embedder.embed_query(query)
+            hits, report = self.shards.search(vector, top_k, lambda: self.nearest(vector, top_k))
+        sources = [
+            RagSource(id=doc_id, title=title, snippet=snippet, score=round(self._score_to_confidence(distance), 4))
+            for distance, doc_id, title, snippet in hits
+        ]
+        return sources, report
+
     def retrieve(self, query: str, top_k: int) -> List[RagSource]:
-        if self.vectorstore is None:
-            return []
-
-        results: List[Tuple[Document, float]] = self.vectorstore.similarity_search_with_score(query, k=top_k)
-        sources = []
-        for doc, score in results:
-            confidence = self._score_to_confidence(score)
-            snippet = doc.page_content[:240]
-            sources.append(
-                RagSource(
-                    id=str(doc.metadata.get("id")),
-                    title=str(doc.metadata.get("title")),
-                    snippet=snippet,
-                    score=round(confidence, 4),
-                )
-            )
-        return sources
+        return self._retrieve(query, top_k)[0]
 
     def _cosine_sim(self, a: np.ndarray, b: np.ndarray) -> float:
         denom = (np.linalg.norm(a) * np.linalg.norm(b)) or 1.0
@@ -104,8 +157,38 @@ class RagPipeline:
             "flags": flags,
         }
 
-    def generate_answer(self, prompt: str, top_k: int) -> Tuple[str, List[RagSource], float, str, Dict[str, float | list[str]]]:
-        sources = self.retrieve(prompt, top_k)
+    def _generate(
+        self, composed: str, plan: GenerationPlan | None = None, assisted: bool = True
+    ) -> Tuple[str, str]:
+        """Greedy decode of the continuation only; returns (text, stop reason).
+
+        With a draft model loaded, decoding is assisted.
+        """
+        plan = plan or GenerationPlan(max_new_tokens=32)
+        tokenizer = self.generator.tokenizer
+        inputs = tokenizer(composed, return_tensors="pt")
+        prompt_length = inputs["input_ids"].shape[1]
+        controller = StopController(tokenizer, prompt_length, plan)
+        options = {
+            "max_new_tokens": plan.max_new_tokens,
+            "do_sample": False,
+            "pad_token_id": tokenizer.eos_token_id,
+            "stopping_criteria": StoppingCriteriaList([controller]),
+        }
+        if assisted and self.draft_model is not None:
+            options["assistant_model"] = self.draft_model
+        started = time.perf_counter()
+        with torch.inference_mode(), self.decode_stats.track() as tracked:
+            output = self.generator.model.generate(**inputs, **options)
+        new_tokens = output[0, prompt_length:]
+        text, reason = controller.finish(tokenizer.decode(new_tokens, skip_special_tokens=True), len(new_tokens))
+        self.decode_stats.record(tracked, len(new_tokens), time.perf_counter() - started, plan.max_new_tokens, reason)
+        return text, reason
+
+    def generate_answer(
+        self, prompt: str, top_k: int, tenant_id: str | None = None, max_new_tokens: int | None = None
+    ) -> Tuple[str, List[RagSource], float, str, Dict[str, float | list[str]]]:
+        sources, retrieval = self._retrieve(prompt, top_k)
         context = "\n".join([f"- {s.title}: {s.snippet}" for s in sources])
         composed = (
             "You are a governance-aware assistant. Use the sources to answer the question. "
@@ -113,8 +196,7 @@ class RagPipeline:
             f"Sources:\n{context}\n\n"
             f"Question: {prompt}\nAnswer:"
         )
-        output = self.generator(composed, max_new_tokens=120, do_sample=False)
-        text = output[0]["generated_text"].split("Answer:")[-1].strip()
+        text, _ = self._generate(composed, plan_generation(prompt, tenant_id, max_new_tokens))
 
         if sources:
             confidence = round(sum(s.score for s in sources) / len(sources), 4)
@@ -122,4 +204,7 @@ class RagPipeline:
             confidence = 0.0
 
         evidence = self._evidence_check(text, sources)
+        if retrieval and retrieval["partial"]:
+            # Some shards missed the deadline: the answer may lack better sources.
+            evidence["flags"].append("partial_retrieval")
         return text, sources, confidence, settings.gen_model, evidence
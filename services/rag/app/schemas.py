@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List
 from pydantic import BaseModel, ConfigDict
 
 
@@ -10,6 +10,13 @@ class GenerateRequest(BaseSchema):
     user_id: str
     prompt: str
     top_k: int = 4
+    max_new_tokens: int | None = None
+
+class RetrieveRequest(BaseSchema):
+    query: str | None = None
+    # Coordinators send the query embedding so shards skip re-embedding it.
+    embedding: List[float] | None = None
+    top_k: int = 4
 
 class Source(BaseSchema):
     id: str
@@ -33,3 +40,15 @@ class IngestRequest(BaseSchema):
     id: str
     title: str
     text: str
+
+class AttributionRequest(BaseSchema):
+    decision_id: str
+    answer: str
+    sources: List[Source]
+
+class AttributionResponse(BaseSchema):
+    decision_id: str
+    method: str
+    sentences: List[Dict[str, Any]]
+    sources: List[Dict[str, Any]]
+    unsupported: List[int]
@@ -0,0 +1,123 @@
+"""Serve RAG from several worker processes that share one copy of the models.
+
+    python -m app.serve
+
+The supervisor loads the embedder, generator and vector index once, freezes
+the heap, binds the listening socket and forks RAG_WORKERS children that each
+run their own uvicorn server on the inherited socket. Model weights and the
+index are never written after loading, so the children keep sharing the
+parent's pages instead of holding a copy each; `GET /stats/memory` shows the
+per-worker RSS/PSS. Crashed workers are re-forked from the loaded parent.
+"""
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+from .config import settings
+
+logger = logging.getLogger("govai.rag.serve")
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(index: int, sock: socket.socket, threads: int) -> None:
+    import torch
+    import uvicorn
+
+    from . import main
+
+    os.environ["RAG_WORKER_INDEX"] = str(index)
+    torch.set_num_threads(threads)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(main.app, log_level="info", lifespan="on"))
+    server.run(sockets=[sock])
+
+
+def _spawn(index: int, sock: socket.socket) -> int:
+    threads = settings.worker_threads or max(1, (os.cpu_count() or 1) // max(1, settings.workers))
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(index, sock, threads)
+        except BaseException:
+            logger.exception("RAG worker %d failed", index)
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    workers = max(1, settings.workers)
+    if workers == 1:
+        import uvicorn
+
+        uvicorn.run("app.main:app", host=settings.rag_host, port=settings.rag_port)
+        return
+
+    # Forked children must not inherit live thread pools: keep the parent's
+    # intra-op pool at one thread and tokenizers single-threaded while loading.
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    import torch
+
+    torch.set_num_threads(1)
+    from . import main as rag_main
+
+    rag_main.load_docs()
+    # Move everything loaded so far out of the collector's reach so gc passes
+    # in the workers do not touch (and copy) the shared pages.
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(settings.rag_host, settings.rag_port)
+    children: Dict[int, int] = {}
+    for index in range(workers):
+        children[_spawn(index, sock)] = index
+    logger.info("RAG serving on %s:%d with %d workers", settings.rag_host, settings.rag_port, workers)
+
+    stopping = False
+
+    def _stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if index is None or stopping:
+            continue
+        logger.warning("RAG worker %d (pid %d) exited with %d; restarting", index, pid, os.waitstatus_to_exitcode(status))
+        time.sleep(1)
+        children[_spawn(index, sock)] = index
+    sock.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import heapq
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+MSGPACK = "application/msgpack"
+INGEST_TIMEOUT_S = 30.0
+
+# (distance, id, title, snippet): FAISS L2 distances, lower is closer.
+Hit = Tuple[float, str, str, str]
+
+
+def shard_of(doc_id: str, count: int) -> int:
+    """Stable shard for a document; crc32 so every process agrees on it."""
+    return zlib.crc32(doc_id.encode("utf-8")) % count if count > 1 else 0
+
+
+class ShardCoordinator:
+    """Scatters a query vector to every shard and merges the nearest hits.
+
+    The local index answers for this instance's own shard while the others
+    are queried over HTTP in parallel. Shards that fail or miss the deadline
+    are left out and the result is marked partial rather than failing the
+    request.
+    """
+
+    def __init__(self, urls: List[str], own_index: int, timeout_s: float) -> None:
+        self.urls = {index: url.rstrip("/") for index, url in enumerate(urls) if index != own_index and url}
+        self.own_index = own_index
+        self.timeout_s = timeout_s
+        self._client: httpx.Client | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.partial = 0
+        self.failures: Dict[int, Dict[str, int]] = {index: {"timeout": 0, "error": 0} for index in self.urls}
+
+    def _resources(self) -> Tuple[httpx.Client, ThreadPoolExecutor]:
+        # Created on first use in each process: app.serve forks workers after
+        # loading, and neither threads nor pooled connections survive a fork.
+        with self._lock:
+            if self._pid != os.getpid():
+                self._client = httpx.Client(
+                    limits=httpx.Limits(max_connections=8 * len(self.urls), max_keepalive_connections=8 * len(self.urls))
+                )
+                self._pool = ThreadPoolExecutor(max_workers=max(1, 4 * len(self.urls)), thread_name_prefix="rag-shard")
+                self._pid = os.getpid()
+        return self._client, self._pool
+
+    def _query(self, client: httpx.Client, url: str, vector: List[float], k: int) -> List[Hit]:
+        payload = {"embedding": vector, "top_k": k}
+        if msgpack is not None:
+            response = client.post(
+                f"{url}/retrieve",
+                content=msgpack.packb(payload),
+                headers={"content-type": MSGPACK, "accept": MSGPACK},
+                timeout=self.timeout_s,
+            )
+        else:
+            response = client.post(f"{url}/retrieve", json=payload, timeout=self.timeout_s)
+        response.raise_for_status()
+        if response.headers.get("content-type", "").startswith(MSGPACK):
+            body = msgpack.unpackb(response.content)
+        else:
+            body = response.json()
+        return [(hit["distance"], hit["id"], hit["title"], hit["snippet"]) for hit in body["hits"]]
+
+    def search(self, vector: List[float], k: int, local: Callable[[], List[Hit]]) -> Tuple[List[Hit], Dict[str, Any]]:
+        """Global top-k over all shards; returns (hits, report)."""
+        client, pool = self._resources()
+        started = time.monotonic()
+        futures = {pool.submit(self._query, client, url, vector, k): index for index, url in self.urls.items()}
+        hits: List[Hit] = list(local())
+        done, pending = wait(futures, timeout=max(0.0, self.timeout_s - (time.monotonic() - started)))
+        missing: Dict[int, str] = {}
+        for future in pending:
+            future.cancel()
+            missing[futures[future]] = "timeout"
+        for future in done:
+            try:
+                hits.extend(future.result())
+            except (httpx.HTTPError, KeyError, ValueError) as exc:
+                missing[futures[future]] = "timeout" if isinstance(exc, httpx.TimeoutException) else "error"
+        # Searches run concurrently from request threads; count under the lock.
+        with self._lock:
+            self.queries += 1
+            if missing:
+                self.partial += 1
+            for index, kind in missing.items():
+                self.failures[index][kind] += 1
+        report = {
+            "shards": len(self.urls) + 1,
+            "answered": len(self.urls) + 1 - len(missing),
+            "missing": sorted(missing),
+            "partial": bool(missing),
+            "latency_ms": round((time.monotonic() - started) * 1000, 2),
+        }
+        return heapq.nsmallest(k, hits, key=lambda hit: hit[0]), report
+
+    def forward(self, index: int, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a write (e.g. /ingest) to the shard that owns the document."""
+        client, _ = self._resources()
+        response = client.post(f"{self.urls[index]}{path}", json=payload, timeout=INGEST_TIMEOUT_S)
+        response.raise_for_status()
+        return response.json()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "own_shard": self.own_index,
+                "remote_shards": {str(index): url for index, url in self.urls.items()},
+                "timeout_s": self.timeout_s,
+                "queries": self.queries,
+                "partial": self.partial,
+                "failures": {str(index): dict(counts) for index, counts in self.failures.items()},
+            }
@@ -0,0 +1,126 @@
+import logging
+import threading
+from contextlib import contextmanager
+from collections import Counter
+from typing import Any, Dict, Iterator
+
+from transformers import AutoModelForCausalLM
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+VERIFY_PROMPT = "Sources:\n- Policy: Access reviews run quarterly.\n\nQuestion: How often are access reviews run?\nAnswer:"
+
+
+def load_draft_model(main_model: Any) -> Any:
+    """Load settings.draft_model as an assistant for main_model.
+
+    Assisted decoding compares token ids, so the draft must share the main
+    model's vocabulary (e.g. distilgpt2 drafting for gpt2-medium).
+    """
+    draft = AutoModelForCausalLM.from_pretrained(settings.draft_model)
+    if draft.config.vocab_size != main_model.config.vocab_size:
+        raise ValueError(
+            f"Draft model {settings.draft_model} has vocab size {draft.config.vocab_size}, "
+            f"{settings.gen_model} has {main_model.config.vocab_size}; they must share a tokenizer"
+        )
+    draft.eval()
+    draft.generation_config.num_assistant_tokens = settings.draft_tokens
+    draft.generation_config.num_assistant_tokens_schedule = settings.draft_schedule
+    return draft
+
+
+class _Tracked:
+    def __init__(self) -> None:
+        self.main_passes = 0
+        self.draft_proposals = 0
+
+
+class DecodeStats:
+    """Acceptance-rate bookkeeping for assisted decoding.
+
+    Forward hooks count main-model passes and draft-model steps for the
+    request running on the current thread. Each draft step proposes one
+    token; each main pass verifies a run of proposals and contributes one
+    token of its own, so accepted proposals = new tokens - main passes.
+    """
+
+    def __init__(self, main_model: Any, draft_model: Any | None) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.active = draft_model is not None
+        self.reset()
+        main_model.register_forward_hook(lambda *_: self._count("main_passes"))
+        if draft_model is not None:
+            draft_model.register_forward_hook(lambda *_: self._count("draft_proposals"))
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.new_tokens = 0
+        self.main_passes = 0
+        self.draft_proposals = 0
+        self.accepted = 0
+        self.seconds = 0.0
+        self.budget_tokens = 0
+        self.stop_reasons: Counter = Counter()
+
+    def _count(self, field: str) -> None:
+        tracked = getattr(self._local, "tracked", None)
+        if tracked is not None:
+            setattr(tracked, field, getattr(tracked, field) + 1)
+
+    @contextmanager
+    def track(self) -> Iterator[_Tracked]:
+        self._local.tracked = tracked = _Tracked()
+        try:
+            yield tracked
+        finally:
+            self._local.tracked = None
+
+    def record(
+        self, tracked: _Tracked, new_tokens: int, seconds: float, budget: int = 0, stop_reason: str | None = None
+    ) -> None:
+        # The final pass may be cut short by max_new_tokens, so clamp at zero.
+        accepted = max(0, min(new_tokens - tracked.main_passes, tracked.draft_proposals))
+        with self._lock:
+            self.requests += 1
+            self.new_tokens += new_tokens
+            self.main_passes += tracked.main_passes
+            self.draft_proposals += tracked.draft_proposals
+            self.accepted += accepted
+            self.seconds += seconds
+            self.budget_tokens += budget
+            if stop_reason:
+                self.stop_reasons[stop_reason] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "draft_model": settings.draft_model if self.active else None,
+                "num_assistant_tokens": settings.draft_tokens if self.active else None,
+                "requests": self.requests,
+                "new_tokens": self.new_tokens,
+                "main_passes": self.main_passes,
+                "draft_proposals": self.draft_proposals,
+                "accepted_proposals": self.accepted,
+                "acceptance_rate": round(self.accepted / self.draft_proposals, 4) if self.draft_proposals else None,
+                "tokens_per_main_pass": round(self.new_tokens / self.main_passes, 4) if self.main_passes else None,
+                "tokens_per_second": round(self.new_tokens / self.seconds, 2) if self.seconds else None,
+                "budget_used": round(self.new_tokens / self.budget_tokens, 4) if self.budget_tokens else None,
+                "stop_reasons": dict(self.stop_reasons),
+            }
+
+
+def verify_draft(generate: Any) -> bool:
+    """Check assisted and plain greedy decoding agree on a probe prompt.
+
+    Greedy assisted decoding is exact by construction; this guards against
+    models whose batched verification pass drifts numerically.
+    """
+    plain = generate(VERIFY_PROMPT, assisted=False)
+    assisted = generate(VERIFY_PROMPT, assisted=True)
+    if plain != assisted:
+        logger.warning("Draft model %s changed greedy output; speculative decoding disabled", settings.draft_model)
+        return False
+    return True
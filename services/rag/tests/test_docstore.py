@@ -0,0 +1,54 @@
+import mmap
+
+import pytest
+
+from app.docstore import CompactDocstore, StringColumn
+
+ROWS = [
+    ("doc-1", "Retention", "Records are kept for seven years."),
+    ("doc-2", "Übersicht", "Daten werden verschlüsselt gespeichert — immer."),
+    ("doc-3", "", ""),
+    ("doc-4", "表", "個人情報は暗号化されます。🔒 emoji and CJK mixed."),
+]
+
+
+@pytest.fixture(params=["memory", "mmap"])
+def store(request, tmp_path):
+    return CompactDocstore(str(tmp_path / "texts.bin") if request.param == "mmap" else None)
+
+
+def test_rows_round_trip(store):
+    assert store.add(ROWS[:2]) == 0
+    assert store.add(ROWS[2:]) == 2
+    assert len(store) == len(ROWS)
+    assert [store.row(index) for index in range(len(ROWS))] == ROWS
+
+
+def test_snippets_never_split_a_character(store):
+    store.add(ROWS)
+    for index, (_, _, text) in enumerate(ROWS):
+        for max_chars in (0, 1, 5, 13, 1000):
+            assert store.row(index, max_chars)[2] == text[:max_chars]
+
+
+def test_reads_see_rows_added_after_the_file_was_mapped(tmp_path):
+    column = StringColumn(str(tmp_path / "column.bin"))
+    column.extend(["first"])
+    assert column.get(0) == "first"
+    assert isinstance(column._data(), mmap.mmap)
+    column.extend(["second", "third"])
+    assert [column.get(index) for index in range(3)] == ["first", "second", "third"]
+
+
+def test_stats_count_packed_bytes(tmp_path):
+    path = str(tmp_path / "texts.bin")
+    store = CompactDocstore(path)
+    store.add(ROWS)
+    stats = store.stats()
+    assert stats["documents"] == len(ROWS)
+    assert stats["text_bytes"] == sum(len(text.encode("utf-8")) for _, _, text in ROWS)
+    assert stats["metadata_bytes"] == sum(len(i.encode("utf-8")) + len(t.encode("utf-8")) for i, t, _ in ROWS)
+    assert stats["offset_bytes"] == 3 * 8 * (len(ROWS) + 1)
+    assert stats["text_path"] == path
+    with open(path, "rb") as handle:
+        assert handle.read() == "".join(text for _, _, text in ROWS).encode("utf-8")